@@ -11,13 +11,16 @@ class BM(unittest.TestCase):
         p = Problem(root=Group())
         create_dyncomps(p.root, 100, 10, 10, 5)
         p.setup(check=False)
+        p.setup_timing.report()
 
     def benchmark_500(self):
         p = Problem(root=Group())
         create_dyncomps(p.root, 500, 10, 10, 5)
         p.setup(check=False)
+        p.setup_timing.report()
 
     def benchmark_1K(self):
         p = Problem(root=Group())
         create_dyncomps(p.root, 1000, 10, 10, 5)
         p.setup(check=False)
+        p.setup_timing.report()
@@ -18,23 +18,29 @@ class BM(unittest.TestCase):
     def benchmark_1Kparams(self):
         prob = self._build_comp(1000, 1)
         prob.setup(check=False)
+        prob.setup_timing.report()
 
     def benchmark_2Kparams(self):
         prob = self._build_comp(2000, 1)
         prob.setup(check=False)
+        prob.setup_timing.report()
 
     def benchmark_1Kouts(self):
         prob = self._build_comp(1, 1000)
         prob.setup(check=False)
+        prob.setup_timing.report()
 
     def benchmark_2Kouts(self):
         prob = self._build_comp(1, 2000)
         prob.setup(check=False)
+        prob.setup_timing.report()
 
     def benchmark_1Kvars(self):
         prob = self._build_comp(500, 500)
         prob.setup(check=False)
+        prob.setup_timing.report()
 
     def benchmark_2Kvars(self):
         prob = self._build_comp(1000, 1000)
         prob.setup(check=False)
+        prob.setup_timing.report()
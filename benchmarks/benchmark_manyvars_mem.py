@@ -0,0 +1,61 @@
+
+import sys
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from openmdao.api import Problem, Group
+from openmdao.test.build4test import DynComp, make_subtree
+
+
+def _count_accessors(system):
+    """ Returns the number of `Accessor`s in the value vectors of system
+    and all of its subsystems."""
+    count = 0
+    for s in system.subsystems(recurse=True, include_self=True):
+        for vec in (s.unknowns, s.resids, s.params):
+            count += len(vec._dat)
+    return count
+
+
+@unittest.skipIf(tracemalloc is None, "tracemalloc is not available")
+class BM(unittest.TestCase):
+    """Memory used by setup of models with a large number of variables.
+    Each benchmark prints the memory still allocated after setup, per
+    variable and per `Accessor`.
+    """
+
+    def _measure(self, prob, name):
+        tracemalloc.start()
+        try:
+            prob.setup(check=False, out_stream=None)
+            mem, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        nvars = len(prob.root._unknowns_dict) + len(prob.root._params_dict)
+        naccs = _count_accessors(prob.root)
+        sys.stdout.write("\n%s: %d vars, %d accessors, "
+                         "%.1f MB after setup (%.1f MB peak), "
+                         "%d bytes/var, %d bytes/accessor\n" %
+                         (name, nvars, naccs, mem/1e6, peak/1e6,
+                          mem//nvars, mem//naccs))
+
+    def benchmark_2Kvars_mem(self):
+        prob = Problem(root=Group())
+        prob.root.add("C1", DynComp(1000, 1000))
+        self._measure(prob, '2Kvars')
+
+    def benchmark_20Kvars_mem(self):
+        prob = Problem(root=Group())
+        prob.root.add("C1", DynComp(10000, 10000))
+        self._measure(prob, '20Kvars')
+
+    def benchmark_L6_sub2_c10_mem(self):
+        prob = Problem(root=Group())
+        make_subtree(prob.root, nsubgroups=2, levels=6, ncomps=10,
+                     nparams=10, noutputs=10, nconns=5)
+        self._measure(prob, 'L6_sub2_c10')
@@ -4,7 +4,8 @@ from six.moves import range
 import numpy as np
 
 import time
-from openmdao.api import Problem, Group, Component, IndepVarComp, ExecComp
+from openmdao.api import Problem, Group, Component, IndepVarComp, ExecComp, \
+                         BatchGroup
 
 
 class Plus(Component):
@@ -66,6 +67,38 @@ class MultiPoint(Group):
 
         self.add('aggregate', Summer(size))
 
+class VecPoint(Component):
+    """ Plus followed by Times for all points at once."""
+
+    batch_vectorized = True
+
+    def __init__(self, adders, scalars):
+        super(VecPoint, self).__init__()
+        self.add_param('x', 0.)
+        self.add_output('f2', shape=1)
+        self.adders = adders
+        self.scalars = scalars
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['f2'] = params['x'] + self.adders + self.scalars
+
+class BatchedMultiPoint(Group):
+
+    def __init__(self, adders, scalars, vectorized):
+        super(BatchedMultiPoint, self).__init__()
+
+        size = len(adders)
+
+        self.add('x', IndepVarComp('x', np.random.random(size)))
+        batch = self.add('batch', BatchGroup(size))
+        if vectorized:
+            batch.add('point', VecPoint(adders, scalars), promotes=['*'])
+        else:
+            # the same Point for every node, so the adder and scalar are
+            # taken from the first point
+            batch.add('point', Point(adders[0], scalars[0]), promotes=['*'])
+        self.connect('x.x', 'batch.x')
+
 class BM(unittest.TestCase):
     """A few 'brute force' multipoint cases (1K, 2K, 5K)"""
 
@@ -91,6 +124,14 @@ class BM(unittest.TestCase):
         #
         return prob
 
+    def _setup_batched_bm(self, npts, vectorized=True):
+
+        prob = Problem()
+        prob.root = BatchedMultiPoint(np.random.random(npts),
+                                      np.random.random(npts), vectorized)
+        prob.setup(check=False)
+        return prob
+
     def benchmark_setup_5K(self):
         self._setup_bm(5000)
 
@@ -111,3 +152,14 @@ class BM(unittest.TestCase):
     def benchmark_run_1K(self):
         p = self._setup_bm(1000)
         p.run()
+
+    def benchmark_batched_setup_5K(self):
+        self._setup_batched_bm(5000)
+
+    def benchmark_batched_run_5K(self):
+        p = self._setup_batched_bm(5000)
+        p.run()
+
+    def benchmark_batched_looped_run_5K(self):
+        p = self._setup_batched_bm(5000, vectorized=False)
+        p.run()
@@ -13,15 +13,18 @@ class BM(unittest.TestCase):
         make_subtree(p.root, nsubgroups=2, levels=4, ncomps=10,
                      nparams=10, noutputs=10, nconns=5)
         p.setup(check=False)
+        p.setup_timing.report()
 
     def benchmark_L6_sub2_c10(self):
         p = Problem(root=Group())
         make_subtree(p.root, nsubgroups=2, levels=6, ncomps=10,
                      nparams=10, noutputs=10, nconns=5)
         p.setup(check=False)
+        p.setup_timing.report()
 
     def benchmark_L7_sub2_c10(self):
         p = Problem(root=Group())
         make_subtree(p.root, nsubgroups=2, levels=7, ncomps=10,
                      nparams=10, noutputs=10, nconns=5)
         p.setup(check=False)
+        p.setup_timing.report()
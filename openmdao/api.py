@@ -15,6 +15,7 @@ from openmdao.core.component import Component
 from openmdao.core.group import Group
 from openmdao.core.parallel_group import ParallelGroup
 from openmdao.core.parallel_fd_group import ParallelFDGroup
+from openmdao.core.batch_group import BatchGroup
 from openmdao.core.problem import Problem
 from openmdao.core.system import System, AnalysisError
 from openmdao.core.driver import Driver
@@ -25,6 +26,8 @@ except ImportError:
     pass
 from openmdao.core.relevance import Relevance
 from openmdao.core.fileref import FileRef
+from openmdao.core.memo_cache import MemoCache
+from openmdao.core.setup_cache import SetupCache
 
 #drivers
 from openmdao.drivers.scipy_optimizer import ScipyOptimizer
@@ -36,12 +39,14 @@ from openmdao.drivers.predeterminedruns_driver import PredeterminedRunsDriver
 from openmdao.drivers.uniform_driver import UniformDriver
 from openmdao.drivers.fullfactorial_driver import FullFactorialDriver
 from openmdao.drivers.latinhypercube_driver import LatinHypercubeDriver
+from openmdao.drivers.multistart_driver import MultiStartDriver
 from openmdao.drivers.case_driver import CaseDriver
 
 #recorders
 from openmdao.recorders.base_recorder import BaseRecorder
 from openmdao.recorders.dump_recorder import DumpRecorder
 from openmdao.recorders.sqlite_recorder import SqliteRecorder
+from openmdao.recorders.columnar_recorder import ColumnarRecorder
 from openmdao.recorders.inmem_recorder import InMemoryRecorder
 from openmdao.recorders.case_reader import CaseReader
 
@@ -54,6 +59,7 @@ from openmdao.solvers.run_once import RunOnce
 from openmdao.solvers.scipy_gmres import ScipyGMRES
 from openmdao.solvers.solver_base import LinearSolver, NonLinearSolver
 from openmdao.solvers.brent import Brent
+from openmdao.solvers.broyden import Broyden
 try:
     from openmdao.solvers.petsc_ksp import PetscKSP
 except ImportError:
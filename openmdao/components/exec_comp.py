@@ -89,6 +89,11 @@ class ExecComp(Component):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['fd_coloring'] : bool(False)
+        Set to True to detect the sparsity of the finite difference Jacobian
+        with respect to each param the first time it is computed, and
+        afterwards perturb all structurally orthogonal entries of that param
+        together.
 
     Notes
     -----
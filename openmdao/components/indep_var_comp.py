@@ -10,6 +10,8 @@ class IndepVarComp(Component):
 
     """
 
+    batch_vectorized = True
+
     def __init__(self, name, val=None, **kwargs):
         super(IndepVarComp, self).__init__()
 
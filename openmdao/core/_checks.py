@@ -1,6 +1,7 @@
 """ Set of utilities for detecting and reporting connection errors."""
 
 import traceback
+import numpy as np
 from six import iteritems
 from openmdao.core.fileref import FileRef
 
@@ -90,6 +91,11 @@ def _check_types_match(src, tgt, to_prom_name):
     if 'src_indices' in tgt:
         if len(tgt['src_indices']) == 1 and ttype == float:
             return
+        # a scalar source repeated into an array, e.g., for every node of a
+        # BatchGroup
+        if stype == float and ttype == np.ndarray and \
+           not np.any(tgt['src_indices']):
+            return
 
     raise TypeError("Type %s of source %s must be the same as type %s of "
                     "target %s." %  (type(src['val']),
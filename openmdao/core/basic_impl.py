@@ -63,7 +63,7 @@ class BasicImpl(object):
     @staticmethod
     def create_data_xfer(src_vec, tgt_vec,
                          src_idxs, tgt_idxs, vec_conns, byobj_conns,
-                         mode, sysdata):
+                         mode, sysdata, aliased=()):
         """
         Create an object for performing data transfer between source
         and target vectors.
@@ -99,10 +99,14 @@ class BasicImpl(object):
             The `SysData` object for the Group that will contain the new
             `DataTransfer` object.
 
+        aliased : set, optional
+            Names of params whose values are views of their source unknowns,
+            so only their derivatives need to be transferred.
+
         Returns
         -------
         `DataTransfer`
             A `DataTransfer` object.
         """
         return DataTransfer(src_idxs, tgt_idxs, vec_conns, byobj_conns, mode,
-                            sysdata)
+                            sysdata, aliased)
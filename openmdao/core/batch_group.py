@@ -0,0 +1,396 @@
+""" Defines the BatchGroup, which evaluates its subsystems at many points at
+once by giving all of their variables a leading batch dimension."""
+
+from __future__ import print_function
+
+from itertools import chain
+
+import numpy as np
+from six import iteritems, itervalues, get_unbound_function
+from six.moves import range
+from scipy.sparse import csr_matrix, issparse
+
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+
+
+class BatchGroup(Group):
+    """A `Group` that evaluates its subsystems at num_nodes points (e.g.,
+    flight conditions) at once, rather than holding a copy of them for each
+    point. Every variable of every `Component` below it gets a leading
+    dimension of num_nodes, so a variable declared with shape (3,) is
+    stored as a (num_nodes, 3) array and one declared as a scalar becomes a
+    (num_nodes,) array. Params added with the metadata batched=False (e.g.,
+    a design variable shared by all points) and pass_by_obj variables keep
+    their declared shape.
+
+    A `Component` whose batch_vectorized attribute is True gets the batched
+    arrays in all of its methods. Its linearize returns, for each
+    sub-Jacobian, either the Jacobian of each node stacked into an array of
+    shape (num_nodes, m, n), the full matrix, or, for partials declared with
+    `declare_partials`, the values of each node one after the other. Any
+    other `Component` is called once per node with views of that node's
+    values, so existing components can be batched without changes, but
+    they must use the params, unknowns and resids by name (not `.vec`).
+    The sub-Jacobians are stored as block diagonal sparse matrices.
+
+    src_indices given to `connect` in this group or any group below it
+    refer to a single node and are repeated for each node. Connections to
+    batched params from outside the group must provide all of the nodes,
+    e.g., using src_indices=np.zeros(num_nodes, dtype=int) to give a
+    scalar source to every node.
+
+    Args
+    ----
+    num_nodes : int
+        Number of points to evaluate at once.
+
+    Options
+    -------
+    deriv_options['type'] :  str('user')
+        Derivative calculation type ('user', 'fd', 'cs')
+        Default is 'user', where derivative is calculated from
+        user-supplied derivatives. Set to 'fd' to finite difference
+        this system. Set to 'cs' to perform the complex step
+        if your components support it.
+    deriv_options['form'] :  str('forward')
+        Finite difference mode. (forward, backward, central)
+    deriv_options['step_size'] :  float(1e-06)
+        Default finite difference stepsize
+    deriv_options['step_calc'] :  str('absolute')
+        Set to absolute, relative
+    deriv_options['check_type'] :  str('fd')
+        Type of derivative check for check_partial_derivatives. Set
+        to 'fd' to finite difference this system. Set to
+        'cs' to perform the complex step method if
+        your components support it.
+    deriv_options['check_form'] :  str('forward')
+        Finite difference mode: ("forward", "backward", "central")
+        During check_partial_derivatives, the difference form that is used
+        for the check.
+    deriv_options['check_step_calc'] : str('absolute',)
+        Set to 'absolute' or 'relative'. Default finite difference
+        step calculation for the finite difference check in check_partial_derivatives.
+    deriv_options['check_step_size'] :  float(1e-06)
+        Default finite difference stepsize for the finite difference check
+        in check_partial_derivatives"
+    deriv_options['linearize'] : bool(False)
+        Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['fd_coloring'] : bool(False)
+        Set to True to detect the sparsity of the finite difference Jacobian
+        with respect to each param the first time it is computed, and
+        afterwards perturb all structurally orthogonal entries of that param
+        together.
+    """
+
+    def __init__(self, num_nodes):
+        super(BatchGroup, self).__init__()
+
+        if num_nodes < 1:
+            raise ValueError("num_nodes must be at least 1, but is %s." %
+                             num_nodes)
+        self.num_nodes = num_nodes
+
+        # src_indices of connections below this group as given by the user,
+        # keyed on (group pathname, target, position in the list of sources)
+        self._point_src_indices = {}
+
+    def _setup_variables(self):
+        """
+        Adds the batch dimension to the variables of all components below
+        this `Group`, then creates the dictionaries of metadata for
+        parameters and unknowns the same way as `Group`.
+
+        Returns
+        -------
+        tuple
+            A dictionary of metadata for parameters and for unknowns
+            for all subsystems.
+        """
+        for sub in self.subsystems(recurse=True):
+            if isinstance(sub, Component):
+                _batch_component(sub, self.num_nodes)
+
+        params_dict, unknowns_dict = super(BatchGroup, self)._setup_variables()
+
+        self._batch_src_indices(unknowns_dict)
+
+        return params_dict, unknowns_dict
+
+    def _batch_src_indices(self, unknowns_dict):
+        """ Repeats the src_indices of each connection in this group and the
+        groups below it for every node."""
+        nodes = np.arange(self.num_nodes)[:, None]
+
+        for group in self.subgroups(recurse=True, include_self=True):
+            to_abs_uname = group._sysdata.to_abs_uname
+            for tgt, srcs in iteritems(group._src):
+                for i, (src, idxs) in enumerate(srcs):
+                    key = (group.pathname, tgt, i)
+                    if key in self._point_src_indices:
+                        idxs = self._point_src_indices[key]
+                    elif idxs is None or src not in to_abs_uname:
+                        continue
+                    else:
+                        self._point_src_indices[key] = idxs
+
+                    meta = unknowns_dict[to_abs_uname[src]]
+                    point_size = meta['size'] // self.num_nodes
+                    idxs = np.asarray(idxs, dtype=int).ravel()
+                    srcs[i] = (src, (nodes*point_size + idxs).ravel())
+
+
+def _batched(meta):
+    """ Returns True if the variable has the batch dimension."""
+    return not meta.get('pass_by_obj') and meta.get('batched', True)
+
+
+def _overrides(comp, name):
+    """ Returns True if the class of comp overrides the given method of
+    `Component`."""
+    method = getattr(type(comp), name, None)
+    if method is None:
+        return False
+    return get_unbound_function(method) is not \
+        get_unbound_function(getattr(Component, name))
+
+
+def _batch_component(comp, num_nodes):
+    """ Adds the batch dimension to the variables and declared partials of
+    comp, and makes its methods evaluate every node. Does nothing if that
+    was already done."""
+    if comp._num_nodes == num_nodes:
+        return
+    if comp._num_nodes is not None:
+        raise RuntimeError("%s: can't batch with %d nodes because it is already "
+                           "batched with %d nodes. BatchGroups can't be nested." %
+                           (comp.pathname, num_nodes, comp._num_nodes))
+
+    point_sizes = {}
+    for name, meta in chain(iteritems(comp._init_params_dict),
+                            iteritems(comp._init_unknowns_dict)):
+        if not _batched(meta):
+            if not meta.get('pass_by_obj') and name in comp._init_unknowns_dict:
+                raise RuntimeError("%s: output '%s' can't have batched=False." %
+                                   (comp.pathname, name))
+            point_sizes[name] = (meta['size'], False)
+            continue
+        if 'src_indices' in meta:
+            raise RuntimeError("%s: distributed variable '%s' can't be "
+                               "batched." % (comp.pathname, name))
+
+        shape = meta['shape']
+        shape = () if shape == 1 else tuple(shape)
+        val = np.empty((num_nodes,) + shape)
+        val[:] = meta['val']
+
+        point_sizes[name] = (meta['size'], True)
+        meta['val'] = val
+        meta['shape'] = val.shape
+        meta['size'] = val.size
+
+    # the point partials become blocks of a block diagonal matrix
+    point_sparsity = comp._subjac_sparsity.copy()
+    nodes = np.arange(num_nodes)[:, None]
+    for (of, wrt), (rows, cols) in iteritems(point_sparsity):
+        m = point_sizes[of][0]
+        n, wrt_batched = point_sizes[wrt]
+        rows = (nodes*m + rows).ravel()
+        cols = (nodes*n + cols).ravel() if wrt_batched else \
+               np.tile(cols, num_nodes)
+        comp._subjac_sparsity[of, wrt] = (rows, cols)
+
+    comp._num_nodes = num_nodes
+
+    loop = not comp.batch_vectorized
+    if loop:
+        for name in ('solve_nonlinear', 'apply_nonlinear', 'apply_linear',
+                     'solve_linear'):
+            if _overrides(comp, name):
+                setattr(comp, name, _NodeLoop(getattr(comp, name), num_nodes))
+
+    if _overrides(comp, 'linearize'):
+        comp.linearize = _BatchLinearize(comp.linearize, num_nodes, loop,
+                                         point_sizes, point_sparsity)
+
+
+class _NodeView(object):
+    """ Gives a `Component` that evaluates one node at a time the values of
+    one node of a batched `VecWrapper`. Getting a batched variable returns
+    the value for the node, and getting any other variable returns its
+    whole value."""
+
+    __slots__ = ['_vec', '_node']
+
+    def __init__(self, vec, node):
+        self._vec = vec
+        self._node = node
+
+    def __getitem__(self, name):
+        val = self._vec[name]
+        if _batched(self._vec._dat[name].meta):
+            return val[self._node]
+        return val
+
+    def __setitem__(self, name, value):
+        vec = self._vec
+        acc = vec._dat[name]
+        if not _batched(acc.meta):
+            vec[name] = value
+            return
+
+        val = vec[name]
+        val[self._node] = value
+
+        # under complex step and for params with unit conversion val is a
+        # copy, so it has to be written back
+        if not np.may_share_memory(val, acc.val):
+            vec[name] = val
+
+    def __contains__(self, name):
+        return name in self._vec
+
+    def __iter__(self):
+        return iter(self._vec)
+
+    def __len__(self):
+        return len(self._vec)
+
+    def keys(self):
+        return self._vec.keys()
+
+    def iteritems(self):
+        for name in self._vec:
+            yield name, self[name]
+
+    def items(self):
+        return list(self.iteritems())
+
+    def metadata(self, name):
+        return self._vec.metadata(name)
+
+
+def _node_arg(arg, node):
+    """ Returns the view of arg for a node if it is a vector, or a dict of
+    vectors keyed on variable of interest."""
+    if isinstance(arg, dict):
+        return dict((k, _node_arg(v, node)) for k, v in iteritems(arg))
+    if hasattr(arg, '_dat'):
+        return _NodeView(arg, node)
+    return arg
+
+
+class _NodeLoop(object):
+    """ Calls a method of a `Component` that is not batch_vectorized once
+    for each node."""
+
+    def __init__(self, method, num_nodes):
+        self._method = method
+        self._num_nodes = num_nodes
+
+    def __call__(self, *args, **kwargs):
+        for node in range(self._num_nodes):
+            self._method(*[_node_arg(a, node) for a in args], **kwargs)
+
+
+class _BatchLinearize(object):
+    """ Calls the linearize method of a batched `Component` and turns the
+    sub-Jacobians of the nodes into block diagonal sparse matrices."""
+
+    def __init__(self, method, num_nodes, loop, point_sizes, point_sparsity):
+        self._method = method
+        self._num_nodes = num_nodes
+        self._loop = loop
+        self._point_sizes = point_sizes
+        self._point_sparsity = point_sparsity
+
+        # (indices, indptr, shape) of the CSR matrix for each sub-Jacobian
+        self._patterns = {}
+
+    def __call__(self, params, unknowns, resids):
+        num_nodes = self._num_nodes
+
+        if not self._loop:
+            J = self._method(params, unknowns, resids)
+            if J is not None:
+                for key, val in iteritems(J):
+                    J[key] = self._to_batched(key, val)
+            return J
+
+        jacs = [self._method(_NodeView(params, node), _NodeView(unknowns, node),
+                             _NodeView(resids, node))
+                for node in range(num_nodes)]
+        if jacs[0] is None:
+            return None
+
+        J = {}
+        for key in jacs[0]:
+            of, wrt = key
+            m = self._point_sizes[of][0]
+            n = self._point_sizes[wrt][0]
+            if key in self._point_sparsity:
+                rows, cols = self._point_sparsity[key]
+                blocks = [_point_nonzeros(jac[key], m, n, rows, cols)
+                          for jac in jacs]
+                J[key] = np.concatenate(blocks)
+            else:
+                blocks = [jac[key].toarray() if issparse(jac[key]) else jac[key]
+                          for jac in jacs]
+                J[key] = self._block_diag(key, np.array(blocks).reshape(
+                    (num_nodes, m, n)))
+        return J
+
+    def _to_batched(self, key, val):
+        """ Converts a sub-Jacobian returned by a batch_vectorized linearize
+        to a full matrix."""
+        if key in self._point_sparsity or issparse(val):
+            return val
+
+        of, wrt = key
+        m = self._point_sizes[of][0]
+        n, wrt_batched = self._point_sizes[wrt]
+        num_nodes = self._num_nodes
+
+        val = np.asarray(val)
+        full_cols = num_nodes*n if wrt_batched else n
+        if val.shape == (num_nodes*m, full_cols):
+            return val
+
+        shape = (num_nodes, m, n)
+        if val.size == num_nodes*m*n:
+            val = val.reshape(shape)
+        else:
+            val = np.broadcast_to(val, shape)
+        return self._block_diag(key, val)
+
+    def _block_diag(self, key, blocks):
+        """ Returns a CSR matrix with the (num_nodes, m, n) blocks on its
+        diagonal, or stacked vertically if the param isn't batched."""
+        pattern = self._patterns.get(key)
+        if pattern is None:
+            num_nodes, m, n = blocks.shape
+            wrt_batched = self._point_sizes[key[1]][1]
+
+            cols = np.arange(n)[None, None, :]
+            if wrt_batched:
+                cols = cols + (np.arange(num_nodes)*n)[:, None, None]
+                shape = (num_nodes*m, num_nodes*n)
+            else:
+                shape = (num_nodes*m, n)
+            indices = np.broadcast_to(cols, blocks.shape).ravel()
+            indptr = np.arange(0, num_nodes*m*n + 1, n)
+            pattern = self._patterns[key] = (indices, indptr, shape)
+
+        indices, indptr, shape = pattern
+        return csr_matrix((np.ravel(blocks), indices, indptr), shape=shape)
+
+
+def _point_nonzeros(J, m, n, rows, cols):
+    """ Returns the values of the declared nonzeros of a node's
+    sub-Jacobian."""
+    if issparse(J):
+        return np.asarray(J.tocsr()[rows, cols]).ravel()
+    J = np.asarray(J)
+    if J.shape == (m, n):
+        return J[rows, cols]
+    return J.ravel()
@@ -41,6 +41,13 @@ class Component(System):
     variables and operates on its params to produce unknowns, which can be
     explicit outputs or implicit states.
 
+    Assign a `MemoCache` to the `memo_cache` attribute to skip
+    solve_nonlinear when the component is run with params it has already
+    seen.
+
+    Set the batch_vectorized class attribute to True in a subclass whose
+    methods can evaluate all of the nodes of a `BatchGroup` at once.
+
     Options
     -------
     deriv_options['type'] :  str('user')
@@ -72,8 +79,15 @@ class Component(System):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['fd_coloring'] : bool(False)
+        Set to True to detect the sparsity of the finite difference Jacobian
+        with respect to each param the first time it is computed, and
+        afterwards perturb all structurally orthogonal entries of that param
+        together.
     """
 
+    batch_vectorized = False
+
     def __init__(self):
         super(Component, self).__init__()
         self._post_setup_vars = False
@@ -87,6 +101,13 @@ class Component(System):
         self._pbo_warns = []
         self._run_apply = False
 
+        # Assign a MemoCache to skip solve_nonlinear for params we have
+        # already seen.
+        self.memo_cache = None
+
+        # number of nodes if this is in a BatchGroup
+        self._num_nodes = None
+
     def _get_initial_val(self, val, shape):
         """ Determines initial value based on starting val and shape."""
         if val is _NotSet:
@@ -294,6 +315,45 @@ class Component(System):
         meta['size'] = val.size
         meta['src_indices'] = src_indices
 
+    def declare_partials(self, of, wrt, rows, cols):
+        """ Declares the sparsity of the derivative of an unknown with respect
+        to a param or state. For a declared pair, `linearize` only needs to
+        return the nonzero values, as a flat array in the order given by
+        rows and cols. The sub-Jacobian is stored as a sparse matrix, so it
+        is never allocated densely. Partials that are not declared can still
+        be returned from `linearize` as scipy.sparse matrices.
+
+        Args
+        ----
+        of : string
+            Name of the output or state.
+
+        wrt : string
+            Name of the param or state.
+
+        rows : array of int
+            Row index of each nonzero entry.
+
+        cols : array of int
+            Column index of each nonzero entry.
+        """
+        if of not in self._init_unknowns_dict:
+            raise NameError("%s: '%s' is not an output or state." %
+                            (self.pathname, of))
+        if wrt not in self._init_params_dict and \
+           not self._init_unknowns_dict.get(wrt, {}).get('state'):
+            raise NameError("%s: '%s' is not a param or state." %
+                            (self.pathname, wrt))
+
+        rows = np.asarray(rows, dtype=int).ravel()
+        cols = np.asarray(cols, dtype=int).ravel()
+        if rows.size != cols.size:
+            raise ValueError("%s: rows and cols of the derivative of '%s' wrt '%s' "
+                             "must be the same length, but %d != %d." %
+                             (self.pathname, of, wrt, rows.size, cols.size))
+
+        self._subjac_sparsity[of, wrt] = (rows, cols)
+
     def _check_varname(self, name):
         """ Verifies that a variable name is valid. Also checks for
         duplicates."""
@@ -489,7 +549,7 @@ class Component(System):
             If True, allocate the derivative vectors.
         """
         self.params = self.unknowns = self.resids = None
-        self.dumat, self.dpmat, self.drmat = OrderedDict(), OrderedDict(), OrderedDict()
+        self._init_deriv_mats()
         self.connections = self._probdata.connections
 
         relevance = self._probdata.relevance
@@ -517,7 +577,10 @@ class Component(System):
         self._create_views(top_unknowns, parent, [], None)
 
         all_vois = set([None])
-        if self._probdata.top_lin_gs: # only need voi vecs for lings
+        if self._probdata.deriv_vec_cache:
+            # voi vecs are created when they're first used
+            self._voi_vec_args = (parent, top_unknowns, [], alloc_derivs)
+        elif self._probdata.top_lin_gs: # only need voi vecs for lings
             # create storage for the relevant vecwrappers, keyed by
             # variable_of_interest
             for vois in relevance.groups:
@@ -532,6 +595,23 @@ class Component(System):
             if name not in self.params:
                 self.params._add_unconnected_var(pathname, meta)
 
+    def _alloc_voi_vecs(self, voi):
+        """ Creates the derivative `VecWrapper`s for a variable of interest
+        as views of the ones in the parent `Group`. Only called if the
+        `Problem` was set up with deriv_vec_cache.
+
+        Args
+        ----
+        voi : str
+            The name of a variable of interest.
+        """
+        if voi not in self._probdata.relevance.relevant:
+            raise KeyError(voi)
+
+        parent, top_unknowns = self._voi_vec_args[:2]
+        self._create_views(top_unknowns, parent, [], voi)
+        self._record_do_apply(voi, parent)
+
     def _sys_apply_nonlinear(self, params, unknowns, resids):
         """
         Evaluates the residuals for this component. This wraps
@@ -590,6 +670,11 @@ class Component(System):
         resids.vec[:] += unknowns.vec
         unknowns.vec[:] -= resids.vec
 
+    def cleanup(self):
+        """ Clean up resources prior to exit. """
+        if self.memo_cache is not None:
+            self.memo_cache.save()
+
     def _sys_solve_nonlinear(self, params, unknowns, resids):
         """
         Runs the component. This wraps solve_nonlinear and performs any
@@ -606,8 +691,17 @@ class Component(System):
         resids : `VecWrapper`, optional
             `VecWrapper` containing residuals. (r)
         """
-        self.solve_nonlinear(params, unknowns, resids)
-        unknowns._scale_values()
+        cache = self.memo_cache
+        if cache is None or self._probdata.in_complex_step:
+            self.solve_nonlinear(params, unknowns, resids)
+            unknowns._scale_values()
+            return
+
+        key = cache.get_key(params, unknowns)
+        if not cache.restore(key, unknowns):
+            self.solve_nonlinear(params, unknowns, resids)
+            unknowns._scale_values()
+            cache.store(key, unknowns)
 
     def solve_nonlinear(self, params, unknowns, resids):
         """
@@ -8,6 +8,19 @@ from openmdao.util.array_util import to_slice
 from openmdao.core.mpi_wrap import MPI
 from openmdao.core.fileref import FileRef
 
+# Transfers that still need at least this many slice or index array
+# assignments after merging adjacent slices are done with a single fused
+# gather instead.
+MIN_FUSED_SCATTERS = 2
+
+
+def _to_idx_array(idxs):
+    """ Returns the indices in a slice or index array as an index array."""
+    if isinstance(idxs, slice):
+        return np.arange(idxs.start, idxs.stop, idxs.step)
+    return np.asarray(idxs, dtype=int)
+
+
 class DataTransfer(object):
     """
     An object that performs data transfer between a source vector and a
@@ -35,16 +48,59 @@ class DataTransfer(object):
 
     mode : str
         Either 'fwd' or 'rev', indicating a forward or reverse scatter.
+
+    aliased : set, optional
+        Names of params whose values are views of their source unknowns, so
+        only their derivatives need to be transferred.
     """
 
     def __init__(self, src_idxs, tgt_idxs, vec_conns, byobj_conns, mode,
-                 sysdata):
+                 sysdata, aliased=()):
         self.vec_conns = vec_conns
         self.byobj_conns = byobj_conns
         self.sysdata = sysdata
 
         fwd = mode == 'fwd'
 
+        self.scatters, self.fused = self._compile(src_idxs, tgt_idxs, fwd)
+
+        # Params that are views of their sources don't need their values
+        # transferred, but derivatives still have to go through the
+        # dparams vector.
+        keep = [i for i, (tgt, _) in enumerate(vec_conns) if tgt not in aliased]
+        if fwd and len(keep) < len(vec_conns):
+            self._val_scatters, self._val_fused = \
+                self._compile([src_idxs[i] for i in keep],
+                              [tgt_idxs[i] for i in keep], fwd)
+        else:
+            self._val_scatters, self._val_fused = self.scatters, self.fused
+
+    @staticmethod
+    def _compile(src_idxs, tgt_idxs, fwd):
+        """
+        Merges the given index arrays into as few slice assignments as
+        possible, and builds a fused plan if that still leaves too many.
+
+        Args
+        ----
+        src_idxs : array
+            Indices of the source variables in the source vector.
+
+        tgt_idxs : array
+            Indices of the target variables in the target vector.
+
+        fwd : bool
+            True for a forward scatter.
+
+        Returns
+        -------
+        list of tuple
+            (src indices, tgt indices, src_unique) for each scatter.
+
+        tuple or None
+            The fused (src indices, tgt indices, src_unique), or None if the
+            scatters should be done one at a time.
+        """
         # sort subarrays wrt each other in ascending order (not internally)
         # this assumes that subarrays are already sorted internally. The
         # only time this won't be true is if an unknown is connected to
@@ -83,7 +139,24 @@ class DataTransfer(object):
             else:
                 scatters.append((srcs, tgts, src_unique))
 
-        self.scatters = scatters
+        # Fused plan: all of the scatters as one source and one target index
+        # array. The target side is usually the contiguous param vector of a
+        # subsystem, in which case we can gather straight into it.
+        if len(scatters) >= MIN_FUSED_SCATTERS:
+            fsrcs = np.concatenate([_to_idx_array(s) for s, _, _ in scatters])
+            ftgts = np.concatenate([_to_idx_array(t) for _, t, _ in scatters])
+            tgt_slice = to_slice(ftgts)
+            if isinstance(tgt_slice, slice) and tgt_slice.step == 1:
+                ftgts = tgt_slice
+            if fwd:
+                src_unique = True
+            else:
+                src_unique = np.unique(fsrcs).size == fsrcs.size
+            fused = (fsrcs, ftgts, src_unique)
+        else:
+            fused = None
+
+        return scatters, fused
 
     def transfer(self, srcvec, tgtvec, mode='fwd', deriv=False):
         """
@@ -107,23 +180,31 @@ class DataTransfer(object):
             If True, this is a derivative data transfer, so no pass_by_obj
             variables will be transferred.
         """
+        if mode == 'fwd' and not deriv:
+            scatters, fused = self._val_scatters, self._val_fused
+        else:
+            scatters, fused = self.scatters, self.fused
+
+        if fused is not None:
+            scatters = (fused,)
+
         if mode == 'rev':
             # in reverse mode, srcvec and tgtvec are switched. Note, we only
             # run in reverse for derivatives, and derivatives accumulate from
             # all targets. byobjs are never scattered in reverse
-            for isrcs, itgts, src_unique in self.scatters:
+            for isrcs, itgts, src_unique in scatters:
                 if src_unique:
                     srcvec.vec[isrcs] += tgtvec.vec[itgts]
                 else:
                     np.add.at(srcvec.vec, isrcs, tgtvec.vec[itgts])
         else:
             if tgtvec._probdata.in_complex_step:
-                for isrcs, itgts, _ in self.scatters:
-                    tgtvec.vec[itgts] = srcvec.vec[isrcs]
-                    tgtvec.imag_vec[itgts] = srcvec.imag_vec[isrcs]
+                for isrcs, itgts, _ in scatters:
+                    self._gather(srcvec.vec, isrcs, tgtvec.vec, itgts)
+                    self._gather(srcvec.imag_vec, isrcs, tgtvec.imag_vec, itgts)
             else:
-                for isrcs, itgts, _ in self.scatters:
-                    tgtvec.vec[itgts] = srcvec.vec[isrcs]
+                for isrcs, itgts, _ in scatters:
+                    self._gather(srcvec.vec, isrcs, tgtvec.vec, itgts)
 
             # forward, include byobjs if not a deriv scatter
             if not deriv:
@@ -132,3 +213,12 @@ class DataTransfer(object):
                         tgtvec[tgt]._assign_to(srcvec[src])
                     else:
                         tgtvec[tgt] = srcvec[src]
+
+    @staticmethod
+    def _gather(src, isrcs, tgt, itgts):
+        """ Copies src[isrcs] into tgt[itgts]."""
+        if isinstance(itgts, slice) and itgts.step == 1 and \
+           not isinstance(isrcs, slice):
+            np.take(src, isrcs, out=tgt[itgts])
+        else:
+            tgt[itgts] = src[isrcs]
@@ -13,6 +13,7 @@ from collections import Iterable
 
 import numpy as np
 import networkx as nx
+from scipy.sparse import coo_matrix, issparse
 
 from openmdao.components.indep_var_comp import IndepVarComp
 from openmdao.core.component import Component
@@ -32,6 +33,13 @@ namecheck_rgx = re.compile('[_a-zA-Z][_a-zA-Z0-9]*')
 class Group(System):
     """A system that contains other systems.
 
+    Set the `incremental` attribute to True to have `children_solve_nonlinear`
+    skip any subsystem whose params and unknowns are unchanged since the last
+    time it ran. This only helps when rerunning a subsystem with the same
+    inputs gives the same outputs, so don't use it with subsystems that
+    depend on anything other than their params (e.g., files or the iteration
+    count). Subsystems with pass_by_obj variables always run.
+
     Options
     -------
     deriv_options['type'] :  str('user')
@@ -63,6 +71,11 @@ class Group(System):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['fd_coloring'] : bool(False)
+        Set to True to detect the sparsity of the finite difference Jacobian
+        with respect to each param the first time it is computed, and
+        afterwards perturb all structurally orthogonal entries of that param
+        together.
     """
 
     def __init__(self):
@@ -88,6 +101,11 @@ class Group(System):
         self._gs_outputs = None
         self._run_apply = True
         self._icache = {}
+        self._icache_src_idxs = {}
+
+        # Skip subsystems whose inputs haven't changed since their last run.
+        self.incremental = False
+        self._inc_cache = {}
 
     def find_subsystem(self, name):
         """
@@ -345,23 +363,28 @@ class Group(System):
             self._gs_outputs = {}
 
         if mode not in self._gs_outputs:
-            dumat = self.dumat
-            gs_outputs = self._gs_outputs[mode] = OrderedDict()
-            if mode == 'fwd':
-                for sub in self._local_subsystems:
-                    gs_outputs[sub.name] = outs = OrderedDict()
-                    for voi in vois:
-                        if voi in dumat:
-                            outs[voi] = set([x for x in dumat[voi]._dat if
-                                                   sub.dumat and x not in sub.dumat[voi]])
-            else: # rev
-                for sub in self._local_subsystems:
-                    gs_outputs[sub.name] = outs = OrderedDict()
-                    for voi in vois:
-                        if voi in dumat:
-                            outs[voi] = set([x for x in dumat[voi]._dat if
-                                                   not sub.dumat or
-                                                   (sub.dumat and x not in sub.dumat[voi])])
+            self._gs_outputs[mode] = OrderedDict((sub.name, OrderedDict())
+                                                 for sub in self._local_subsystems)
+
+        # outputs for vois that weren't asked for before are added as needed
+        dumat = self.dumat
+        gs_outputs = self._gs_outputs[mode]
+        for voi in vois:
+            if voi not in dumat:
+                continue
+            names = None
+            for sub in self._local_subsystems:
+                outs = gs_outputs[sub.name]
+                if voi in outs:
+                    continue
+                if names is None:
+                    names = frozenset(dumat[voi]._dat)
+                if sub.dumat:
+                    outs[voi] = names.difference(sub.dumat[voi]._dat)
+                elif mode == 'fwd':
+                    outs[voi] = set()
+                else:
+                    outs[voi] = set(names)
         return self._gs_outputs
 
     def _promoted_name(self, name, subsystem):
@@ -425,10 +448,11 @@ class Group(System):
         self._sysdata.comm = self.comm
 
         self.params = self.unknowns = self.resids = None
-        self.dumat, self.dpmat, self.drmat = OrderedDict(), OrderedDict(), OrderedDict()
+        self._init_deriv_mats()
         self._local_unknown_sizes = OrderedDict()
         self._local_param_sizes = OrderedDict()
         self._owning_ranks = None
+        self._inc_cache = {}
         self.connections = self._probdata.connections
         relevance = self._probdata.relevance
 
@@ -479,10 +503,19 @@ class Group(System):
         self._owning_ranks = self._get_owning_ranks()
         self._sysdata.owning_ranks = self._owning_ranks
 
-        self._setup_data_transfer(my_params, None, alloc_derivs)
+        timer = self._probdata.setup_timer
+        with timer.phase('setup_data_transfer', self.pathname):
+            self._setup_data_transfer(my_params, None, alloc_derivs)
+
+        lazy = self._probdata.deriv_vec_cache
+        if lazy:
+            # the vecwrappers for each variable_of_interest are created
+            # when they're first used (see _alloc_voi_vecs)
+            self._voi_vec_args = (parent, top_unknowns, my_params,
+                                  alloc_derivs)
 
         all_vois = set([None])
-        if self._probdata.top_lin_gs:
+        if self._probdata.top_lin_gs and not lazy:
             # create storage for the relevant vecwrappers,
             # keyed by variable_of_interest
             for vois in relevance.groups:
@@ -494,7 +527,8 @@ class Group(System):
                         self._create_views(top_unknowns, parent, my_params,
                                            voi)
 
-                    self._setup_data_transfer(my_params, voi, alloc_derivs)
+                    with timer.phase('setup_data_transfer', self.pathname):
+                        self._setup_data_transfer(my_params, voi, alloc_derivs)
 
         for sub in itervalues(self._subsystems):
             sub._setup_vectors(param_owners, parent=self,
@@ -516,7 +550,96 @@ class Group(System):
                 else:
                     self._do_apply[(s.pathname, voi)] = False
 
-        self._relname_map = None  # reclaim some memory
+        if not lazy:
+            self._relname_map = None  # reclaim some memory
+
+    def _alloc_voi_vecs(self, voi):
+        """ Creates the derivative `VecWrapper`s and data transfers for a
+        variable of interest in this `Group`, and in its parent if they aren't
+        there yet. Only called if the `Problem` was set up with
+        deriv_vec_cache.
+
+        Args
+        ----
+        voi : str
+            The name of a variable of interest.
+        """
+        if voi not in self._probdata.relevance.relevant:
+            raise KeyError(voi)
+
+        parent, top_unknowns, my_params, alloc_derivs = self._voi_vec_args
+
+        if parent is None:
+            self._create_vecs(my_params, voi, self._impl)
+
+            # the storage is shared with variables of interest that are solved
+            # at other times, so it may hold their values.
+            self.dumat[voi].vec[:] = 0.0
+            self.drmat[voi].vec[:] = 0.0
+
+            for vois in self._probdata.relevance.groups:
+                if voi in vois:
+                    break
+            else:
+                vois = (voi,)
+            self._reserve_vois(vois)
+        else:
+            self._create_views(top_unknowns, parent, my_params, voi)
+
+        self.dpmat[voi].vec[:] = 0.0
+        self._setup_data_transfer(my_params, voi, alloc_derivs)
+        self._record_do_apply(voi, self)
+
+    def _free_voi_vecs(self, voi):
+        """ Frees the derivative `VecWrapper`s and data transfers for a
+        variable of interest. They are created again the next time they are
+        needed.
+
+        Args
+        ----
+        voi : str
+            The name of a variable of interest.
+        """
+        super(Group, self)._free_voi_vecs(voi)
+
+        for key in [k for k in self._data_xfer if k[2] == voi]:
+            del self._data_xfer[key]
+        for key in [k for k in self._do_apply if k[1] == voi]:
+            del self._do_apply[key]
+        self._local_unknown_sizes.pop(voi, None)
+        self._local_param_sizes.pop(voi, None)
+        if self._gs_outputs is not None:
+            for gs_outputs in itervalues(self._gs_outputs):
+                for outs in itervalues(gs_outputs):
+                    outs.pop(voi, None)
+
+    def _reserve_vois(self, vois):
+        """ Marks the derivative `VecWrapper`s of the given variables of
+        interest as the most recently used, then frees those of the least
+        recently used variables of interest until no more than the number
+        given as deriv_vec_cache to `Problem.setup` remain. The given ones
+        are never freed. Only called on the root `Group`.
+
+        Args
+        ----
+        vois : iter of str
+            Names of the variables of interest about to be solved for.
+        """
+        probdata = self._probdata
+        lru = probdata.voi_lru
+
+        for voi in vois:
+            if voi is not None and voi in self.dumat:
+                lru.pop(voi, None)
+                lru[voi] = True
+
+        for voi in list(lru):
+            if len(lru) <= probdata.deriv_vec_cache:
+                break
+            if voi not in vois:
+                del lru[voi]
+                for s in self.subsystems(recurse=True, include_self=True):
+                    s._free_voi_vecs(voi)
 
     def _create_vecs(self, my_params, voi, impl):
         """ This creates our vecs and mats. This is only called on
@@ -537,6 +660,7 @@ class Group(System):
                                                      self._probdata, comm)
             self.params = impl.create_tgt_vecwrapper(self._sysdata,
                                                      self._probdata, comm)
+            self.params._allow_alias = self._allow_param_alias
 
             # VecWrappers must be allocated space for imaginary part if we use
             # complex step at the top.
@@ -748,16 +872,64 @@ class Group(System):
             Dictionary containing execution metadata (e.g. iteration coordinate).
         """
 
+        # Complex step only perturbs the imaginary part, which we don't track.
+        incremental = self.incremental and not self._probdata.in_complex_step
+
         # transfer data to each subsystem and then solve_nonlinear it
         for sub in itervalues(self._subsystems):
             self._transfer_data(sub.name)
             if sub.is_active():
+                if incremental:
+                    # Subsystems run in order, so a skipped subsystem leaves
+                    # the params of everything downstream of it unchanged too.
+                    state = self._get_inc_state(sub, sub.params)
+                    cached = self._inc_cache.get(sub.name)
+                    if state is not None and cached is not None and \
+                       np.array_equal(state, cached[0]) and \
+                       np.array_equal(self._get_inc_state(sub, sub.unknowns),
+                                      cached[1]):
+                        continue
+
                 with sub._dircontext:
                     if isinstance(sub, Component):
                         sub._sys_solve_nonlinear(sub.params, sub.unknowns, sub.resids)
                     else:
                         sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids, metadata)
 
+                if incremental and state is not None:
+                    self._inc_cache[sub.name] = \
+                        (state, self._get_inc_state(sub, sub.unknowns))
+
+    def _get_inc_state(self, sub, vec):
+        """
+        Returns a flat copy of the local values in one of a subsystem's
+        `VecWrappers`, or None if it contains pass_by_obj variables.
+
+        Args
+        ----
+        sub : `System`
+            Subsystem that owns the vector.
+
+        vec : `VecWrapper`
+            The params or unknowns of sub.
+
+        Returns
+        -------
+        ndarray or None
+            Concatenated values of all local variables in vec.
+        """
+        vals = []
+        for acc in itervalues(vec._dat):
+            if acc.pbo:
+                return None
+            if not acc.remote:
+                vals.append(acc.val.ravel())
+
+        if not vals:
+            return np.zeros(0)
+
+        return np.concatenate(vals)
+
     def _sys_apply_nonlinear(self, params, unknowns, resids, metadata=None):
         """
         Evaluates the residuals of our children systems. This wrapper
@@ -977,7 +1149,8 @@ class Group(System):
             if isinstance(system, Group):
                 system.clear_dparams()  # only call on Groups
 
-    def assemble_jacobian(self, mode='fwd', method='assemble', mult=None):
+    def assemble_jacobian(self, mode='fwd', method='assemble', mult=None,
+                          sparse=False):
         """ Assemble and return an ndarray containing the Jacobian for this
         Group.
 
@@ -998,10 +1171,15 @@ class Group(System):
         mult : function(None)
             Solver mult function to coordinate the matrix vector product
 
+        sparse : bool(False)
+            Only used when method is 'assemble'. Set to True to store only
+            the nonzero entries of the component Jacobians and return a
+            scipy.sparse CSC matrix instead of a dense ndarray.
+
         Returns
         -------
-        ndarray : Jacobian Matrix. Note: if mode is 'rev', then the transpose
-        Jacobian is returned.
+        ndarray or csc_matrix : Jacobian Matrix. Note: if mode is 'rev', then
+        the transpose Jacobian is returned.
 
         dict of tuples : Contains the location of each derivative in the Jacobian. The
         key is a tuple containing the component name string, and a tuple with the output
@@ -1027,7 +1205,16 @@ class Group(System):
         # Assemble the Jacobian
         else:
 
-            partials = -np.eye(n_edge)
+            if sparse:
+                # Start with the diagonal of -I and collect COO triplets.
+                diag = np.arange(n_edge)
+                diag_vals = -np.ones(n_edge)
+                rows = [diag]
+                cols = [diag]
+                data = [diag_vals]
+            else:
+                partials = -np.eye(n_edge)
+
             icache = self._icache
             conn = self.connections
             sys_prom_name = self._sysdata.to_prom_name
@@ -1069,8 +1256,10 @@ class Group(System):
                             if i_var_abs not in conn:
                                 continue
 
-                            i_var_src = conn[i_var_abs][0]
+                            i_var_src, src_idxs = conn[i_var_abs]
                             i_var_pro = sys_prom_name[i_var_src]
+                            if src_idxs is not None:
+                                self._icache_src_idxs[key2] = np.asarray(src_idxs)
 
                         o_start, o_end = u_vec._dat[o_var_pro].slice
                         i_start, i_end = u_vec._dat[i_var_pro].slice
@@ -1080,10 +1269,48 @@ class Group(System):
                     else:
                         (o_start, o_end, i_start, i_end) = icache[key2]
 
-                    if mode=='fwd':
-                        partials[o_start:o_end, i_start:i_end] = jac[o_var, i_var]
+                    if sparse:
+                        # A state's derivative with respect to itself
+                        # replaces the -I block rather than adding to it.
+                        if o_start == i_start:
+                            diag_vals[o_start:o_end] = 0.0
+
+                        J = jac[o_var, i_var]
+                        if issparse(J):
+                            J = J.tocoo()
+                            irow, icol = J.row, J.col
+                            data.append(J.data)
+                        else:
+                            irow, icol = np.nonzero(J)
+                            data.append(J[irow, icol])
+
+                        # Params connected with src_indices only touch part
+                        # of their source.
+                        src_idxs = self._icache_src_idxs.get(key2)
+                        if src_idxs is not None:
+                            icol = src_idxs[icol]
+
+                        if mode=='fwd':
+                            rows.append(irow + o_start)
+                            cols.append(icol + i_start)
+                        else:
+                            rows.append(icol + i_start)
+                            cols.append(irow + o_start)
                     else:
-                        partials[i_start:i_end, o_start:o_end] = jac[o_var, i_var].T
+                        J = jac[o_var, i_var]
+                        if issparse(J):
+                            J = J.toarray()
+
+                        if mode=='fwd':
+                            partials[o_start:o_end, i_start:i_end] = J
+                        else:
+                            partials[i_start:i_end, o_start:o_end] = J.T
+
+            if sparse:
+                # Duplicate entries are summed during conversion.
+                partials = coo_matrix((np.concatenate(data),
+                                       (np.concatenate(rows), np.concatenate(cols))),
+                                      shape=(n_edge, n_edge)).tocsc()
 
         return partials, icache
 
@@ -1525,45 +1752,54 @@ class Group(System):
         fwd = 0
         rev = 1
         modename = ['fwd', 'rev']
-        xfer_dict = OrderedDict()
 
-        for param in self.connections:
-            if param not in my_params:
-                continue
+        # the index arrays only depend on the structure of the model, so they
+        # can come from the setup cache
+        cache = self._probdata.setup_cache
+        cache_key = ('xfer', self.pathname, var_of_interest)
+        xfer_dict = cache.get(cache_key) if cache is not None else None
+        if xfer_dict is None:
+            xfer_dict = OrderedDict()
+            for param in self.connections:
+                if param not in my_params:
+                    continue
 
-            unknown, idxs = self.connections[param]
-            if self._unknowns_dict[unknown]['top_promoted_name'] not in relevant:
-                continue
+                unknown, idxs = self.connections[param]
+                if self._unknowns_dict[unknown]['top_promoted_name'] not in relevant:
+                    continue
 
-            if self._params_dict[param]['top_promoted_name'] not in relevant:
-                continue
+                if self._params_dict[param]['top_promoted_name'] not in relevant:
+                    continue
+
+                urelname = to_prom_name[unknown]
+                prelname = name_relative_to(self.pathname, param)
+
+                umeta = self.unknowns.metadata(urelname)
 
-            urelname = to_prom_name[unknown]
-            prelname = name_relative_to(self.pathname, param)
-
-            umeta = self.unknowns.metadata(urelname)
-
-            # remove our system pathname from the abs pathname of the param
-            # and get the subsystem name from that
-
-            tgt_sys = nearest_child(self.pathname, param)
-            src_sys = nearest_child(self.pathname, unknown)
-            for sname, mode in ((tgt_sys, fwd), (src_sys, rev)):
-                src_idx_list, dest_idx_list, vec_conns, byobj_conns = \
-                    xfer_dict.setdefault((sname, mode), ([], [], [], []))
-
-                if 'pass_by_obj' in umeta and umeta['pass_by_obj']:
-                    # rev is for derivs only, so no by_obj passing needed
-                    if mode == fwd:
-                        byobj_conns.append((prelname, urelname))
-                else:  # pass by vector
-                    sidxs, didxs = self._get_global_idxs(urelname, prelname,
-                                                         vec_unames, unknown_sizes,
-                                                         vec_pnames, param_sizes,
-                                                         modename[mode])
-                    vec_conns.append((prelname, urelname))
-                    src_idx_list.append(sidxs)
-                    dest_idx_list.append(didxs)
+                # remove our system pathname from the abs pathname of the param
+                # and get the subsystem name from that
+
+                tgt_sys = nearest_child(self.pathname, param)
+                src_sys = nearest_child(self.pathname, unknown)
+                for sname, mode in ((tgt_sys, fwd), (src_sys, rev)):
+                    src_idx_list, dest_idx_list, vec_conns, byobj_conns = \
+                        xfer_dict.setdefault((sname, mode), ([], [], [], []))
+
+                    if 'pass_by_obj' in umeta and umeta['pass_by_obj']:
+                        # rev is for derivs only, so no by_obj passing needed
+                        if mode == fwd:
+                            byobj_conns.append((prelname, urelname))
+                    else:  # pass by vector
+                        sidxs, didxs = self._get_global_idxs(urelname, prelname,
+                                                             vec_unames, unknown_sizes,
+                                                             vec_pnames, param_sizes,
+                                                             modename[mode])
+                        vec_conns.append((prelname, urelname))
+                        src_idx_list.append(sidxs)
+                        dest_idx_list.append(didxs)
+
+            if cache is not None:
+                cache.set(cache_key, xfer_dict)
 
         if alloc_derivs:
             uvec = self.dumat[var_of_interest]
@@ -1595,14 +1831,16 @@ class Group(System):
                         self._data_xfer[(tgt_sys, modename[mode], var_of_interest)] = \
                             self._impl.create_data_xfer(uvec, pvec,
                                                         srcs, tgts, flats, byobjs,
-                                                        modename[mode], self._sysdata)
+                                                        modename[mode], self._sysdata,
+                                                        aliased=self.params._aliased)
 
             # add a full scatter for the current direction
             self._data_xfer[('', modename[mode], var_of_interest)] = \
                 self._impl.create_data_xfer(uvec, pvec,
                                             full_srcs, full_tgts,
                                             full_flats, full_byobjs,
-                                            modename[mode], self._sysdata)
+                                            modename[mode], self._sysdata,
+                                            aliased=self.params._aliased)
 
     def _transfer_data(self, target_sys='', mode='fwd', deriv=False,
                        var_of_interest=None):
@@ -1626,6 +1864,11 @@ class Group(System):
             Specifies the variable of interest to determine relevance.
 
         """
+        if deriv and var_of_interest not in self.dpmat and \
+                self._probdata.deriv_vec_cache:
+            # creates the vecs and data transfers for var_of_interest
+            self._alloc_voi_vecs(var_of_interest)
+
         x = self._data_xfer.get((target_sys, mode, var_of_interest))
         if x is not None:
             if deriv:
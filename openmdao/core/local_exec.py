@@ -0,0 +1,301 @@
+""" Local (non-MPI) execution backends used by `ParallelGroup` to run its
+subsystems concurrently in a thread pool or a pool of worker processes."""
+
+import sys
+import traceback
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+from six import iteritems
+
+import numpy as np
+
+from openmdao.core.component import Component
+
+
+def _run_sub(sub, op, metadata):
+    """ Runs solve_nonlinear, apply_nonlinear or linearize on a subsystem."""
+    if op == 'linearize':
+        sub._sys_linearize(sub.params, sub.unknowns, sub.resids)
+    elif op == 'solve':
+        if isinstance(sub, Component):
+            sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids)
+        else:
+            sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids, metadata)
+    else:
+        if isinstance(sub, Component):
+            sub.apply_nonlinear(sub.params, sub.unknowns, sub.resids)
+        else:
+            sub.apply_nonlinear(sub.params, sub.unknowns, sub.resids, metadata)
+
+
+def _get_jacobians(sub):
+    """ Returns the Jacobians that linearize left on a subsystem and the
+    systems below it, by pathname."""
+    return dict((s.pathname, s._jacobian_cache)
+                for s in sub.subsystems(recurse=True, include_self=True))
+
+
+def _set_jacobians(sub, jacs):
+    """ Sets the Jacobians of a subsystem and the systems below it from a
+    dict returned by `_get_jacobians`."""
+    for s in sub.subsystems(recurse=True, include_self=True):
+        s._jacobian_cache = jacs[s.pathname]
+
+
+def _get_pbo(vec):
+    """ Returns a dict of the local pass_by_obj values in a `VecWrapper`."""
+    return dict((name, acc.val.val) for name, acc in iteritems(vec._dat)
+                if acc.pbo and not acc.remote)
+
+
+def _set_pbo(vec, vals):
+    """ Sets pass_by_obj values in a `VecWrapper` from a dict."""
+    for name, val in iteritems(vals):
+        vec._dat[name].val.val = val
+
+
+def _local_views(vec):
+    """ Returns the arrays holding the local, non pass_by_obj values in a
+    `VecWrapper`."""
+    return [acc.val for acc in vec._dat.values()
+            if not (acc.pbo or acc.remote)]
+
+
+def _shared_buffer(ctx, views):
+    """ Returns a flat array in shared memory big enough to hold all of the
+    given arrays."""
+    size = sum(view.size for view in views)
+    raw = ctx.RawArray('b', max(size, 1)*np.dtype(float).itemsize)
+    return np.frombuffer(raw, dtype=float)[:size]
+
+
+def _pack(views, buf):
+    """ Copies a list of arrays into a flat buffer."""
+    start = 0
+    for view in views:
+        end = start + view.size
+        buf[start:end] = view.reshape(-1)
+        start = end
+
+
+def _unpack(buf, views):
+    """ Copies a flat buffer into a list of arrays."""
+    start = 0
+    for view in views:
+        end = start + view.size
+        view[...] = buf[start:end].reshape(view.shape)
+        start = end
+
+
+class ThreadBackend(object):
+    """ Runs subsystems in a pool of threads. This only gives a speedup for
+    subsystems that release the GIL, e.g., ones that spend their time in
+    numpy or waiting on an external code.
+
+    Args
+    ----
+    subs : list of `System`
+        Subsystems to run concurrently.
+
+    num_workers : int
+        Number of threads.
+
+    absdir : str
+        Absolute directory of the parent `System`. Subsystems can't run in a
+        different directory, because the working directory is shared by all
+        threads.
+    """
+
+    def __init__(self, subs, num_workers, absdir):
+        for sub in subs:
+            for s in sub.subsystems(recurse=True, include_self=True):
+                if s._sysdata.absdir != absdir:
+                    raise RuntimeError("'%s' runs in its own directory, which "
+                                       "can't be done from a thread. Use "
+                                       "local_exec='process' instead." %
+                                       s.pathname)
+
+        self._subs = subs
+        self._pool = ThreadPool(min(num_workers, len(subs)))
+
+    def run(self, op, metadata):
+        """ Runs all subsystems and waits for them to finish.
+
+        Args
+        ----
+        op : str
+            'solve' to call solve_nonlinear, 'apply' to call apply_nonlinear
+            or 'linearize' to linearize.
+
+        metadata : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        self._pool.map(lambda sub: _run_sub(sub, op, metadata), self._subs)
+
+    def shutdown(self):
+        """ Stops the worker threads."""
+        self._pool.close()
+        self._pool.join()
+
+
+class ProcessBackend(object):
+    """ Runs subsystems in a pool of forked worker processes. Each worker
+    owns a fixed set of the subsystems. The params, unknowns, and resids of
+    each subsystem are mirrored in shared memory buffers that are copied in
+    before and out after every run. Values of pass_by_obj variables are sent
+    through a pipe instead.
+
+    Subsystems are linearized in the worker too, and their Jacobians are
+    sent back through the pipe, so linearize can use any state that
+    solve_nonlinear leaves on a component. Any other state that a subsystem
+    changes while it runs lives in the worker process and is not seen by
+    the parent process, where apply_linear and solve_linear run.
+
+    Args
+    ----
+    subs : list of `System`
+        Subsystems to run concurrently.
+
+    num_workers : int
+        Number of worker processes.
+    """
+
+    def __init__(self, subs, num_workers):
+        if sys.platform == 'win32':
+            raise RuntimeError("local_exec='process' requires a platform "
+                               "that supports fork.")
+
+        if hasattr(multiprocessing, 'get_context'):
+            ctx = multiprocessing.get_context('fork')
+        else:
+            ctx = multiprocessing
+
+        self._subs = subs
+
+        # The values of a Component's params live in its parent's vector, so
+        # we mirror each variable rather than the subsystem vectors.
+        self._views = []
+        self._bufs = []
+        for sub in subs:
+            views = tuple(_local_views(vec) for vec in (sub.params,
+                                                        sub.unknowns,
+                                                        sub.resids))
+            self._views.append(views)
+            self._bufs.append(tuple(_shared_buffer(ctx, v) for v in views))
+
+        num_workers = min(num_workers, len(subs))
+        self._conns = []
+        self._procs = []
+        self._idxs = []
+        for i in range(num_workers):
+            idxs = list(range(i, len(subs), num_workers))
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=self._worker, args=(child_conn, idxs))
+            proc.daemon = True
+            proc.start()
+            child_conn.close()
+
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+            self._idxs.append(idxs)
+
+    def _worker(self, conn, idxs):
+        """ Main loop of a worker process."""
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
+            if msg is None:
+                break
+
+            op, metadata, pbo_in = msg
+            try:
+                out = {}
+                for i in idxs:
+                    sub = self._subs[i]
+                    pviews, uviews, rviews = self._views[i]
+                    pbuf, ubuf, rbuf = self._bufs[i]
+
+                    _unpack(pbuf, pviews)
+                    _unpack(ubuf, uviews)
+                    _unpack(rbuf, rviews)
+                    _set_pbo(sub.params, pbo_in[i][0])
+                    _set_pbo(sub.unknowns, pbo_in[i][1])
+
+                    with sub._dircontext:
+                        _run_sub(sub, op, metadata)
+
+                    _pack(uviews, ubuf)
+                    _pack(rviews, rbuf)
+                    jacs = _get_jacobians(sub) if op == 'linearize' else None
+                    out[i] = (_get_pbo(sub.unknowns), jacs)
+
+            except Exception as err:
+                try:
+                    conn.send((err, None))
+                except Exception:
+                    conn.send((RuntimeError(traceback.format_exc()), None))
+            else:
+                conn.send((None, out))
+
+    def run(self, op, metadata):
+        """ Runs all subsystems and waits for them to finish.
+
+        Args
+        ----
+        op : str
+            'solve' to call solve_nonlinear, 'apply' to call apply_nonlinear
+            or 'linearize' to linearize.
+
+        metadata : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        for views, bufs in zip(self._views, self._bufs):
+            for view, buf in zip(views, bufs):
+                _pack(view, buf)
+
+        for conn, idxs in zip(self._conns, self._idxs):
+            pbo_in = dict((i, (_get_pbo(self._subs[i].params),
+                               _get_pbo(self._subs[i].unknowns))) for i in idxs)
+            conn.send((op, metadata, pbo_in))
+
+        # Collect from every worker before raising so they all stay in step.
+        error = None
+        for conn in self._conns:
+            err, out = conn.recv()
+            if err is not None:
+                if error is None:
+                    error = err
+                continue
+
+            for i, (vals, jacs) in iteritems(out):
+                _set_pbo(self._subs[i].unknowns, vals)
+                if jacs is not None:
+                    _set_jacobians(self._subs[i], jacs)
+
+        for (pviews, uviews, rviews), (pbuf, ubuf, rbuf) in zip(self._views,
+                                                                self._bufs):
+            _unpack(ubuf, uviews)
+            _unpack(rbuf, rviews)
+
+        if error is not None:
+            raise error
+
+    def shutdown(self):
+        """ Stops the worker processes."""
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (IOError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(1.0)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+
+        self._conns = []
+        self._procs = []
@@ -0,0 +1,214 @@
+""" A memoization cache that lets a `Component` skip solve_nonlinear when it
+is run again with params it has already seen."""
+
+import os
+import hashlib
+from collections import OrderedDict
+
+from six import iteritems, itervalues
+from six.moves import cPickle as pickle
+
+import numpy as np
+
+
+class MemoCache(object):
+    """ Least recently used cache of the unknowns of a `Component`, keyed on
+    the values of its params (including pass_by_obj params) and states.
+    Assign an instance to the `memo_cache` attribute of a `Component` to turn
+    it on. This only makes sense for components whose outputs depend on
+    nothing but their params.
+
+    Args
+    ----
+    max_entries : int(128)
+        Maximum number of cached evaluations. Set to None for no limit.
+
+    max_bytes : int, optional
+        Maximum total size in bytes of the cached unknowns. Default is None,
+        which means no limit.
+
+    filename : str, optional
+        If given, the cache is loaded from this file the first time it is
+        used, and saved to it when the `Problem` is cleaned up (or when `save`
+        is called), so it persists between runs.
+
+    Attributes
+    ----------
+    hits : int
+        Number of evaluations that were found in the cache.
+
+    misses : int
+        Number of evaluations that had to run solve_nonlinear.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, filename=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.filename = filename
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._layout = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """ Removes all entries and resets the counters."""
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get_layout(self, params, unknowns):
+        """ Returns the names and sizes of the variables in the key and the
+        cached values, so that a cache loaded from disk can be checked
+        against the component."""
+        return (tuple((name, acc.meta.get('size')) for name, acc in
+                      iteritems(params._dat)),
+                tuple((name, acc.meta.get('size')) for name, acc in
+                      iteritems(unknowns._dat)))
+
+    def _load(self, layout):
+        """ Loads the entries saved in our file, if they were saved for a
+        component with the same variables."""
+        self._layout = layout
+        if self.filename and os.path.exists(self.filename):
+            with open(self.filename, 'rb') as f:
+                saved_layout, entries = pickle.load(f)
+            if saved_layout == layout:
+                for key, entry in iteritems(entries):
+                    self._add(key, entry)
+
+    def save(self):
+        """ Saves the cache to its file."""
+        if self.filename and self._layout is not None:
+            with open(self.filename, 'wb') as f:
+                pickle.dump((self._layout, self._entries), f,
+                            pickle.HIGHEST_PROTOCOL)
+
+    def get_key(self, params, unknowns):
+        """ Returns a hash of the params and states of a component.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        Returns
+        -------
+        str or None
+            The key, or None if a pass_by_obj param can't be pickled.
+        """
+        if self._layout is None:
+            self._load(self._get_layout(params, unknowns))
+
+        sha = hashlib.sha1()
+        for acc in itervalues(params._dat):
+            if acc.remote:
+                continue
+            if acc.pbo:
+                try:
+                    sha.update(pickle.dumps(acc.val.val, 2))
+                except Exception:
+                    return None
+            else:
+                sha.update(np.ascontiguousarray(acc.val).view(np.uint8))
+
+        for acc in itervalues(unknowns._dat):
+            if acc.meta.get('state') and not (acc.pbo or acc.remote):
+                sha.update(np.ascontiguousarray(acc.val).view(np.uint8))
+
+        return sha.hexdigest()
+
+    def restore(self, key, unknowns):
+        """ Copies the cached unknowns for key into the unknowns vector.
+
+        Args
+        ----
+        key : str or None
+            Key returned by `get_key`.
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        Returns
+        -------
+        bool
+            True if key was found in the cache.
+        """
+        entry = self._entries.get(key) if key is not None else None
+        if entry is None:
+            self.misses += 1
+            return False
+
+        # Mark as most recently used.
+        del self._entries[key]
+        self._entries[key] = entry
+
+        vals, pbos = entry
+        for name, val in iteritems(vals):
+            unknowns._dat[name].val[...] = val
+        for name, val in iteritems(pbos):
+            unknowns._dat[name].val.val = pickle.loads(val)
+
+        self.hits += 1
+        return True
+
+    def store(self, key, unknowns):
+        """ Adds the current unknowns to the cache under key.
+
+        Args
+        ----
+        key : str or None
+            Key returned by `get_key`.
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+        """
+        if key is None:
+            return
+
+        vals = {}
+        pbos = {}
+        for name, acc in iteritems(unknowns._dat):
+            if acc.remote:
+                continue
+            if acc.pbo:
+                try:
+                    pbos[name] = pickle.dumps(acc.val.val, 2)
+                except Exception:
+                    return
+            else:
+                vals[name] = acc.val.copy()
+
+        self._add(key, (vals, pbos))
+
+    def _add(self, key, entry):
+        """ Adds an entry, then evicts the least recently used ones until we
+        are within our limits."""
+        if key in self._entries:
+            self._nbytes -= self._entry_size(self._entries.pop(key))
+
+        self._entries[key] = entry
+        self._nbytes += self._entry_size(entry)
+
+        while self._entries and \
+              ((self.max_entries is not None and
+                len(self._entries) > self.max_entries) or
+               (self.max_bytes is not None and self._nbytes > self.max_bytes)):
+            _, old = self._entries.popitem(last=False)
+            self._nbytes -= self._entry_size(old)
+
+    @staticmethod
+    def _entry_size(entry):
+        """ Returns the size in bytes of a cache entry."""
+        vals, pbos = entry
+        return sum(val.nbytes for val in itervalues(vals)) + \
+               sum(len(val) for val in itervalues(pbos))
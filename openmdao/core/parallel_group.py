@@ -2,11 +2,13 @@
 used for systems of `Components` or `Groups` that can be run in parallel."""
 
 import warnings
+import multiprocessing
 from collections import OrderedDict
 from six import itervalues
 
 from openmdao.core.component import Component
 from openmdao.core.group import Group
+from openmdao.core.local_exec import ThreadBackend, ProcessBackend
 from openmdao.core.mpi_wrap import MPI
 
 
@@ -14,6 +16,20 @@ class ParallelGroup(Group):
     """ParallelGroup is used for systems of `Components` or `Groups` that can
     be run in parallel.
 
+    Args
+    ----
+    local_exec : str, optional
+        Only used when not running under MPI. Set to 'thread' to run the
+        subsystems in a thread pool, which helps for subsystems that release
+        the GIL (e.g., numpy-heavy components or external codes). Set to
+        'process' to run them in a pool of forked worker processes that
+        exchange their params, unknowns, and resids through shared memory.
+        Default is None, which runs the subsystems one after another.
+
+    num_workers : int, optional
+        Number of threads or worker processes to use with local_exec. Default
+        is the number of cpus.
+
     Options
     -------
     deriv_options['type'] :  str('user')
@@ -45,8 +61,61 @@ class ParallelGroup(Group):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['fd_coloring'] : bool(False)
+        Set to True to detect the sparsity of the finite difference Jacobian
+        with respect to each param the first time it is computed, and
+        afterwards perturb all structurally orthogonal entries of that param
+        together.
     """
 
+    # Subsystems of a ParallelGroup must see the values from the last full
+    # scatter, not whatever their siblings have computed since.
+    _allow_param_alias = False
+
+    def __init__(self, local_exec=None, num_workers=None):
+        super(ParallelGroup, self).__init__()
+
+        if local_exec not in (None, 'thread', 'process'):
+            raise ValueError("local_exec must be one of None, 'thread', or "
+                             "'process', but '%s' was given." % local_exec)
+
+        self._local_exec = local_exec
+        self._num_workers = num_workers
+        self._local_backend = None
+
+    def _get_local_backend(self):
+        """ Returns the thread or process backend that runs our local
+        subsystems, starting it the first time it is needed after setup. Returns
+        None if the subsystems should just run one after another, which is
+        also the case during complex step since the backends only carry the
+        real part of the vectors."""
+        if self._local_exec is None or MPI or \
+           len(self._local_subsystems) < 2 or self._probdata.in_complex_step:
+            return None
+
+        if self._local_backend is None:
+            num_workers = self._num_workers or multiprocessing.cpu_count()
+            if self._local_exec == 'thread':
+                self._local_backend = ThreadBackend(self._local_subsystems,
+                                                    num_workers,
+                                                    self._sysdata.absdir)
+            else:
+                self._local_backend = ProcessBackend(self._local_subsystems,
+                                                     num_workers)
+
+        return self._local_backend
+
+    def _shutdown_local_backend(self):
+        """ Stops any threads or worker processes."""
+        if self._local_backend is not None:
+            self._local_backend.shutdown()
+            self._local_backend = None
+
+    def cleanup(self):
+        """ Clean up resources prior to exit. """
+        self._shutdown_local_backend()
+        super(ParallelGroup, self).cleanup()
+
     def apply_nonlinear(self, params, unknowns, resids, metadata=None):
         """ Evaluates the residuals of our children systems.
 
@@ -69,6 +138,11 @@ class ParallelGroup(Group):
         # full scatter
         self._transfer_data()
 
+        backend = self._get_local_backend()
+        if backend is not None:
+            backend.run('apply', metadata)
+            return
+
         for sub in self._local_subsystems:
             if isinstance(sub, Component):
                 sub.apply_nonlinear(sub.params, sub.unknowns, sub.resids)
@@ -76,12 +150,39 @@ class ParallelGroup(Group):
                 sub.apply_nonlinear(sub.params, sub.unknowns, sub.resids,
                                     metadata)
 
+    def linearize(self, params, unknowns, resids):
+        """
+        Linearize all our subsystems.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+        """
+        backend = self._get_local_backend()
+        if backend is not None:
+            backend.run('linearize', None)
+            return
+
+        super(ParallelGroup, self).linearize(params, unknowns, resids)
+
     def children_solve_nonlinear(self, metadata):
         """Loops over our children systems and asks them to solve."""
 
         # full scatter
         self._transfer_data()
 
+        backend = self._get_local_backend()
+        if backend is not None:
+            backend.run('solve', metadata)
+            return
+
         for sub in self._local_subsystems:
             with sub._dircontext:
                 if isinstance(sub, Component):
@@ -133,6 +234,7 @@ class ParallelGroup(Group):
         """
         self.comm = comm
         self._local_subsystems = []
+        self._shutdown_local_backend()
 
         # If we're not runnin in MPI, make this just a serial Group
         if not MPI or not self.is_active():
@@ -80,7 +80,7 @@ class PetscImpl(object):
     @staticmethod
     def create_data_xfer(src_vec, tgt_vec,
                          src_idxs, tgt_idxs, vec_conns, byobj_conns, mode,
-                         sysdata):
+                         sysdata, aliased=()):
         """
         Create an object for performing data transfer between source
         and target vectors.
@@ -116,6 +116,9 @@ class PetscImpl(object):
             The `SysData` object for the Group that will contain the new
             `DataTransfer` object.
 
+        aliased : set, optional
+            Not used. Params are never aliased under MPI.
+
         Returns
         -------
         `PetscDataTransfer`
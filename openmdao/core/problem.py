@@ -25,6 +25,8 @@ from openmdao.core._checks import check_connections, _both_names
 from openmdao.core.driver import Driver
 from openmdao.core.mpi_wrap import MPI, under_mpirun, debug
 from openmdao.core.relevance import Relevance
+from openmdao.core.setup_timer import SetupTimer
+from openmdao.core.setup_cache import _fingerprint
 
 from openmdao.components.indep_var_comp import IndepVarComp
 from openmdao.solvers.scipy_gmres import ScipyGMRES
@@ -36,6 +38,7 @@ from openmdao.util.string_util import get_common_ancestor, nearest_child, name_r
 from openmdao.util.graph import plain_bfs, OrderedDigraph
 from openmdao.util.options import OptionsDictionary
 from openmdao.util.dict_util import _jac_to_flat_dict
+from openmdao.util.coloring import get_col_coloring
 
 force_check = os.environ.get('OPENMDAO_FORCE_CHECK_SETUP')
 trace = os.environ.get('OPENMDAO_TRACE')
@@ -50,6 +53,11 @@ class _ProbData(object):
         self.in_complex_step = False
         self.precon_level = 0
         self.pathname = ''
+        self.alias_params = False
+        self.deriv_vec_cache = None
+        self.voi_lru = OrderedDict()
+        self.setup_timer = SetupTimer()
+        self.setup_cache = None
 
 def _get_root_var(root, name):
     """
@@ -114,6 +122,16 @@ class Problem(object):
         If set to True, all numpy floating point errors raise exceptions and
         the variable locations that go to inf or nan are printed when they can
         be determined.
+
+    Attributes
+    ----------
+    setup_timing : `SetupTimer`
+        Wall time and memory used by each phase of the last call to `setup`.
+        Call its `report` method to print a summary.
+
+    setup_cache : `SetupCache` or None
+        If set, the parts of setup that depend only on the structure of the
+        model are loaded from this cache when possible. Default is None.
     """
 
     def __init__(self, root=None, driver=None, impl=None, comm=None, debug=False):
@@ -141,6 +159,12 @@ class Problem(object):
         self.pathname = ''
         self._parent_dir = None
 
+        self.setup_timing = SetupTimer()
+        self.setup_cache = None
+
+        # total Jacobian colorings, keyed by (mode, indep_list, unknown_list)
+        self._total_colorings = {}
+
         # Default numpy error behavior: we want to raise whenever we can, except for
         # underflow.
         if debug == True:
@@ -436,7 +460,8 @@ class Problem(object):
 
         return ubcs, tgts
 
-    def setup(self, check=True, out_stream=sys.stdout):
+    def setup(self, check=True, out_stream=sys.stdout, alias_params=False,
+              deriv_vec_cache=None):
         """Performs all setup of vector storage, data transfer, etc.,
         necessary to perform calculations.
 
@@ -448,11 +473,37 @@ class Problem(object):
 
         out_stream : a file-like object, optional
             Stream where report will be written if check is performed.
+
+        alias_params : bool, optional
+            If True, a param that is connected to a whole unknown with no
+            src_indices and no unit conversion is given a view of the
+            unknown's storage instead of a copy, and is left out of the data
+            transfers. The view is read-only, so a component that writes
+            into such a param in place gets an error. Such a param always
+            holds the current value of its unknown, including before
+            `run()`, where it would otherwise still hold its own initial
+            value. Ignored under MPI. Default is False.
+
+        deriv_vec_cache : int, optional
+            Only used if the root ln_solver is `LinearGaussSeidel`. If given,
+            the derivative vectors and data transfers for each variable of
+            interest are created the first time a linear solve needs them
+            instead of during setup, and only those for the given number of
+            the most recently used variables of interest are kept. Variables
+            of interest that are solved together are always kept. Ignored
+            under MPI. Default is None, which creates all of them in setup.
         """
+        if deriv_vec_cache is not None and deriv_vec_cache < 1:
+            raise ValueError("deriv_vec_cache must be at least 1, but "
+                             "is %s." % deriv_vec_cache)
+
+        timer = self.setup_timing
+        timer.reset()
 
         # Recursively call pre_setup on all subsystems
-        for s in self.root.subsystems(recurse=True, include_self=True):
-            s.pre_setup(self)
+        with timer.phase('pre_setup'):
+            for s in self.root.subsystems(recurse=True, include_self=True):
+                s.pre_setup(self)
 
         self._setup_errors = []
 
@@ -461,17 +512,24 @@ class Problem(object):
         tree_changed = False
 
         self._probdata = _ProbData()
+        self._probdata.alias_params = alias_params and not MPI
+        self._probdata.setup_timer = timer
+        self._total_colorings = {}
 
         if isinstance(self.root.ln_solver, LinearGaussSeidel):
             self._probdata.top_lin_gs = True
+            if not MPI:
+                self._probdata.deriv_vec_cache = deriv_vec_cache
 
         self.driver.set_root(self.pathname, self.root)
 
         # Give every system and solver an absolute pathname
-        self.root._init_sys_data('', self._probdata)
+        with timer.phase('init_sys_data'):
+            self.root._init_sys_data('', self._probdata)
 
         # divide MPI communicators among subsystems
-        self._setup_communicators()
+        with timer.phase('setup_communicators'):
+            self._setup_communicators()
 
         # Returns the parameters and unknowns metadata dictionaries
         # for the root, which has an entry for each variable contained
@@ -485,17 +543,39 @@ class Problem(object):
         #     'shape' : 1,
         #     'val': 2.5,   # the initial value of that variable (if known)
         #  }
-        params_dict, unknowns_dict = self.root._setup_variables()
+        with timer.phase('setup_variables'):
+            params_dict, unknowns_dict = self.root._setup_variables()
 
         self._probdata.params_dict = params_dict
         self._probdata.unknowns_dict = unknowns_dict
         self._probdata.to_prom_name = self.root._sysdata.to_prom_name
 
+        pois = self.driver.desvars_of_interest()
+        oois = self.driver.outputs_of_interest()
+
+        cache = self.setup_cache if not MPI else None
+        if cache is not None:
+            with timer.phase('setup_cache'):
+                cache._start(_fingerprint(self, params_dict, unknowns_dict,
+                                          pois, oois))
+        self._probdata.setup_cache = cache
+
         # collect all connections, both implicit and explicit from
         # anywhere in the tree, and put them in a dict where each key
         # is an absolute param name that maps to the absolute name of
         # a single source.
-        connections = self._setup_connections(params_dict, unknowns_dict)
+        with timer.phase('setup_connections'):
+            cached = cache.get('connections') if cache is not None else None
+            if cached is None:
+                nerrs = len(self._setup_errors)
+                connections = self._setup_connections(params_dict, unknowns_dict)
+                if cache is not None:
+                    cache.set('connections',
+                              (connections, self._dangling, self._input_inputs,
+                               self._setup_errors[nerrs:]))
+            else:
+                connections, self._dangling, self._input_inputs, errs = cached
+                self._setup_errors.extend(errs)
         self._probdata.connections = connections
         self._probdata.dangling = self._dangling
 
@@ -543,12 +623,14 @@ class Problem(object):
 
         # perform additional checks on connections
         # (e.g. for compatible types and shapes)
-        self._setup_errors.extend(check_connections(connections, params_dict,
-                                               unknowns_dict,
-                                               self.root._sysdata.to_prom_name))
+        with timer.phase('check_connections'):
+            self._setup_errors.extend(check_connections(connections, params_dict,
+                                                   unknowns_dict,
+                                                   self.root._sysdata.to_prom_name))
 
         # calculate unit conversions and store in param metadata
-        self._setup_units(connections, params_dict, unknowns_dict)
+        with timer.phase('setup_units'):
+            self._setup_units(connections, params_dict, unknowns_dict)
 
         # propagate top level promoted names, unit conversions,
         # and connections down to all subsystems
@@ -573,9 +655,6 @@ class Problem(object):
         # to the parameters that system must transfer data to
         param_owners = _assign_parameters(connections)
 
-        pois = self.driver.desvars_of_interest()
-        oois = self.driver.outputs_of_interest()
-
         self._driver_vois = set()
         for tup in chain(pois, oois):
             self._driver_vois.update(tup)
@@ -603,25 +682,38 @@ class Problem(object):
 
         mode = self._check_for_parallel_derivs(pois, oois, parallel_u, parallel_p)
 
-        self._probdata.relevance = Relevance(self.root, params_dict,
-                                             unknowns_dict, connections,
-                                             pois, oois, mode)
+        with timer.phase('relevance'):
+            cached = cache.get('relevance') if cache is not None else None
+            self._probdata.relevance = Relevance(self.root, params_dict,
+                                                 unknowns_dict, connections,
+                                                 pois, oois, mode, cached=cached)
+            if cache is not None:
+                cache.set('relevance',
+                          self._probdata.relevance._get_cache_data())
 
         # perform auto ordering
         for s in self.root.subgroups(recurse=True, include_self=True):
             # set auto order if order not already set
             if not s._order_set:
-                order = None
-                broken_edges = None
-                if self.comm.rank == 0:
-                    order, broken_edges = s.list_auto_order()
-                if MPI:
-                    if trace:
-                        debug("problem setup order bcast")
-                    order, broken_edges = self.comm.bcast((order, broken_edges), root=0)
-                    if trace:
-                        debug("problem setup order bcast DONE")
-                s.set_order(order)
+                with timer.phase('auto_order', s.pathname):
+                    order = None
+                    broken_edges = None
+                    cached = cache.get(('order', s.pathname)) \
+                             if cache is not None else None
+                    if cached is not None:
+                        order, broken_edges = cached
+                    elif self.comm.rank == 0:
+                        order, broken_edges = s.list_auto_order()
+                        if cache is not None:
+                            cache.set(('order', s.pathname),
+                                      (order, broken_edges))
+                    if MPI:
+                        if trace:
+                            debug("problem setup order bcast")
+                        order, broken_edges = self.comm.bcast((order, broken_edges), root=0)
+                        if trace:
+                            debug("problem setup order bcast DONE")
+                    s.set_order(order)
 
         # Mark every comp that is executed out-of-order so that we
         # rerun them during apply_nonlinear (explicit comps)
@@ -641,23 +733,29 @@ class Problem(object):
             alloc_derivs = alloc_derivs or sub.nl_solver.supports['uses_derivatives']
 
         # create VecWrappers for all systems in the tree.
-        self.root._setup_vectors(param_owners, impl=self._impl, alloc_derivs=alloc_derivs)
+        with timer.phase('setup_vectors'):
+            self.root._setup_vectors(param_owners, impl=self._impl,
+                                     alloc_derivs=alloc_derivs)
 
         # Prepare Driver
-        self.driver._setup()
+        with timer.phase('driver_setup'):
+            self.driver._setup()
 
-        # get map of vars to VOI indices
-        self._poi_indices, self._qoi_indices = self.driver._map_voi_indices()
+            # get map of vars to VOI indices
+            self._poi_indices, self._qoi_indices = self.driver._map_voi_indices()
 
         # Prepare Solvers
         for sub in self.root.subgroups(recurse=True, include_self=True):
-            sub.nl_solver.setup(sub)
-            sub.ln_solver.setup(sub)
+            with timer.phase('solver_setup', sub.pathname):
+                sub.nl_solver.setup(sub)
+                sub.ln_solver.setup(sub)
 
-        self._check_solvers()
+        with timer.phase('check_solvers'):
+            self._check_solvers()
 
         # Prep for case recording and record metadata
-        self._start_recorders()
+        with timer.phase('recorder_setup'):
+            self._start_recorders()
 
         if self._setup_errors:
             stream = cStringIO()
@@ -666,16 +764,22 @@ class Problem(object):
                 stream.write("%s\n" % err)
             raise RuntimeError(stream.getvalue())
 
+        if cache is not None:
+            with timer.phase('setup_cache'):
+                cache.save()
+
         # Lock any restricted options in the options dictionaries.
         OptionsDictionary.locked = True
 
         # Recursively call post_setup on all subsystems
-        for s in self.root.subsystems(recurse=True, include_self=True):
-            s.post_setup(self)
+        with timer.phase('post_setup'):
+            for s in self.root.subsystems(recurse=True, include_self=True):
+                s.post_setup(self)
 
         # check for any potential issues
         if check or force_check:
-            return self.check_setup(out_stream)
+            with timer.phase('check_setup'):
+                return self.check_setup(out_stream)
 
         return {}
 
@@ -1560,6 +1664,17 @@ class Problem(object):
         # Linearize Model
         root._sys_linearize(root.params, unknowns, root.resids)
 
+        # Solve for structurally orthogonal columns (fwd) or rows (rev) of
+        # the total Jacobian at the same time if requested.
+        if root.ln_solver.options.get('simul_coloring') and nproc == 1:
+            J = self._calc_gradient_colored(indep_list, unknown_list,
+                                            return_format, mode,
+                                            dv_scale=dv_scale,
+                                            cn_scale=cn_scale,
+                                            sparsity=sparsity)
+            root.clear_dparams()
+            return J
+
         # Initialize Jacobian
         if return_format == 'dict':
             J = OrderedDict()
@@ -1644,6 +1759,10 @@ class Problem(object):
 
         voi_srcs = {}
 
+        # Solvers that can take a matrix of right-hand sides get all of the
+        # indices of a VOI group in a single call.
+        batch = root.ln_solver.supports.get('solve_multi')
+
         # If Forward mode, solve linear system for each param
         # If Adjoint mode, solve linear system for each unknown
         for params in voi_sets:
@@ -1679,6 +1798,19 @@ class Problem(object):
                                        " in the group %s, %d != %d" % (params, old_size, len(in_idxs)))
                 voi_idxs[vkey] = in_idxs
 
+            if root._probdata.deriv_vec_cache:
+                root._reserve_vois(rhs)
+
+            if batch:
+                rhs_multi = OrderedDict()
+                for voi in params:
+                    vkey = self._get_voi_key(voi, params)
+                    rhs_multi[vkey] = np.zeros((len(rhs[vkey]), len(in_idxs)))
+                    if self.root._owning_ranks[voi_srcs[vkey]] == iproc:
+                        rhs_multi[vkey][voi_idxs[vkey], np.arange(len(in_idxs))] = -1.0
+
+                dx_multi = root.ln_solver.solve_multi(rhs_multi, root, mode)
+
             # at this point, we know that for all vars in the current
             # group of interest, the number of indices is the same. We loop
             # over the *size* of the indices and use the loop index to look
@@ -1696,6 +1828,11 @@ class Problem(object):
                         vkey = self._get_voi_key(voi, params)
                         dx_mat[vkey] = np.zeros((len(duvec.vec), ))
 
+                elif batch:
+                    dx_mat = OrderedDict()
+                    for vkey, dx in iteritems(dx_multi):
+                        dx_mat[vkey] = dx[:, i]
+
                 else:
                     for voi in params:
                         vkey = self._get_voi_key(voi, params)
@@ -1798,6 +1935,239 @@ class Problem(object):
 
         return J
 
+    def _calc_gradient_colored(self, indep_list, unknown_list, return_format,
+                               mode, dv_scale=None, cn_scale=None,
+                               sparsity=None):
+        """ Returns the gradient for the system that is specified in
+        self.root, solving for all structurally orthogonal columns (fwd) or
+        rows (rev) of the total Jacobian with a single right-hand side. The
+        sparsity of the total Jacobian is determined the first time a given
+        combination of variables and mode is requested, from solves at the
+        current point and at a randomly perturbed point, and the resulting
+        coloring is reused until the next setup.
+
+        Args
+        ----
+        indep_list : list of strings
+            List of independent variable names that derivatives are to
+            be calculated with respect to. All params must have a IndepVarComp.
+
+        unknown_list : list of strings
+            List of output or state names that derivatives are to
+            be calculated for. All must be valid unknowns in OpenMDAO.
+
+        return_format : string
+            Format for the derivatives, can be 'array' or 'dict'.
+
+        mode : string
+            Deriviative direction, can be 'fwd' or 'rev'.
+
+        dv_scale : dict, optional
+            Dictionary of driver-defined scale factors on the design variables.
+
+        cn_scale : dict, optional
+            Dictionary of driver-defined scale factors on the constraints.
+
+        sparsity : dict, optional
+            Dictionary that gives the relevant design variables for each
+            constraint. This option is only supported in the `dict` return
+            format.
+
+        Returns
+        -------
+        ndarray or dict
+            Jacobian of unknowns with respect to params.
+        """
+        unknowns = self.root.unknowns
+        fwd = mode == 'fwd'
+
+        if dv_scale is None:
+            dv_scale = {}
+        if cn_scale is None:
+            cn_scale = {}
+
+        indep_list = _flatten_vois(indep_list)
+        unknown_list = _flatten_vois(unknown_list)
+
+        if fwd:
+            input_list, output_list = indep_list, unknown_list
+            in_indices, out_indices = self._poi_indices, self._qoi_indices
+        else:
+            input_list, output_list = unknown_list, indep_list
+            in_indices, out_indices = self._qoi_indices, self._poi_indices
+
+        # The first time through, we solve one column at a time and color the
+        # total Jacobian with the nonzero pattern of the result, combined with
+        # that of a solve at a perturbed point, so that entries that just
+        # happen to be zero here aren't taken as structurally zero.
+        key = (mode, tuple(indep_list), tuple(unknown_list))
+        coloring = self._total_colorings.get(key)
+
+        Jsub = self._solve_colored(input_list, output_list, in_indices,
+                                   out_indices, mode, coloring)
+
+        if coloring is None:
+            nonzero = Jsub != 0.0
+            nonzero |= self._perturbed_sparsity(input_list, output_list,
+                                                in_indices, out_indices, mode)
+            self._total_colorings[key] = get_col_coloring(nonzero)
+
+        if not fwd:
+            Jsub = Jsub.T
+
+        uslices = OrderedDict()
+        usize = 0
+        for u in unknown_list:
+            start = usize
+            if u in self._qoi_indices:
+                usize += len(self._qoi_indices[u])
+            else:
+                usize += unknowns.metadata(u)['size']
+            uslices[u] = slice(start, usize)
+
+        pslices = OrderedDict()
+        psize = 0
+        for p in indep_list:
+            start = psize
+            if p in self._poi_indices:
+                psize += len(self._poi_indices[p])
+            else:
+                psize += unknowns.metadata(p)['size']
+            pslices[p] = slice(start, psize)
+
+        # Driver scaling
+        for p, pslice in iteritems(pslices):
+            if p in dv_scale:
+                Jsub[:, pslice] *= dv_scale[p]
+        for u, uslice in iteritems(uslices):
+            if u in cn_scale:
+                Jsub[uslice, :] *= np.reshape(cn_scale[u], (-1, 1))
+
+        if return_format == 'array':
+            return Jsub
+
+        J = OrderedDict()
+        for u, uslice in iteritems(uslices):
+            J[u] = OrderedDict()
+            for p, pslice in iteritems(pslices):
+
+                # Support sparsity
+                if sparsity is not None:
+                    if p not in sparsity[u]:
+                        continue
+
+                J[u][p] = Jsub[uslice, pslice]
+
+        return J
+
+    def _perturbed_sparsity(self, input_list, output_list, in_indices,
+                            out_indices, mode):
+        """ Returns the nonzero pattern of the total Jacobian (in solve
+        orientation) linearized at a randomly perturbed point. The model is
+        linearized at its current point again afterwards. If the model can't
+        be linearized at the perturbed point, every entry is taken as
+        nonzero.
+        """
+        root = self.root
+        unknowns = root.unknowns
+        saved_u = unknowns.vec.copy()
+        saved_r = root.resids.vec.copy()
+
+        def transfer():
+            for grp in root.subgroups(recurse=True, include_self=True):
+                grp._transfer_data()
+
+        rand = np.random.RandomState(11)
+        size = len(saved_u)
+        unknowns.vec[:] = saved_u*(1.0 + 0.1*rand.uniform(-1.0, 1.0, size)) + \
+                          1.0e-3*rand.uniform(0.5, 1.0, size)
+        try:
+            transfer()
+            root._sys_linearize(root.params, unknowns, root.resids)
+            Jsub = self._solve_colored(input_list, output_list, in_indices,
+                                       out_indices, mode, None)
+            sparsity = Jsub != 0.0
+        except Exception:
+            sparsity = None
+        finally:
+            unknowns.vec[:] = saved_u
+            root.resids.vec[:] = saved_r
+            transfer()
+            root._sys_linearize(root.params, unknowns, root.resids)
+
+        if sparsity is None:
+            duvec = root.dumat[None]
+            nin = sum(len(duvec._get_local_idxs(voi, in_indices))
+                      for voi in input_list)
+            nout = sum(len(duvec._get_local_idxs(item, out_indices))
+                       for item in output_list)
+            sparsity = np.ones((nout, nin), dtype=bool)
+
+        return sparsity
+
+    def _solve_colored(self, input_list, output_list, in_indices, out_indices,
+                       mode, coloring):
+        """ Solves the linear system once for each color and returns the
+        total Jacobian in solve orientation, i.e., outputs by inputs, which is
+        the transpose of the Jacobian in 'rev' mode. If coloring is None, one
+        solve is performed for each input entry.
+        """
+        root = self.root
+        duvec = root.dumat[None]
+
+        empty = duvec.make_idx_array(0, 0)
+        in_idxs = np.concatenate([empty] +
+                                 [duvec._get_local_idxs(voi, in_indices)
+                                  for voi in input_list])
+        out_idxs = np.concatenate([empty] +
+                                  [duvec._get_local_idxs(item, out_indices)
+                                   for item in output_list])
+
+        Jsub = np.zeros((len(out_idxs), len(in_idxs)))
+
+        rhs = OrderedDict()
+        rhs[None] = np.zeros(len(duvec.vec))
+
+        if coloring is None:
+            colors = [[i] for i in range(len(in_idxs))]
+        else:
+            colors, nzrows = coloring
+
+        # Solvers that can take a matrix of right-hand sides get one column
+        # per color in a single call.
+        if root.ln_solver.supports.get('solve_multi'):
+            rhs[None] = np.zeros((len(duvec.vec), len(colors)))
+            for icolor, color in enumerate(colors):
+                rhs[None][in_idxs[color], icolor] = -1.0
+            dx_multi = root.ln_solver.solve_multi(rhs, root, mode)[None]
+        else:
+            dx_multi = None
+
+        for icolor, color in enumerate(colors):
+            if dx_multi is not None:
+                dx = dx_multi[:, icolor]
+            else:
+                # Note, we solve a slightly modified version of the unified
+                # derivatives equations in OpenMDAO.
+                # (dR/du) * (du/dr) = -I
+                rhs[None][:] = 0.0
+                rhs[None][in_idxs[color]] = -1.0
+
+                dx = root.ln_solver.solve(rhs, root, mode)[None]
+
+            dxval = dx[out_idxs]
+
+            if coloring is None:
+                Jsub[:, color[0]] = dxval
+            else:
+                # columns in a color don't share any nonzero rows, so each
+                # nonzero entry of the solution belongs to exactly one column
+                for col in color:
+                    rows = nzrows[col]
+                    Jsub[rows, col] = dxval[rows]
+
+        return Jsub
+
     def _get_voi_key(self, voi, grp):
         """Return the voi name, which allows for parallel derivative calculations
         (currently only works with LinearGaussSeidel), or None for those
@@ -2470,6 +2840,19 @@ def _assign_parameters(connections):
     return param_owners
 
 
+def _flatten_vois(vois):
+    """Return a flat list of variable names from a list that may contain
+    tuples of names grouped for parallel derivatives.
+    """
+    flat = []
+    for voi in vois:
+        if isinstance(voi, tuple):
+            flat.extend(voi)
+        else:
+            flat.append(voi)
+    return flat
+
+
 def _pad_name(name, pad_num=13, quotes=True):
     """ Pads a string so that they all line up when stacked."""
     l_name = len(name)
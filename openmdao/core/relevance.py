@@ -3,18 +3,116 @@
 from __future__ import print_function
 
 from collections import OrderedDict
+try:
+    from collections.abc import Mapping, Set
+except ImportError:
+    from collections import Mapping, Set
 import json
 from six import string_types, itervalues, iteritems
 
+import numpy as np
 import networkx as nx
 from openmdao.util.graph import OrderedDigraph
 
 
+class _RelevantSet(Set):
+    """ Read-only set of the names of the variables that are relevant to one
+    variable of interest, backed by a boolean mask over variable IDs."""
+
+    __slots__ = ['_ids', '_names', '_mask']
+
+    def __init__(self, ids, names, mask):
+        self._ids = ids
+        self._names = names
+        self._mask = mask
+
+    def __contains__(self, name):
+        idx = self._ids.get(name)
+        return idx is not None and bool(self._mask[idx])
+
+    def __iter__(self):
+        names = self._names
+        return (names[i] for i in np.flatnonzero(self._mask))
+
+    def __len__(self):
+        return int(np.count_nonzero(self._mask))
+
+    @classmethod
+    def _from_iterable(cls, it):
+        # results of the set operators are plain sets
+        return set(it)
+
+    def intersection(self, *others):
+        """ Returns a set of the names that are in this set and all others."""
+        result = set(self)
+        result.intersection_update(*others)
+        return result
+
+    def union(self, *others):
+        """ Returns a set of the names that are in this set or any others."""
+        result = set(self)
+        result.update(*others)
+        return result
+
+    def difference(self, *others):
+        """ Returns a set of the names that are in this set but no others."""
+        result = set(self)
+        result.difference_update(*others)
+        return result
+
+    def symmetric_difference(self, other):
+        """ Returns a set of the names that are in this set or other, but
+        not both."""
+        return set(self).symmetric_difference(other)
+
+    def issubset(self, other):
+        """ Returns True if every name in this set is in other."""
+        return set(self).issubset(other)
+
+    def issuperset(self, other):
+        """ Returns True if every name in other is in this set."""
+        return all(name in self for name in other)
+
+    def copy(self):
+        """ Returns a set of the names in this set."""
+        return set(self)
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+class _RelevantDict(Mapping):
+    """ Maps each variable of interest to a `_RelevantSet`."""
+
+    def __init__(self, ids, names, masks):
+        self._ids = ids
+        self._names = names
+        self._masks = masks
+
+    def __getitem__(self, voi):
+        return _RelevantSet(self._ids, self._names, self._masks[voi])
+
+    def __iter__(self):
+        return iter(self._masks)
+
+    def __len__(self):
+        return len(self._masks)
+
+
 class Relevance(object):
-    """ Object that manages the data connectivity graph for systems."""
+    """ Object that manages the data connectivity graph for systems.
+
+    Every variable (by top promoted name) gets an integer ID, and the
+    variables relevant to each variable of interest are stored as a boolean
+    mask over those IDs. `relevant` presents them as read-only sets of names.
+
+    If cached is given, it must be the result of `_get_cache_data` called on
+    a `Relevance` for a model with the same structure, and the system graph
+    and relevant sets are taken from it instead of being computed.
+    """
 
     def __init__(self, group, params_dict, unknowns_dict, connections,
-                 inputs, outputs, mode):
+                 inputs, outputs, mode, cached=None):
 
         self.params_dict = params_dict
         self.unknowns_dict = unknowns_dict
@@ -39,26 +137,60 @@ class Relevance(object):
             output_groups.append(tuple(out))
             self.outputs.append(tuple(out))
 
-        self._sgraph = self._setup_sys_graph(group, connections)
-        self._compute_relevant_vars(group, connections)
+        if cached is not None:
+            self._sgraph, self.var_names, self._masks, \
+                self._relevant_systems = cached
+            self.var_ids = dict((n, i) for i, n in enumerate(self.var_names))
+        else:
+            self.var_ids = OrderedDict()
+            for vdict in (unknowns_dict, params_dict):
+                for meta in itervalues(vdict):
+                    self.var_ids.setdefault(meta['top_promoted_name'],
+                                            len(self.var_ids))
+            self.var_names = list(self.var_ids)
+
+            self._sgraph = self._setup_sys_graph(group, connections)
+            self._compute_relevant_vars(group, connections)
 
-        # when voi is None, everything is relevant
-        self.relevant[None] = set(m['top_promoted_name']
-                                    for m in itervalues(unknowns_dict))
-        self.relevant[None].update(m['top_promoted_name']
-                                    for m in itervalues(params_dict))
+            # when voi is None, everything is relevant
+            self._masks[None] = np.ones(len(self.var_names), dtype=bool)
+
+        self.relevant = _RelevantDict(self.var_ids, self.var_names,
+                                      self._masks)
 
         if mode == 'fwd':
             self.groups = param_groups
         else:
             self.groups = output_groups
 
+    def _get_cache_data(self):
+        """ Returns the data that can be passed to the constructor as cached
+        to rebuild this object for a model with the same structure."""
+        return self._sgraph, self.var_names, self._masks, \
+               self._relevant_systems
+
     def __getitem__(self, name):
         try:
             return self.relevant[name]
         except KeyError:
             return ()
 
+    def relevant_mask(self, var_of_interest):
+        """ Returns the relevant variables for a variable of interest as a
+        boolean array indexed by variable ID (see `var_ids`).
+
+        Args
+        ----
+        var_of_interest : str or None
+            Name of a variable of interest, or None for all variables.
+
+        Returns
+        -------
+        ndarray of bool
+            True for each relevant variable. Do not modify it.
+        """
+        return self._masks[var_of_interest]
+
     def is_relevant(self, var_of_interest, varname):
         """ Returns True if a variable is relevant to a particular variable
         of interest.
@@ -77,9 +209,11 @@ class Relevance(object):
         bool: True if varname is in the relevant path of var_of_interest
         """
         try:
-            return varname in self.relevant[var_of_interest]
+            mask = self._masks[var_of_interest]
         except KeyError:
             return True
+        idx = self.var_ids.get(varname)
+        return idx is not None and bool(mask[idx])
 
     def vars_of_interest(self, mode=None):
         """ Determines our list of var_of_interest depending on mode.
@@ -198,26 +332,41 @@ class Relevance(object):
 
         # at this point, relevant contains the relevent *systems*, so now
         # we have to determine the relevant variables based on those systems
-        # and our connections
-        relvars = {}
-        rcomps = [to_abs_uname[n].rsplit('.', 1)[0] for n in relevant]
-
-        # make sure we don't miss any other VOIs that are relevant but are not
-        # part of a connection
+        # and our connections. Components and variables are given integer
+        # IDs so that this can be done on arrays. The extra component ID is
+        # for anything not in the graph, which is never relevant.
+        var_ids = self.var_ids
+        comp_ids = dict((c, i) for i, c in enumerate(sgraph))
+        nocomp = len(comp_ids)
+
+        conns = [(var_ids[to_prom_name[tgt]], var_ids[to_prom_name[src]],
+                  comp_ids.get(tgt.rsplit('.', 1)[0], nocomp),
+                  comp_ids.get(src.rsplit('.', 1)[0], nocomp))
+                 for tgt, (src, idxs) in iteritems(connections)]
+        conns = np.array(conns, dtype=int).reshape(len(conns), 4)
+        tgt_ids, src_ids, tcomp_ids, scomp_ids = conns.T
+
+        voi_ids = np.array([var_ids[n] for n in relevant], dtype=int)
+        voi_comp_ids = np.array([comp_ids.get(to_abs_uname[n].rsplit('.', 1)[0],
+                                              nocomp)
+                                 for n in relevant], dtype=int)
+
+        masks = {}
         for name, relcomps in iteritems(relevant):
-            relvars[name] = set()
-            for i, n in enumerate(relevant):
-                if rcomps[i] in relcomps:
-                    relvars[name].add(n)
-
-        for tgt, (src, idxs) in iteritems(connections):
-            prom_tgt = to_prom_name[tgt]
-            prom_src = to_prom_name[src]
-            tcomp = tgt.rsplit('.', 1)[0]
-            scomp = src.rsplit('.', 1)[0]
-            for n, relcomps in iteritems(relevant):
-                if tcomp in relcomps and scomp in relcomps:
-                    relvars[n].update((prom_tgt, prom_src))
+            comp_mask = np.zeros(nocomp + 1, dtype=bool)
+            comp_mask[[comp_ids[c] for c in relcomps if c in comp_ids]] = True
+
+            mask = np.zeros(len(var_ids), dtype=bool)
+
+            # make sure we don't miss any other VOIs that are relevant but are
+            # not part of a connection
+            mask[voi_ids[comp_mask[voi_comp_ids]]] = True
+
+            both = comp_mask[tcomp_ids] & comp_mask[scomp_ids]
+            mask[tgt_ids[both]] = True
+            mask[src_ids[both]] = True
+
+            masks[name] = mask
 
         # finally, add ancestors of relevant systems to the relevant set
         for voi, relsystems in iteritems(relevant):
@@ -229,4 +378,4 @@ class Relevance(object):
             relsystems.update(to_add)
 
         self._relevant_systems = relevant
-        self.relevant = relvars
+        self._masks = masks
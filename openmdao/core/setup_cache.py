@@ -0,0 +1,140 @@
+""" A cache of the parts of `Problem.setup` that depend only on the structure
+of the model, so that setting up the same model again can load them instead
+of recomputing them."""
+
+import os
+import hashlib
+
+from six import iteritems
+from six.moves import cPickle as pickle
+
+import numpy as np
+
+from openmdao.core.group import Group
+
+
+class SetupCache(object):
+    """ Saves the connections, relevance, execution orders, and data
+    transfer index arrays computed by `Problem.setup` to a file, along with
+    a fingerprint of the model structure. A later setup of a model with the
+    same fingerprint loads them from the file instead of computing them.
+    Assign an instance to the `setup_cache` attribute of a `Problem` to turn
+    it on. It is ignored under MPI.
+
+    The fingerprint covers the system tree and the class of each system,
+    promotes, explicit connections, execution orders that have been set,
+    variable metadata (shape, size, units, src_indices, pass_by_obj, state),
+    and the driver's variables of interest. Anything else that a custom
+    `System` does during setup to change how it is connected is not
+    covered, so delete the file if that changes.
+
+    Args
+    ----
+    filename : str
+        Name of the file the cache is stored in.
+
+    Attributes
+    ----------
+    hit : bool
+        True if the last setup loaded its results from the file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.hit = False
+        self._fingerprint = None
+        self._products = {}
+
+    def _start(self, fingerprint):
+        """ Loads the file if it was saved for a model with the given
+        fingerprint."""
+        self._fingerprint = fingerprint
+        self._products = {}
+        self.hit = False
+
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, 'rb') as f:
+                    saved_fingerprint, products = pickle.load(f)
+            except Exception:
+                # unreadable or from an incompatible version, so rebuild it
+                return
+            if saved_fingerprint == fingerprint:
+                self._products = products
+                self.hit = True
+
+    def get(self, key):
+        """
+        Args
+        ----
+        key : tuple or str
+            Key of a setup result.
+
+        Returns
+        -------
+        object or None
+            The cached result, or None if it isn't in the cache.
+        """
+        return self._products.get(key)
+
+    def set(self, key, value):
+        """ Stores a setup result to be saved at the end of setup.
+
+        Args
+        ----
+        key : tuple or str
+            Key of the setup result.
+
+        value : object
+            The result. It must be picklable.
+        """
+        if not self.hit:
+            self._products[key] = value
+
+    def save(self):
+        """ Saves the cache to its file, unless it was loaded from there."""
+        if self.hit or self._fingerprint is None:
+            return
+        with open(self.filename, 'wb') as f:
+            pickle.dump((self._fingerprint, self._products), f,
+                        pickle.HIGHEST_PROTOCOL)
+
+
+def _fingerprint(problem, params_dict, unknowns_dict, pois, oois):
+    """ Returns a hash of the structure of the model in problem."""
+    sha = hashlib.sha1()
+
+    def add(*args):
+        for arg in args:
+            if isinstance(arg, np.ndarray):
+                sha.update(repr((arg.dtype.str, arg.shape)).encode('utf-8'))
+                sha.update(np.ascontiguousarray(arg).view(np.uint8))
+            else:
+                sha.update(repr(arg).encode('utf-8'))
+
+    root = problem.root
+    add(problem._impl.__name__, pois, oois,
+        root.ln_solver.__class__.__name__, root.ln_solver.options['mode'],
+        problem._probdata.alias_params)
+
+    for s in root.subsystems(recurse=True, include_self=True):
+        add(s.pathname, s.__class__.__module__, s.__class__.__name__,
+            s._promotes)
+        if isinstance(s, Group):
+            add(s._order_set, list(s._subsystems))
+            for tgt, srcs in iteritems(s._src):
+                for src, idxs in srcs:
+                    add(tgt, src)
+                    if idxs is not None:
+                        add(np.asarray(idxs))
+
+    to_prom_name = root._sysdata.to_prom_name
+    for vdict in (params_dict, unknowns_dict):
+        for path, meta in iteritems(vdict):
+            add(path, to_prom_name[path], meta.get('shape'), meta.get('size'),
+                meta.get('units'), bool(meta.get('pass_by_obj')),
+                bool(meta.get('state')), bool(meta.get('remote')))
+            if meta.get('src_indices') is not None:
+                add(np.asarray(meta['src_indices']))
+
+    return sha.hexdigest()
@@ -0,0 +1,214 @@
+""" Records how long each phase of `Problem.setup` takes and how much memory
+it uses."""
+
+from __future__ import print_function
+
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from six import iteritems, itervalues
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+try:
+    from resource import getrusage, RUSAGE_SELF
+except ImportError:
+    getrusage = None
+
+
+def _max_rss():
+    """ Returns the peak resident memory used so far by this process in MB,
+    or None if that can't be determined on this platform."""
+    if getrusage is None:
+        return None
+    denom = 1024.
+    if sys.platform == 'darwin':
+        denom *= denom
+    return getrusage(RUSAGE_SELF).ru_maxrss / denom
+
+
+class _PhaseRecord(object):
+    """ Data recorded for one phase of setup."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.time = 0.0
+        self.count = 0
+        self.max_rss = None
+        self.mem = None
+        self.systems = OrderedDict()
+
+
+class SetupTimer(object):
+    """ Records the wall time spent in each phase of `Problem.setup`, along
+    with the peak memory use of the process at the end of the phase. Phases
+    that are run once per `Group` also keep a breakdown by `Group`. Every
+    `Problem` has one of these as its `setup_timing` attribute, which is
+    reset at the start of each setup.
+
+    Attributes
+    ----------
+    trace_memory : bool(False)
+        If True, also record the net memory allocated in each phase using
+        tracemalloc (Python 3.4+ only). This slows setup down considerably.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.reset()
+
+    def reset(self):
+        """ Removes all recorded data."""
+        self._records = OrderedDict()
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name, system=None):
+        """ Context manager that records the time spent in a phase of setup.
+        A phase that is entered more than once accumulates its time, and a
+        phase that starts inside another phase is reported as part of it.
+
+        Args
+        ----
+        name : str
+            Name of the phase.
+
+        system : str, optional
+            Pathname of the `System` this part of the phase is running on, if
+            the time should also be broken down by `System`.
+        """
+        rec = self._records.get(name)
+        if rec is None:
+            rec = self._records[name] = \
+                _PhaseRecord(self._stack[-1] if self._stack else None)
+
+        tracing = self.trace_memory and tracemalloc is not None
+        if tracing:
+            started = tracemalloc.is_tracing()
+            if not started:
+                tracemalloc.start()
+            mem0 = tracemalloc.get_traced_memory()[0]
+
+        self._stack.append(name)
+        t0 = time.time()
+        try:
+            yield
+        finally:
+            dt = time.time() - t0
+            self._stack.pop()
+
+            rec.time += dt
+            rec.count += 1
+            rec.max_rss = _max_rss()
+            if system is not None:
+                rec.systems[system] = rec.systems.get(system, 0.0) + dt
+
+            if tracing:
+                mem = (tracemalloc.get_traced_memory()[0] - mem0) / 1024. / 1024.
+                rec.mem = mem if rec.mem is None else rec.mem + mem
+                if not started:
+                    tracemalloc.stop()
+
+    def get_times(self, phase=None):
+        """
+        Args
+        ----
+        phase : str, optional
+            If given, return the breakdown by `System` of this phase instead.
+
+        Returns
+        -------
+        OrderedDict
+            Wall time in seconds for each phase in the order they ran, or for
+            each `System` in the given phase.
+        """
+        if phase is not None:
+            return OrderedDict(self._records[phase].systems)
+        return OrderedDict((name, rec.time)
+                           for name, rec in iteritems(self._records))
+
+    def get_memory(self):
+        """
+        Returns
+        -------
+        OrderedDict
+            Peak resident memory of the process in MB at the end of each
+            phase, or None for each phase if that isn't available on this
+            platform.
+        """
+        return OrderedDict((name, rec.max_rss)
+                           for name, rec in iteritems(self._records))
+
+    def get_allocated(self):
+        """
+        Returns
+        -------
+        OrderedDict
+            Net memory in MB allocated in each phase. Only available if
+            trace_memory was set, otherwise the values are None.
+        """
+        return OrderedDict((name, rec.mem)
+                           for name, rec in iteritems(self._records))
+
+    @property
+    def total(self):
+        """ Total wall time in seconds of all top level phases."""
+        return sum(rec.time for rec in itervalues(self._records)
+                   if rec.parent is None)
+
+    def _depth(self, rec):
+        depth = 0
+        while rec.parent is not None:
+            depth += 1
+            rec = self._records[rec.parent]
+        return depth
+
+    def report(self, out_stream=sys.stdout, max_systems=5):
+        """ Writes a table of the time and memory used by each phase.
+
+        Args
+        ----
+        out_stream : file-like, optional
+            Where to write the report. Default is sys.stdout.
+
+        max_systems : int(5)
+            For phases that are broken down by `System`, the number of the
+            slowest ones to list.
+        """
+        tracing = any(rec.mem is not None for rec in itervalues(self._records))
+        total = self.total
+
+        header = "%-36s %10s %7s %13s" % ("Setup phase", "Time (s)", "%",
+                                          "Max RSS (MB)")
+        if tracing:
+            header += " %11s" % "Alloc (MB)"
+        print(header, file=out_stream)
+        print('-' * len(header), file=out_stream)
+
+        for name, rec in iteritems(self._records):
+            label = '  ' * self._depth(rec) + name
+            pct = 100.0 * rec.time / total if total else 0.0
+            rss = '%13.1f' % rec.max_rss if rec.max_rss is not None else \
+                  '%13s' % '-'
+            line = "%-36s %10.4f %7.1f %s" % (label, rec.time, pct, rss)
+            if tracing:
+                line += ' %11.2f' % rec.mem if rec.mem is not None else \
+                        ' %11s' % '-'
+            print(line, file=out_stream)
+
+        print('-' * len(header), file=out_stream)
+        print("%-36s %10.4f" % ("Total", total), file=out_stream)
+
+        for name, rec in iteritems(self._records):
+            if len(rec.systems) > 1 and max_systems:
+                slowest = sorted(iteritems(rec.systems), key=lambda x: x[1],
+                                 reverse=True)[:max_systems]
+                print("\nSlowest groups in %s:" % name, file=out_stream)
+                for pathname, t in slowest:
+                    print("    %-32s %10.4f" % (pathname or '<root>', t),
+                          file=out_stream)
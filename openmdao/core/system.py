@@ -13,10 +13,12 @@ import warnings
 from six import string_types, iteritems, itervalues, iterkeys
 
 import numpy as np
+from scipy.sparse import csr_matrix, issparse
 
 from openmdao.core.mpi_wrap import MPI
 from openmdao.core.vec_wrapper import VecWrapper, _PlaceholderVecWrapper
 from openmdao.units.units import get_conversion_tuple
+from openmdao.util.coloring import get_col_coloring
 from openmdao.util.file_util import DirContext
 from openmdao.util.options import OptionsDictionary, DeprecatedOptionsDictionary
 from openmdao.util.string_util import name_relative_to
@@ -29,6 +31,28 @@ if trace:  # pragma: no cover
 DEFAULT_STEP_SIZE_FD = 1e-6
 DEFAULT_STEP_SIZE_CS = 1e-30
 
+# Relative size below which an entry of a finite difference Jacobian is
+# treated as a structural zero when detecting its sparsity.
+FD_SPARSITY_TOL = 1e-6
+
+
+def _fd_nonzeros(sparsity):
+    """ Returns the entries of the magnitudes of finite difference columns
+    that aren't roundoff relative to the rest of their row."""
+    row_max = np.max(sparsity, axis=1).reshape((-1, 1))
+    return sparsity > FD_SPARSITY_TOL * row_max
+
+
+def _writable(arr):
+    """ Returns arr, or a writable view of it if it is the read-only view of
+    an unknown held by an aliased param (see Problem.setup's alias_params),
+    so that finite difference can perturb the param."""
+    if arr.flags.writeable:
+        return arr
+    view = arr.view()
+    view.setflags(write=True)
+    return view
+
 
 class DerivOptionsDict(OptionsDictionary):
     """ Derived class that allows the default stepsize to change as you
@@ -93,6 +117,22 @@ class _SysData(object):
             return name
 
 
+class _VOIVecDict(OrderedDict):
+    """ OrderedDict of derivative `VecWrapper`s keyed by variable of interest
+    that asks its `System` to create the ones for a variable of interest the
+    first time they are requested. Used when the `Problem` is set up with
+    deriv_vec_cache.
+    """
+
+    def __init__(self, alloc):
+        super(_VOIVecDict, self).__init__()
+        self._alloc = alloc
+
+    def __missing__(self, voi):
+        self._alloc(voi)
+        return dict.__getitem__(self, voi)
+
+
 class AnalysisError(Exception):
     """
     This exception indicates that a possibly recoverable numerical
@@ -106,6 +146,10 @@ class System(object):
     inherit from `Group` or `Component`
     """
 
+    # Whether params owned by this system may be views of their source
+    # unknowns when the Problem is set up with alias_params.
+    _allow_param_alias = True
+
     def __init__(self):
         self.name = ''
         self.pathname = ''
@@ -176,6 +220,11 @@ class System(object):
         opt.add_option('linearize', False,
                        desc='Set to True if you want linearize to be called '
                        'even though you are using FD.')
+        opt.add_option('fd_coloring', False,
+                       desc='Set to True to detect the sparsity of the finite '
+                       'difference Jacobian with respect to each param the first '
+                       'time it is computed, and afterwards perturb all '
+                       'structurally orthogonal entries of that param together.')
 
         # This will give deprecation warnings, but will convert the old to
         # new options.
@@ -183,6 +232,10 @@ class System(object):
 
         self._impl = None
 
+        # (parent, top_unknowns, my_params, alloc_derivs) from
+        # _setup_vectors, for creating derivative vecs on demand
+        self._voi_vec_args = None
+
         self._num_par_fds = 1 # this will be >1 for ParallelFDGroup
         self._par_fd_id = 0 # for ParallelFDGroup, this will be >= 0 and
                             # <= the number of parallel FDs
@@ -196,6 +249,10 @@ class System(object):
         # Used to prevent us from multiplying outscope terms on the jacobian
         self.rel_inputs = None
 
+        # Row and column indices of sparse partials, keyed on the tuple
+        # (unknown, param). Set by Component.declare_partials.
+        self._subjac_sparsity = {}
+
         self._reset() # initialize some attrs that are set during setup
 
     def _reset(self):
@@ -212,6 +269,9 @@ class System(object):
         self._local_subsystems = []
         self._fd_params = None
 
+        # column colorings of the fd Jacobian, keyed on the param
+        self._fd_colorings = {}
+
     def _promoted(self, name):
         """Determine if the given variable name is being promoted from this
         `System`.
@@ -608,9 +668,9 @@ class System(object):
 
         to_prom_name = self._sysdata.to_prom_name
 
-        # Compute gradient for this param or state.
-        for p_name in chain(fd_params, states):
-
+        def get_input(p_name):
+            """ Returns the vector, key and source of the input to perturb
+            for p_name."""
             # If our input is connected to a IndepVarComp, then we need to twiddle
             # the unknowns vector instead of the params vector.
             src = self.connections.get(p_name)
@@ -621,19 +681,19 @@ class System(object):
                 if param_src not in self.unknowns:
                     param_src = to_prom_name[param_src]
 
-                inputs = unknowns
-                param_key = param_src
-            else:
-                # Cases where the IndepVarComp is somewhere above us.
-                if p_name in states:
-                    inputs = unknowns
-                else:
-                    inputs = params
+                return unknowns, param_src, param_src
 
-                param_key = p_name
-                param_src = None
+            # Cases where the IndepVarComp is somewhere above us.
+            if p_name in states:
+                return unknowns, p_name, None
+            return params, p_name, None
 
-            target_input = inputs._dat[param_key].val
+        # Compute gradient for this param or state.
+        for p_name in chain(fd_params, states):
+
+            inputs, param_key, param_src = get_input(p_name)
+
+            target_input = _writable(inputs._dat[param_key].val)
 
             mydict = {}
             # since p_name is a promoted name, it could refer to multiple
@@ -673,6 +733,23 @@ class System(object):
                 gather_jac = True
                 p_idxs = range(self._params_dict[p_name]['size'])
 
+            # Once the sparsity of this param's columns is known, perturb all
+            # structurally orthogonal entries together.
+            sparsity = None
+            if (self.deriv_options['fd_coloring'] and not use_check and
+                    self._num_par_fds == 1 and p_size > 0):
+                ckey = (p_name, total_derivs, tuple(p_idxs))
+                coloring = self._fd_colorings.get(ckey)
+                if coloring is not None:
+                    self._fd_colored(params, unknowns, resids, run_model,
+                                     resultvec, cache1, inputs, param_key,
+                                     p_idxs, fdstep, fdtype, fdform, cs,
+                                     coloring, jac, p_name, param_src,
+                                     fd_unknowns, pass_unknowns, qoi_indices)
+                    continue
+
+                sparsity = np.zeros((len(resultvec.vec), p_size))
+
             # Finite Difference each index in array
             for col, idx in enumerate(p_idxs):
                 fd_count += 1
@@ -697,9 +774,10 @@ class System(object):
                         probdata = unknowns._probdata
                         probdata.in_complex_step = True
 
-                        inputs._dat[param_key].imag_val[idx] += fdstep
+                        imag_input = _writable(inputs._dat[param_key].imag_val)
+                        imag_input[idx] += fdstep
                         run_model(params, unknowns, resids)
-                        inputs._dat[param_key].imag_val[idx] -= fdstep
+                        imag_input[idx] -= fdstep
 
                         # delta resid is delta unknown
                         resultvec.vec[:] = resultvec.imag_vec*(1.0/fdstep)
@@ -708,11 +786,14 @@ class System(object):
 
                     elif fdform == 'forward':
 
+                        # Restore exactly, since the input may be a view of
+                        # an unknown (see Problem.setup's alias_params).
+                        old_input = target_input[idx]
                         target_input[idx] += step
 
                         run_model(params, unknowns, resids)
 
-                        target_input[idx] -= step
+                        target_input[idx] = old_input
 
                         # delta resid is delta unknown
                         resultvec.vec[:] -= cache1
@@ -721,11 +802,12 @@ class System(object):
 
                     elif fdform == 'backward':
 
+                        old_input = target_input[idx]
                         target_input[idx] -= step
 
                         run_model(params, unknowns, resids)
 
-                        target_input[idx] += step
+                        target_input[idx] = old_input
 
                         # delta resid is delta unknown
                         resultvec.vec[:] -= cache1
@@ -734,12 +816,13 @@ class System(object):
 
                     elif fdform == 'central':
 
+                        old_input = target_input[idx]
                         target_input[idx] += step
 
                         run_model(params, unknowns, resids)
                         cache2 = resultvec.vec.copy()
 
-                        target_input[idx] -= step
+                        target_input[idx] = old_input
                         resultvec.vec[:] = cache1
 
                         target_input[idx] -= step
@@ -751,7 +834,7 @@ class System(object):
                         resultvec.vec[:] *= (-0.5/step)
                         # Note: vector division is slower than vector mult.
 
-                        target_input[idx] += step
+                        target_input[idx] = old_input
 
                     for u_name in fd_unknowns:
                         if qoi_indices and u_name in qoi_indices:
@@ -776,9 +859,26 @@ class System(object):
                             else:
                                 jac[u_name, p_name] = np.array([[1.0]])
 
+                    if sparsity is not None:
+                        sparsity[:, col] = np.abs(resultvec.vec)
+
                     # Restore old residual
                     resultvec.vec[:] = cache1
 
+            if sparsity is not None:
+                # Entries that happen to be zero at this point aren't
+                # structurally zero, so combine with the sparsity at a
+                # perturbed point.
+                fd_inputs = [get_input(name)[:2]
+                             for name in chain(fd_params, states)]
+                perturbed = self._fd_perturbed_sparsity(params, unknowns,
+                                                        resids, run_model,
+                                                        resultvec, fd_inputs,
+                                                        inputs, param_key,
+                                                        p_idxs, fdstep, fdtype)
+                sparsity = _fd_nonzeros(sparsity) | _fd_nonzeros(perturbed)
+                self._fd_colorings[ckey] = get_col_coloring(sparsity)
+
         if self._num_par_fds > 1:
             if trace:  # pragma: no cover
                 debug("%s: allgathering parallel FD columns" % self.pathname)
@@ -796,6 +896,161 @@ class System(object):
 
         return jac
 
+    def _fd_perturbed_sparsity(self, params, unknowns, resids, run_model,
+                               resultvec, fd_inputs, inputs, param_key, p_idxs,
+                               fdstep, fdtype):
+        """ Returns the magnitude of the forward difference of resultvec with
+        respect to each entry of one param, at a point where all of the
+        inputs in fd_inputs are randomly perturbed. The vectors are restored
+        afterwards. Arguments are the locals of fd_jacobian for the current
+        param."""
+        saved = [vec.vec.copy() for vec in (unknowns, resids)]
+        saved_inputs = [vec._dat[key].val.copy() for vec, key in fd_inputs]
+        rand = np.random.RandomState(11)
+
+        for vec, key in fd_inputs:
+            val = _writable(vec._dat[key].val)
+            size = val.size
+            val[:] = val*(1.0 + 0.1*rand.uniform(-1.0, 1.0, size)) + \
+                     1.0e-3*rand.uniform(0.5, 1.0, size)
+
+        sparsity = np.zeros((len(resultvec.vec), len(p_idxs)))
+        target_input = _writable(inputs._dat[param_key].val)
+        try:
+            run_model(params, unknowns, resids)
+            base = resultvec.vec.copy()
+
+            for col, idx in enumerate(p_idxs):
+                if fdtype == 'relative':
+                    step = max(abs(target_input[idx]) * fdstep, fdstep)
+                else:
+                    step = fdstep
+
+                old_input = target_input[idx]
+                target_input[idx] += step
+                run_model(params, unknowns, resids)
+                target_input[idx] = old_input
+
+                sparsity[:, col] = np.abs(resultvec.vec - base)
+        except Exception:
+            # treat everything as nonzero if the model fails there
+            sparsity[:] = 1.0
+        finally:
+            for (vec, key), val in zip(fd_inputs, saved_inputs):
+                _writable(vec._dat[key].val)[:] = val
+            for vec, val in zip((unknowns, resids), saved):
+                vec.vec[:] = val
+
+            # params of our subsystems still hold the perturbed values
+            if self._local_subsystems:
+                for grp in self.subgroups(recurse=True, include_self=True):
+                    grp._transfer_data()
+
+        return sparsity
+
+    def _fd_colored(self, params, unknowns, resids, run_model, resultvec,
+                    cache1, inputs, param_key, p_idxs, fdstep, fdtype, fdform,
+                    cs, coloring, jac, p_name, param_src, fd_unknowns,
+                    pass_unknowns, qoi_indices):
+        """ Finite difference one param, perturbing all of the entries of
+        each color at once. Columns in a color have no nonzero rows in
+        common, so each nonzero of the result is assigned to its column
+        using the sparsity that was detected by fd_jacobian. Arguments are
+        the locals of fd_jacobian for the current param."""
+
+        colors, col_rows = coloring
+        target_input = _writable(inputs._dat[param_key].val)
+        p_idxs = np.asarray(p_idxs, dtype=int)
+        result = np.empty(len(resultvec.vec))
+
+        for color in colors:
+            idxs = p_idxs[color]
+            old_input = target_input[idxs]
+
+            # Relative or Absolute step size
+            if fdtype == 'relative':
+                steps = target_input[idxs] * fdstep
+                steps[steps < fdstep] = fdstep
+            else:
+                steps = np.ones(len(idxs)) * fdstep
+
+            if cs == 'cs':
+
+                probdata = unknowns._probdata
+                probdata.in_complex_step = True
+
+                imag_input = _writable(inputs._dat[param_key].imag_val)
+                imag_input[idxs] += fdstep
+                run_model(params, unknowns, resids)
+                imag_input[idxs] -= fdstep
+
+                result[:] = resultvec.imag_vec
+                scale = np.ones(len(idxs)) * (1.0/fdstep)
+                probdata.in_complex_step = False
+
+            elif fdform == 'forward':
+
+                target_input[idxs] += steps
+                run_model(params, unknowns, resids)
+                target_input[idxs] = old_input
+
+                result[:] = resultvec.vec - cache1
+                scale = 1.0/steps
+
+            elif fdform == 'backward':
+
+                target_input[idxs] -= steps
+                run_model(params, unknowns, resids)
+                target_input[idxs] = old_input
+
+                result[:] = resultvec.vec - cache1
+                scale = -1.0/steps
+
+            elif fdform == 'central':
+
+                target_input[idxs] += steps
+                run_model(params, unknowns, resids)
+                result[:] = resultvec.vec
+
+                target_input[idxs] = old_input - steps
+                resultvec.vec[:] = cache1
+
+                run_model(params, unknowns, resids)
+                target_input[idxs] = old_input
+
+                result -= resultvec.vec
+                scale = 0.5/steps
+
+            for col, idx, colscale in zip(color, idxs, scale):
+
+                # Place this column's nonzeros in the result vector so that
+                # we can pull out each unknown as usual.
+                rows = col_rows[col]
+                resultvec.vec[:] = 0.0
+                resultvec.vec[rows] = result[rows] * colscale
+
+                for u_name in fd_unknowns:
+                    if qoi_indices and u_name in qoi_indices:
+                        val = resultvec._dat[u_name].val[qoi_indices[u_name]]
+                    else:
+                        val = resultvec._dat[u_name].val
+                    jac[u_name, p_name][:, col] = val
+
+                # When an unknown is a parameter, it isn't calculated, so
+                # we manually fill in identity.
+                for u_name in pass_unknowns:
+                    if u_name == param_src:
+                        if qoi_indices and u_name in qoi_indices:
+                            q_idxs = qoi_indices[u_name]
+                            if idx in q_idxs:
+                                row = qoi_indices[u_name].index(idx)
+                                jac[u_name, p_name][row][col] = 1.0
+                        else:
+                            jac[u_name, p_name] = np.array([[1.0]])
+
+            # Restore old residual
+            resultvec.vec[:] = cache1
+
     def _sys_apply_linear(self, mode, do_apply, vois=(None,), gs_outputs=None,
                           rel_inputs=None):
         """
@@ -949,6 +1204,11 @@ class System(object):
             if self._jacobian_cache is not None:
                 jc = self._jacobian_cache
                 for key, J in iteritems(jc):
+                    if key in self._subjac_sparsity:
+                        jc[key] = self._sparse_subjac(key, J)
+                        continue
+                    if issparse(J):
+                        continue
                     if isinstance(J, real_types):
                         jc[key] = np.array([[J]])
                     shape = jc[key].shape
@@ -958,6 +1218,49 @@ class System(object):
         self._jacobian_changed = True
         return self._jacobian_cache
 
+    def _sparse_subjac(self, key, J):
+        """ Convert a partial derivative that was declared with rows and
+        cols into a CSR matrix.
+
+        Args
+        ----
+        key : tuple
+            Tuple of the form ('unknown', 'param').
+
+        J : ndarray or sparse matrix
+            Either the nonzero values in the order of the declared rows and
+            cols, or the full sub-Jacobian (e.g., from finite difference).
+
+        Returns
+        -------
+        csr_matrix
+            The sub-Jacobian.
+        """
+        rows, cols = self._subjac_sparsity[key]
+        unknown, param = key
+
+        u_size = self.unknowns.metadata(unknown)['size']
+        if param in self.params:
+            p_size = self.params.metadata(param)['size']
+        else:
+            p_size = self.unknowns.metadata(param)['size']
+
+        if issparse(J):
+            return J.tocsr()
+
+        J = np.asarray(J)
+        if J.ndim == 2 and J.shape == (u_size, p_size):
+            J = J[rows, cols]
+
+        J = J.ravel()
+        if J.size != len(rows):
+            msg = "In component '{}', the derivative of '{}' wrt '{}' was declared with " + \
+                  "{} nonzero entries but {} values were given."
+            msg = msg.format(self.pathname, unknown, param, len(rows), J.size)
+            raise ValueError(msg)
+
+        return csr_matrix((J, (rows, cols)), shape=(u_size, p_size))
+
     def _apply_linear_jac(self, params, unknowns, dparams, dunknowns, dresids, mode):
         """ See apply_linear. This method allows the framework to override
         any derivative specification in any `Component` or `Group` to perform
@@ -1060,6 +1363,7 @@ class System(object):
             self.resids = parent.resids.get_view(self, comm, umap)
             self.params = parent._impl.create_tgt_vecwrapper(self._sysdata,
                                                              self._probdata, comm)
+            self.params._allow_alias = self._allow_param_alias
             self.params.setup(parent.params, params_dict, top_unknowns,
                               my_params, self.connections, relevance=relevance,
                               store_byobjs=True,
@@ -1209,6 +1513,56 @@ class System(object):
         docstring += '\n    \"\"\"\n'
         return docstring
 
+    def _init_deriv_mats(self):
+        """ Creates the empty dicts of derivative `VecWrapper`s."""
+        if self._probdata.deriv_vec_cache:
+            alloc = self._alloc_voi_vecs
+            self.dumat = _VOIVecDict(alloc)
+            self.dpmat = _VOIVecDict(alloc)
+            self.drmat = _VOIVecDict(alloc)
+        else:
+            self.dumat, self.dpmat, self.drmat = \
+                OrderedDict(), OrderedDict(), OrderedDict()
+
+    def _alloc_voi_vecs(self, voi):
+        """ Creates the derivative `VecWrapper`s for a variable of interest.
+        Only called if the `Problem` was set up with deriv_vec_cache.
+
+        Args
+        ----
+        voi : str
+            The name of a variable of interest.
+        """
+        raise NotImplementedError("_alloc_voi_vecs")
+
+    def _free_voi_vecs(self, voi):
+        """ Frees the derivative `VecWrapper`s for a variable of interest.
+        They are created again the next time they are needed.
+
+        Args
+        ----
+        voi : str
+            The name of a variable of interest.
+        """
+        for mat in (self.dumat, self.drmat, self.dpmat):
+            if voi in mat:
+                del mat[voi]
+
+    def _record_do_apply(self, voi, group):
+        """ Records in group and each of its ancestors whether apply_linear
+        must be called on this `System` for voi.
+        """
+        key = (self.pathname, voi)
+        do_apply = False
+        for acc in itervalues(self.dpmat[voi]._dat):
+            if not acc.pbo:
+                do_apply = True
+                break
+
+        while group is not None:
+            group._do_apply[key] = do_apply
+            group = group._voi_vec_args[0]
+
     def _get_shared_vec_info(self, vdict, my_params=None):
         # determine the size of the largest grouping of parallel subvecs and the
         # offsets within those vecs for each voi in a parallel set.
@@ -1232,14 +1586,17 @@ class System(object):
         if not self._probdata.top_lin_gs:
             return max_size, offsets
 
-        relevant = self._probdata.relevance.relevant
-        for vois in self._probdata.relevance.groups:
+        relevance = self._probdata.relevance
+        var_ids = relevance.var_ids
+        ids = np.array([var_ids[m['top_promoted_name']] for m in metas],
+                       dtype=int)
+        sizes = np.array([m['size'] for m in metas], dtype=int)
+
+        for vois in relevance.groups:
             vec_size = 0
             for voi in vois:
                 offsets[voi] = vec_size
-                rel_voi = relevant[voi]
-                vec_size += sum(m['size'] for m in metas
-                                 if m['top_promoted_name'] in rel_voi)
+                vec_size += int(sizes[relevance.relevant_mask(voi)[ids]].sum())
 
             if vec_size > max_size:
                 max_size = vec_size
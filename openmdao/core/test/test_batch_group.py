@@ -0,0 +1,223 @@
+""" Tests for the BatchGroup."""
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import Problem, Group, BatchGroup, Component, IndepVarComp, \
+                         ScipyGMRES, LinearGaussSeidel
+from openmdao.test.util import assert_rel_error
+
+
+class Quad(Component):
+    """ y = a*x**2 + b*sum(x), evaluated one node at a time."""
+
+    def __init__(self, sparse=False):
+        super(Quad, self).__init__()
+        self.add_param('x', np.zeros(3))
+        self.add_param('a', 1.0)
+        self.add_param('b', 1.0, batched=False)
+        self.add_output('y', np.zeros(3))
+
+        if sparse:
+            self.declare_partials('y', 'x', rows=np.repeat(np.arange(3), 3),
+                                  cols=np.tile(np.arange(3), 3))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        x = params['x']
+        unknowns['y'] = params['a']*x**2 + params['b']*np.sum(x)
+
+    def linearize(self, params, unknowns, resids):
+        x = params['x']
+        J = {}
+        J['y', 'a'] = (x**2).reshape((3, 1))
+        J['y', 'b'] = np.sum(x)*np.ones((3, 1))
+        J['y', 'x'] = np.diag(2.0*params['a']*x) + params['b']
+        if ('y', 'x') in self._subjac_sparsity:
+            J['y', 'x'] = J['y', 'x'].ravel()
+        return J
+
+
+class VecQuad(Quad):
+    """ Same as Quad, but evaluates all nodes at once."""
+
+    batch_vectorized = True
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        x = params['x']
+        a = params['a'] if self._num_nodes is None else params['a'][:, None]
+        unknowns['y'] = a*x**2 + params['b']*np.sum(x, axis=-1, keepdims=True)
+
+    def linearize(self, params, unknowns, resids):
+        x = params['x']
+        a = params['a']
+        n = self._num_nodes
+        J = {}
+        J['y', 'a'] = x**2
+        J['y', 'b'] = np.sum(x, axis=-1)[:, None, None]*np.ones((n, 3, 1))
+        J['y', 'x'] = np.eye(3)*(2.0*a[:, None]*x)[:, None, :] + params['b']
+        return J
+
+
+class Sum(Component):
+    """ z = sum(y)."""
+
+    def __init__(self):
+        super(Sum, self).__init__()
+        self.add_param('y', np.zeros(3))
+        self.add_output('z', 0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['z'] = np.sum(params['y'])
+
+    def linearize(self, params, unknowns, resids):
+        return {('z', 'y'): np.ones((1, 3))}
+
+
+X = np.array([[1.0, 2.0, 3.0], [-1.0, 0.5, 2.0], [0.0, 3.0, -2.0],
+              [4.0, 1.0, 1.5]])
+A = np.array([0.5, 2.0, -1.0, 3.0])
+N = len(A)
+
+
+def _batched_problem(comp_class, **kwargs):
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('px', IndepVarComp('x', X.copy()))
+    root.add('pa', IndepVarComp('a', A.copy()))
+    root.add('pb', IndepVarComp('b', 2.0))
+
+    batch = root.add('batch', BatchGroup(N))
+    batch.add('quad', comp_class(**kwargs))
+    batch.add('sum', Sum())
+    batch.connect('quad.y', 'sum.y')
+
+    root.connect('px.x', 'batch.quad.x')
+    root.connect('pa.a', 'batch.quad.a')
+    root.connect('pb.b', 'batch.quad.b')
+    return prob
+
+
+def _multipoint_problem():
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('px', IndepVarComp('x', X.copy()))
+    root.add('pa', IndepVarComp('a', A.copy()))
+    root.add('pb', IndepVarComp('b', 2.0))
+
+    for i in range(N):
+        pt = root.add('pt%d' % i, Group())
+        pt.add('quad', Quad())
+        pt.add('sum', Sum())
+        pt.connect('quad.y', 'sum.y')
+
+        root.connect('px.x', 'pt%d.quad.x' % i, src_indices=np.arange(3) + 3*i)
+        root.connect('pa.a', 'pt%d.quad.a' % i, src_indices=[i])
+        root.connect('pb.b', 'pt%d.quad.b' % i)
+    return prob
+
+
+class TestBatchGroup(unittest.TestCase):
+
+    def _check(self, prob):
+        ref = _multipoint_problem()
+        ref.setup(check=False)
+        ref.run()
+
+        prob.setup(check=False)
+        prob.run()
+
+        self.assertEqual(prob['batch.quad.y'].shape, (N, 3))
+        self.assertEqual(prob['batch.sum.z'].shape, (N,))
+        for i in range(N):
+            assert_rel_error(self, prob['batch.quad.y'][i],
+                             ref['pt%d.quad.y' % i], 1e-12)
+            assert_rel_error(self, prob['batch.sum.z'][i],
+                             ref['pt%d.sum.z' % i], 1e-12)
+
+        wrt = ['px.x', 'pa.a', 'pb.b']
+        Jref = ref.calc_gradient(wrt, ['pt%d.sum.z' % i for i in range(N)],
+                                 mode='fwd', return_format='array')
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(wrt, ['batch.sum.z'], mode=mode,
+                                   return_format='array')
+            assert_rel_error(self, J, Jref, 1e-10)
+
+        return prob
+
+    def test_looped(self):
+        self._check(_batched_problem(Quad))
+
+    def test_looped_sparse(self):
+        prob = self._check(_batched_problem(Quad, sparse=True))
+
+        rows, cols = prob.root.batch.quad._subjac_sparsity['y', 'x']
+        np.testing.assert_equal(rows, np.repeat(np.arange(3*N), 3))
+        np.testing.assert_equal(cols, np.tile(np.arange(3), 3*N) +
+                                np.repeat(np.arange(N)*3, 9))
+
+    def test_vectorized(self):
+        self._check(_batched_problem(VecQuad))
+
+    def test_gmres(self):
+        prob = _batched_problem(Quad)
+        prob.root.ln_solver = ScipyGMRES()
+        self._check(prob)
+
+    def test_lgs(self):
+        prob = _batched_problem(Quad)
+        prob.root.ln_solver = LinearGaussSeidel()
+        self._check(prob)
+
+    def test_broadcast_src(self):
+        # the documented way to give a scalar source to every node
+        for a in (3.0, np.array([3.0])):
+            prob = Problem(root=Group())
+            prob.root.add('pa', IndepVarComp('a', a))
+            batch = prob.root.add('batch', BatchGroup(N))
+            batch.add('px', IndepVarComp('x', np.ones(3)))
+            batch.add('quad', Quad())
+            batch.connect('px.x', 'quad.x', src_indices=[2, 1, 0])
+            prob.root.connect('pa.a', 'batch.quad.a',
+                              src_indices=np.zeros(N, dtype=int))
+
+            prob.setup(check=False)
+            prob['batch.px.x'] = X
+            prob.run()
+
+            assert_rel_error(self, prob['batch.quad.a'], 3.0*np.ones(N), 1e-12)
+            x = X[:, ::-1]
+            y = 3.0*x**2 + 1.0*np.sum(x, axis=1)[:, None]
+            assert_rel_error(self, prob['batch.quad.y'], y, 1e-12)
+
+            for mode in ('fwd', 'rev'):
+                J = prob.calc_gradient(['pa.a'], ['batch.quad.y'], mode=mode,
+                                       return_format='array')
+                assert_rel_error(self, J.ravel(), x.ravel()**2, 1e-12)
+
+            # setting up again doesn't batch anything twice
+            prob.setup(check=False)
+            prob['batch.px.x'] = X
+            prob.run()
+            assert_rel_error(self, prob['batch.quad.y'], y, 1e-12)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError) as cm:
+            BatchGroup(0)
+        self.assertEqual(str(cm.exception),
+                         "num_nodes must be at least 1, but is 0.")
+
+        prob = Problem(root=Group())
+        outer = prob.root.add('outer', BatchGroup(2))
+        inner = outer.add('inner', BatchGroup(3))
+        inner.add('quad', Quad())
+        with self.assertRaises(RuntimeError) as cm:
+            prob.setup(check=False)
+        self.assertEqual(str(cm.exception),
+                         "outer.inner.quad: can't batch with 3 nodes because "
+                         "it is already batched with 2 nodes. BatchGroups "
+                         "can't be nested.")
+
+
+if __name__ == "__main__":
+    unittest.main()
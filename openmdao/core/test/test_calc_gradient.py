@@ -10,9 +10,16 @@ from numpy.testing import assert_almost_equal
 
 from six import text_type, PY3
 
-from openmdao.api import Problem, Group, IndepVarComp, ExecComp
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, \
+     ScipyGMRES, DirectSolver, LinearGaussSeidel
 from openmdao.test.simple_comps import RosenSuzuki, FanIn
 
+try:
+    from openmdao.solvers.petsc_ksp import PetscKSP
+    from openmdao.core.petsc_impl import PetscImpl
+except ImportError:
+    PetscKSP = PetscImpl = None
+
 
 if PY3:
     def py3fix(s):
@@ -247,6 +254,109 @@ class TestCalcGradient(unittest.TestCase):
         J = prob.calc_gradient(indep_list, unknown_list, mode='fd', return_format='array')
         assert_almost_equal(J, np.array([[-6., 35.]]))
 
+    def _setup_colored(self, ln_solver, impl=None):
+        root = Group()
+        root.add('p', IndepVarComp('x', np.arange(1.0, 6.0)))
+        root.add('diag', ExecComp('y=3.0*x*x', x=np.zeros(5), y=np.zeros(5)))
+        root.add('dense', ExecComp('z=sum(x)', x=np.zeros(5)))
+        root.connect('p.x', ['diag.x', 'dense.x'])
+
+        root.ln_solver = ln_solver
+        root.ln_solver.options['simul_coloring'] = True
+
+        if impl is None:
+            prob = Problem(root)
+        else:
+            prob = Problem(root, impl=impl)
+        prob.setup(check=False)
+        prob.run()
+
+        # count the right-hand sides that are solved
+        solves = []
+        solve = root.ln_solver.solve
+        def counting_solve(rhs, system, mode):
+            vec = rhs[None]
+            solves.extend([mode] * (vec.shape[1] if vec.ndim > 1 else 1))
+            return solve(rhs, system, mode)
+        root.ln_solver.solve = counting_solve
+
+        return prob, solves
+
+    def _check_simul_coloring(self, ln_solver_class, impl=None):
+        expected_y = np.diag(6.0*np.arange(1.0, 6.0))
+        expected_z = np.ones((1, 5))
+
+        for mode, ncolors in (('fwd', 5), ('rev', 2)):
+            prob, solves = self._setup_colored(ln_solver_class(), impl)
+
+            # first call solves for each entry, at the current point and at
+            # a perturbed one, and computes the coloring
+            J = prob.calc_gradient(['p.x'], ['diag.y', 'dense.z'],
+                                   mode=mode, return_format='dict')
+            self.assertEqual(len(solves), 10 if mode == 'fwd' else 12)
+            assert_almost_equal(J['diag.y']['p.x'], expected_y)
+            assert_almost_equal(J['dense.z']['p.x'], expected_z)
+
+            del solves[:]
+            J = prob.calc_gradient(['p.x'], ['diag.y', 'dense.z'],
+                                   mode=mode, return_format='dict')
+            self.assertEqual(len(solves), ncolors)
+            assert_almost_equal(J['diag.y']['p.x'], expected_y)
+            assert_almost_equal(J['dense.z']['p.x'], expected_z)
+
+            del solves[:]
+            J = prob.calc_gradient(['p.x'], ['diag.y'], mode=mode)
+            J = prob.calc_gradient(['p.x'], ['diag.y'], mode=mode)
+            self.assertEqual(len(solves), 11)
+            assert_almost_equal(J, expected_y)
+
+    def test_calc_gradient_simul_coloring(self):
+        for ln_solver_class in (ScipyGMRES, DirectSolver, LinearGaussSeidel):
+            self._check_simul_coloring(ln_solver_class)
+
+    @unittest.skipIf(PetscKSP is None, 'PETSc is not available.')
+    def test_calc_gradient_simul_coloring_petsc(self):
+        self._check_simul_coloring(PetscKSP, PetscImpl)
+
+    def test_calc_gradient_simul_coloring_zero_at_start(self):
+        # dy0/dx1 is zero at the first point, but not structurally zero
+        root = Group()
+        root.add('p', IndepVarComp('x', np.array([1.0, 0.0])))
+        root.add('comp', ExecComp(['y0=x[0]+x[1]**2', 'y1=x[1]'],
+                                  x=np.zeros(2)))
+        root.connect('p.x', 'comp.x')
+        root.ln_solver = DirectSolver()
+        root.ln_solver.options['simul_coloring'] = True
+
+        prob = Problem(root)
+        prob.setup(check=False)
+        prob.run()
+
+        for mode in ('fwd', 'rev'):
+            prob['p.x'] = np.array([1.0, 0.0])
+            prob.run()
+            J = prob.calc_gradient(['p.x'], ['comp.y0', 'comp.y1'], mode=mode)
+            assert_almost_equal(J, np.array([[1.0, 0.0], [0.0, 1.0]]))
+
+            prob['p.x'] = np.array([1.0, 1.0])
+            prob.run()
+            J = prob.calc_gradient(['p.x'], ['comp.y0', 'comp.y1'], mode=mode)
+            assert_almost_equal(J, np.array([[1.0, 2.0], [0.0, 1.0]]))
+
+    def test_calc_gradient_simul_coloring_scaled(self):
+        prob, solves = self._setup_colored(DirectSolver())
+
+        dv_scale = {'p.x': np.arange(1.0, 6.0)}
+        cn_scale = {'diag.y': 2.0}
+        for i in range(2):
+            J = prob.calc_gradient(['p.x'], ['diag.y', 'dense.z'], mode='rev',
+                                   dv_scale=dv_scale, cn_scale=cn_scale)
+            expected = np.vstack((np.diag(12.0*np.arange(1.0, 6.0)**2),
+                                  np.arange(1.0, 6.0).reshape((1, 5))))
+            assert_almost_equal(J, expected)
+
+        self.assertEqual(len(solves), 14)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -736,5 +736,136 @@ class OptionsDeprecationTestCase(unittest.TestCase):
         fd = prob.root.comp.fd_options['force_fd']
         self.assertTrue(fd==True)
 
+class BandedComp(Component):
+    """ y[i] depends on x[i] and x[i+1], so the columns of dy/dx need
+    two colors."""
+
+    def __init__(self, n):
+        super(BandedComp, self).__init__()
+
+        self.add_param('x', np.ones(n))
+        self.add_output('y', np.zeros(n))
+        self.add_output('z', 0.0)
+
+        self.count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.count += 1
+        x = params['x']
+        unknowns['y'] = x**2
+        unknowns['y'][:-1] += 3.0*x[1:]
+        unknowns['z'] = 5.0*x[0]
+
+    def expected(self, x):
+        J = np.diag(2.0*x)
+        J += np.diag(3.0*np.ones(len(x) - 1), 1)
+        return J
+
+
+class CompFDColoringTestCase(unittest.TestCase):
+    """ Tests for the colored finite difference in fd_jacobian."""
+
+    def setup_model(self, n=10, **deriv_options):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.arange(1.0, n + 1.0)))
+        comp = root.add('comp', BandedComp(n))
+        root.connect('p.x', 'comp.x')
+
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['fd_coloring'] = True
+        for name, val in deriv_options.items():
+            comp.deriv_options[name] = val
+
+        prob.setup(check=False)
+        prob.run()
+
+        return prob, comp
+
+    def test_colored_partials(self):
+        n = 10
+        for form in ('forward', 'backward', 'central'):
+            for step_calc in ('absolute', 'relative'):
+                prob, comp = self.setup_model(n, form=form, step_calc=step_calc)
+                expected = comp.expected(prob['p.x'])
+                nruns = 2 if form == 'central' else 1
+
+                for i in range(2):
+                    comp.count = 0
+                    J = prob.calc_gradient(['p.x'], ['comp.y', 'comp.z'],
+                                           return_format='dict')
+                    assert_rel_error(self, J['comp.y']['p.x'], expected, 1e-5)
+                    assert_rel_error(self, J['comp.z']['p.x'][0][0], 5.0, 1e-5)
+                    assert_rel_error(self, np.linalg.norm(J['comp.z']['p.x'][0][1:]),
+                                     0.0, 1e-5)
+
+                    # first time detects the sparsity, also running n + 1
+                    # times at a perturbed point. After that we only need one
+                    # run per color.
+                    if i == 0:
+                        self.assertEqual(comp.count, nruns*n + n + 1)
+                    else:
+                        self.assertEqual(comp.count, nruns*2)
+
+    def test_colored_total_derivs(self):
+        n = 6
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.arange(1.0, n + 1.0)))
+        sub = root.add('sub', Group())
+        comp = sub.add('comp', BandedComp(n))
+        root.connect('p.x', 'sub.comp.x')
+
+        sub.deriv_options['type'] = 'fd'
+        sub.deriv_options['fd_coloring'] = True
+
+        prob.setup(check=False)
+        prob.run()
+
+        expected = comp.expected(prob['p.x'])
+        for i in range(2):
+            comp.count = 0
+            J = prob.calc_gradient(['p.x'], ['sub.comp.y'], return_format='dict')
+            assert_rel_error(self, J['sub.comp.y']['p.x'], expected, 1e-5)
+
+        self.assertEqual(comp.count, 2)
+
+    def test_colored_zero_at_start(self):
+        # dy0/dx1 is zero at the first point, but not structurally zero
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.array([1.0, 0.0])))
+        comp = root.add('comp', ExecComp(['y0=x[0]+x[1]**3', 'y1=x[1]'],
+                                         x=np.zeros(2)))
+        root.connect('p.x', 'comp.x')
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['fd_coloring'] = True
+
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['comp.y0', 'comp.y1'],
+                               return_format='array')
+        assert_rel_error(self, J, np.array([[1.0, 0.0], [0.0, 1.0]]), 1e-5)
+
+        prob['p.x'] = np.array([1.0, 1.0])
+        prob.run()
+        J = prob.calc_gradient(['p.x'], ['comp.y0', 'comp.y1'],
+                               return_format='array')
+        assert_rel_error(self, J, np.array([[1.0, 3.0], [0.0, 1.0]]), 1e-5)
+
+    def test_check_partials_not_colored(self):
+        prob, comp = self.setup_model(6, check_form='central')
+
+        prob.calc_gradient(['p.x'], ['comp.y'])
+        comp.count = 0
+        data = prob.check_partial_derivatives(out_stream=None)
+
+        # 2 runs for the colored linearize, 12 for the uncolored central
+        # difference check, and 2 for the colored comparison fd.
+        self.assertEqual(comp.count, 16)
+        assert_rel_error(self, data['comp'][('y', 'x')]['abs error'][0], 0.0, 1e-5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,8 +6,10 @@ import unittest
 import warnings
 
 import numpy as np
+import scipy.sparse
 
-from openmdao.api import Problem, Group, Component, ExecComp, IndepVarComp
+from openmdao.api import Problem, Group, Component, ExecComp, IndepVarComp, \
+                         DirectSolver
 from openmdao.test.simple_comps import SimpleComp, SimpleArrayComp, \
                                        SimpleImplicitComp, SimpleSparseArrayComp
 
@@ -17,6 +19,32 @@ class MyComp(SimpleComp):
     def jacobian(self, params, unknowns, resids):
         return {('y','x'): np.array([[2.0]])}
 
+class DiagComp(Component):
+    """ y = x**2 and z = 3*x[0] + 2*x[-1], with declared sparse partials."""
+
+    def __init__(self, n, declare=True):
+        super(DiagComp, self).__init__()
+        self.n = n
+
+        self.add_param('x', np.ones(n))
+        self.add_output('y', np.zeros(n))
+        self.add_output('z', 0.0)
+
+        if declare:
+            self.declare_partials('y', 'x', rows=np.arange(n), cols=np.arange(n))
+            self.declare_partials('z', 'x', rows=[0, 0], cols=[0, n-1])
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']**2
+        unknowns['z'] = 3.0*params['x'][0] + 2.0*params['x'][-1]
+
+    def linearize(self, params, unknowns, resids):
+        J = {}
+        J['y', 'x'] = 2.0*params['x']
+        J['z', 'x'] = np.array([3.0, 2.0])
+        return J
+
+
 class TestComponentDerivatives(unittest.TestCase):
 
     def test_simple_Jacobian(self):
@@ -294,6 +322,100 @@ class TestComponentDerivatives(unittest.TestCase):
 
         p.run()
 
+    def _setup_diag(self, n=5, **kwargs):
+        p = Problem()
+        root = p.root = Group()
+        root.add('p', IndepVarComp('x', np.arange(1.0, n+1.0)))
+        root.add('comp', DiagComp(n, **kwargs))
+        root.connect('p.x', 'comp.x')
+        return p
+
+    def test_declared_partials(self):
+        n = 5
+        p = self._setup_diag(n)
+        p.setup(check=False)
+        p.run()
+
+        comp = p.root.comp
+        comp._sys_linearize(comp.params, comp.unknowns, comp.resids)
+
+        J = comp._jacobian_cache['y', 'x']
+        self.assertTrue(scipy.sparse.issparse(J))
+        self.assertEqual(J.nnz, n)
+        self.assertEqual(J.shape, (n, n))
+
+        expected = np.diag(2.0*np.arange(1.0, n+1.0))
+        expected_z = np.zeros((1, n))
+        expected_z[0, 0] = 3.0
+        expected_z[0, -1] = 2.0
+
+        for mode in ('fwd', 'rev'):
+            Jt = p.calc_gradient(['p.x'], ['comp.y', 'comp.z'], mode=mode,
+                                 return_format='dict')
+            assert_rel_error(self, Jt['comp.y']['p.x'], expected, 1e-8)
+            assert_rel_error(self, Jt['comp.z']['p.x'], expected_z, 1e-8)
+
+        # assembled jacobian, both dense and sparse
+        for fmt in ('dense', 'sparse'):
+            p = self._setup_diag(n)
+            p.root.ln_solver = DirectSolver()
+            p.root.ln_solver.options['jacobian_method'] = 'assemble'
+            p.root.ln_solver.options['jacobian_format'] = fmt
+            p.setup(check=False)
+            p.run()
+
+            for mode in ('fwd', 'rev'):
+                Jt = p.calc_gradient(['p.x'], ['comp.y', 'comp.z'], mode=mode,
+                                     return_format='dict')
+                assert_rel_error(self, Jt['comp.y']['p.x'], expected, 1e-8)
+                assert_rel_error(self, Jt['comp.z']['p.x'], expected_z, 1e-8)
+
+        data = p.check_partial_derivatives(out_stream=None)
+        for key in (('y', 'x'), ('z', 'x')):
+            for err in data['comp'][key]['abs error']:
+                assert_rel_error(self, err, 0.0, 1e-5)
+
+    def test_declared_partials_fd(self):
+        # finite difference results are stored in the declared sparse format
+        n = 4
+        p = self._setup_diag(n)
+        p.root.comp.deriv_options['type'] = 'fd'
+        p.setup(check=False)
+        p.run()
+
+        Jt = p.calc_gradient(['p.x'], ['comp.y'], return_format='dict')
+        assert_rel_error(self, Jt['comp.y']['p.x'],
+                         np.diag(2.0*np.arange(1.0, n+1.0)), 1e-5)
+        self.assertEqual(p.root.comp._jacobian_cache['y', 'x'].nnz, n)
+
+    def test_declared_partials_errors(self):
+        comp = DiagComp(3, declare=False)
+
+        with self.assertRaises(NameError) as cm:
+            comp.declare_partials('x', 'x', rows=[0], cols=[0])
+        self.assertEqual(str(cm.exception), ": 'x' is not an output or state.")
+
+        with self.assertRaises(NameError) as cm:
+            comp.declare_partials('y', 'z', rows=[0], cols=[0])
+        self.assertEqual(str(cm.exception), ": 'z' is not a param or state.")
+
+        with self.assertRaises(ValueError) as cm:
+            comp.declare_partials('y', 'x', rows=[0, 1], cols=[0])
+        self.assertEqual(str(cm.exception),
+                         ": rows and cols of the derivative of 'y' wrt 'x' must "
+                         "be the same length, but 2 != 1.")
+
+        p = self._setup_diag(3, declare=False)
+        p.root.comp.declare_partials('y', 'x', rows=[0, 1], cols=[0, 1])
+        p.setup(check=False)
+        p.run()
+
+        with self.assertRaises(ValueError) as cm:
+            p.calc_gradient(['p.x'], ['comp.y'])
+        self.assertEqual(str(cm.exception),
+                         "In component 'comp', the derivative of 'y' wrt 'x' was "
+                         "declared with 2 nonzero entries but 3 values were given.")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,203 @@
+""" Tests for the fused scatters in DataTransfer."""
+
+import unittest
+
+import numpy as np
+from six import itervalues
+
+from openmdao.api import Problem, Group, ParallelGroup, IndepVarComp, ExecComp, \
+    NLGaussSeidel, ScipyGMRES, Component
+from openmdao.core import data_transfer
+from openmdao.test.sellar import SellarNoDerivatives
+from openmdao.test.util import assert_rel_error
+
+
+def _build():
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('p', IndepVarComp('x', np.arange(1.0, 11.0)))
+
+    # Non-contiguous and repeated src_indices, so the scatter into the root
+    # params can't be merged into a few slices.
+    root.add('C1', ExecComp('y = 2.0*x', x=np.zeros(3), y=np.zeros(3)))
+    root.add('C2', ExecComp('y = 3.0*x', x=np.zeros(4), y=np.zeros(4)))
+    root.add('C3', ExecComp('y = x*x', x=np.zeros(2), y=np.zeros(2)))
+    root.connect('p.x', 'C1.x', src_indices=[0, 4, 8])
+    root.connect('p.x', 'C2.x', src_indices=[9, 1, 1, 5])
+    root.connect('p.x', 'C3.x', src_indices=[2, 7])
+
+    prob.setup(check=False)
+    return prob
+
+
+class TestFusedTransfer(unittest.TestCase):
+
+    def _check(self, prob):
+        prob.run()
+
+        x = np.arange(1.0, 11.0)
+        np.testing.assert_allclose(prob['C1.y'], 2.0*x[[0, 4, 8]])
+        np.testing.assert_allclose(prob['C2.y'], 3.0*x[[9, 1, 1, 5]])
+        np.testing.assert_allclose(prob['C3.y'], x[[2, 7]]**2)
+
+        expected = np.zeros((9, 10))
+        expected[[0, 1, 2], [0, 4, 8]] = 2.0
+        expected[[3, 4, 5, 6], [9, 1, 1, 5]] = 3.0
+        expected[[7, 8], [2, 7]] = 2.0*x[[2, 7]]
+
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['p.x'], ['C1.y', 'C2.y', 'C3.y'],
+                                   mode=mode, return_format='array')
+            assert_rel_error(self, J, expected, 1e-10)
+
+    def test_fused(self):
+        prob = _build()
+
+        xfers = [x for x in itervalues(prob.root._data_xfer)
+                 if getattr(x, 'fused', None) is not None]
+        self.assertTrue(len(xfers) > 0)
+
+        self._check(prob)
+
+    def test_unfused(self):
+        save = data_transfer.MIN_FUSED_SCATTERS
+        data_transfer.MIN_FUSED_SCATTERS = 1000000
+        try:
+            prob = _build()
+        finally:
+            data_transfer.MIN_FUSED_SCATTERS = save
+
+        for xfer in itervalues(prob.root._data_xfer):
+            self.assertEqual(getattr(xfer, 'fused', None), None)
+
+        self._check(prob)
+
+
+class TestAliasParams(unittest.TestCase):
+
+    def test_sellar(self):
+        results = []
+        for alias in (False, True):
+            prob = Problem(SellarNoDerivatives())
+            prob.root.nl_solver = NLGaussSeidel()
+            prob.root.ln_solver = ScipyGMRES()
+            prob.setup(check=False, alias_params=alias)
+            prob.run()
+
+            J = prob.calc_gradient(['x', 'z'], ['obj', 'con1', 'con2'],
+                                   mode='fwd', return_format='array')
+            results.append((prob['y1'], prob['y2'], J, prob.root))
+
+        (y1, y2, J, root), (y1a, y2a, Ja, roota) = results
+
+        self.assertEqual(root.cycle.params._aliased, set())
+        self.assertEqual(roota.cycle.params._aliased, set(['d1.y2', 'd2.y1']))
+        self.assertTrue(np.may_share_memory(roota.cycle.d1.params._dat['y2'].val,
+                                            roota.unknowns.vec))
+
+        assert_rel_error(self, y1a, y1, 1e-10)
+        assert_rel_error(self, y2a, y2, 1e-10)
+        assert_rel_error(self, Ja, J, 1e-8)
+
+    def test_excluded(self):
+        prob = Problem(root=Group())
+        root = prob.root
+        root.add('p', IndepVarComp('x', np.arange(3.0)))
+        root.add('C1', ExecComp('y = 2.0*x', x=np.zeros(2), y=np.zeros(2)))
+        root.add('C2', ExecComp('y = 2.0*x', x=np.zeros(3), y=np.zeros(3),
+                                units={'x': 'm', 'y': 'm'}))
+        root.add('C3', ExecComp('y = 2.0*x', x=np.zeros(3), y=np.zeros(3)))
+        par = root.add('par', ParallelGroup())
+        par.add('A', ExecComp('y = x + 1.0'))
+        par.add('B', ExecComp('y = x + 1.0'))
+        root.connect('p.x', 'C1.x', src_indices=[0, 2])
+        root.connect('C1.y', 'C3.x', src_indices=[0, 1, 1])
+        root.connect('C3.y', 'C2.x')
+        par.connect('A.y', 'B.x')
+
+        prob.setup(check=False, alias_params=True)
+
+        # src_indices, unit conversion and ParallelGroups are not aliased
+        self.assertEqual(root.params._aliased, set(['C2.x']))
+        self.assertEqual(par.params._aliased, set())
+
+        # ...unless the units match
+        prob = Problem(root=Group())
+        root = prob.root
+        root.add('p', IndepVarComp('x', 1.0, units='m'))
+        root.add('C1', ExecComp('y = 3.0*x', units={'x': 'cm'}))
+        root.add('C2', ExecComp('y = 3.0*x', units={'x': 'm'}))
+        root.connect('p.x', 'C1.x')
+        root.connect('p.x', 'C2.x')
+        prob.setup(check=False, alias_params=True)
+        prob.run()
+
+        self.assertEqual(root.params._aliased, set(['C2.x']))
+        assert_rel_error(self, prob['C1.y'], 300.0, 1e-10)
+        assert_rel_error(self, prob['C2.y'], 3.0, 1e-10)
+
+    def test_fd_restores_source(self):
+        prob = Problem(root=Group())
+        root = prob.root
+        root.add('p', IndepVarComp('x', 0.1))
+        comp = root.add('C1', ExecComp('y = 3.0*x*x'))
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['form'] = 'central'
+        root.connect('p.x', 'C1.x')
+        prob.setup(check=False, alias_params=True)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['C1.y'], mode='fwd')
+        assert_rel_error(self, J[0][0], 0.6, 1e-6)
+
+        # The perturbation went into p.x, which must come back exactly.
+        self.assertEqual(prob['p.x'], 0.1)
+
+    def test_alias_read_only(self):
+        class ClipComp(Component):
+            def __init__(self):
+                super(ClipComp, self).__init__()
+                self.add_param('x', np.zeros(3))
+                self.add_output('y', np.zeros(3))
+
+            def solve_nonlinear(self, params, unknowns, resids):
+                x = params['x']
+                x[:] = np.clip(x, 0.0, 1.0)
+                unknowns['y'] = x
+
+        prob = Problem(root=Group())
+        root = prob.root
+        root.add('p', IndepVarComp('x', np.array([-1.0, 0.5, 2.0])))
+        root.add('C1', ClipComp())
+        root.connect('p.x', 'C1.x')
+        prob.setup(check=False, alias_params=True)
+
+        self.assertEqual(root.params._aliased, set(['C1.x']))
+        with self.assertRaises(ValueError):
+            prob.run()
+        np.testing.assert_equal(prob['p.x'], [-1.0, 0.5, 2.0])
+
+    def test_fd_cs_aliased_param(self):
+        for fd_type in ('fd', 'cs'):
+            prob = Problem(root=Group())
+            root = prob.root
+            root.add('p', IndepVarComp('x', np.array([0.1, 0.2])))
+            root.add('C0', ExecComp('y = 2.0*x', x=np.zeros(2), y=np.zeros(2)))
+            comp = root.add('C1', ExecComp('y = 3.0*x*x', x=np.zeros(2),
+                                           y=np.zeros(2)))
+            comp.deriv_options['type'] = fd_type
+            root.connect('p.x', 'C0.x')
+            root.connect('C0.y', 'C1.x')
+            prob.setup(check=False, alias_params=True)
+            prob.run()
+
+            self.assertTrue('C1.x' in root.params._aliased)
+            J = prob.calc_gradient(['p.x'], ['C1.y'], mode='fwd')
+            assert_rel_error(self, J, np.diag([2.4, 4.8]), 1e-5)
+
+            # The perturbation went into C0.y, which must come back exactly.
+            np.testing.assert_equal(prob['C0.y'], [0.2, 0.4])
+
+
+if __name__ == "__main__":
+    unittest.main()
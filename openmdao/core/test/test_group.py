@@ -10,6 +10,7 @@ from openmdao.api import Problem, Group, Relevance, IndepVarComp, ExecComp, Scip
      Component
 from openmdao.test.example_groups import ExampleGroup, ExampleGroupWithPromotes
 from openmdao.test.simple_comps import SimpleImplicitComp
+from openmdao.test.util import assert_rel_error
 
 class MyGroup(Group):
 
@@ -753,5 +754,86 @@ class TestGroup(unittest.TestCase):
         self.assertTrue(prob.root.find_subsystem('C1') is exec_comp)
 
 
+class CountComp(ExecComp):
+    """ ExecComp that counts its executions."""
+
+    def __init__(self, exprs):
+        super(CountComp, self).__init__(exprs)
+        self.count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        super(CountComp, self).solve_nonlinear(params, unknowns, resids)
+        self.count += 1
+
+
+class TestIncremental(unittest.TestCase):
+
+    def _build(self, incremental, fd=False):
+        root = Group()
+        root.incremental = incremental
+        if fd:
+            root.deriv_options['type'] = 'fd'
+            root.deriv_options['form'] = 'central'
+        root.add('px', IndepVarComp('x', 1.0))
+        root.add('py', IndepVarComp('y', 2.0))
+        root.add('A', CountComp('a=2.0*x'))
+        root.add('B', CountComp('b=3.0*y'))
+        root.add('C', CountComp('c=a*b'))
+        root.connect('px.x', 'A.x')
+        root.connect('py.y', 'B.y')
+        root.connect('A.a', 'C.a')
+        root.connect('B.b', 'C.b')
+
+        prob = Problem(root)
+        prob.setup(check=False)
+        prob.run()
+        return prob
+
+    def _counts(self, prob):
+        return [prob.root._subsystems[name].count for name in ('A', 'B', 'C')]
+
+    def test_skip_unchanged(self):
+        prob = self._build(True)
+        self.assertEqual(self._counts(prob), [1, 1, 1])
+
+        prob.run()
+        self.assertEqual(self._counts(prob), [1, 1, 1])
+
+        prob['px.x'] = 3.0
+        prob.run()
+        self.assertEqual(self._counts(prob), [2, 1, 2])
+        self.assertEqual(prob['C.c'], 36.0)
+
+        # Outputs that something else changed get recomputed.
+        prob['C.c'] = 0.0
+        prob.run()
+        self.assertEqual(self._counts(prob), [2, 1, 3])
+        self.assertEqual(prob['C.c'], 36.0)
+
+    def test_off_by_default(self):
+        prob = self._build(False)
+        prob.run()
+        self.assertEqual(self._counts(prob), [2, 2, 2])
+
+    def test_fd_totals(self):
+        prob = self._build(True, fd=True)
+        start = self._counts(prob)
+
+        J = prob.calc_gradient(['px.x', 'py.y'], ['C.c'], mode='fwd')
+        assert_rel_error(self, J[0][0], 12.0, 1e-6)
+        assert_rel_error(self, J[0][1], 6.0, 1e-6)
+
+        # Each perturbation only reruns the branch it feeds. A runs once
+        # more when x is restored before perturbing y.
+        counts = self._counts(prob)
+        self.assertEqual([c - s for c, s in zip(counts, start)], [3, 2, 4])
+
+        prob = self._build(False, fd=True)
+        start = self._counts(prob)
+        prob.calc_gradient(['px.x', 'py.y'], ['C.c'], mode='fwd')
+        counts = self._counts(prob)
+        self.assertEqual([c - s for c, s in zip(counts, start)], [4, 4, 4])
+
+
 if __name__ == "__main__":
     unittest.main()
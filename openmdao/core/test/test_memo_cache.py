@@ -0,0 +1,131 @@
+""" Tests for component memoization."""
+
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+import numpy as np
+
+from openmdao.api import Problem, Group, IndepVarComp, Component, MemoCache
+from openmdao.test.util import assert_rel_error
+
+
+class CountComp(Component):
+    """ y = 2*x with a pass_by_obj gain, counting executions."""
+
+    def __init__(self):
+        super(CountComp, self).__init__()
+        self.add_param('x', np.zeros(4))
+        self.add_param('mode', 'double', pass_by_obj=True)
+        self.add_output('y', np.zeros(4))
+        self.add_output('label', '', pass_by_obj=True)
+        self.count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.count += 1
+        gain = 2.0 if params['mode'] == 'double' else 3.0
+        unknowns['y'] = gain*params['x']**2
+        unknowns['label'] = params['mode'] + str(self.count)
+
+
+def _build(cache, fd=False):
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('p', IndepVarComp([('x', np.arange(4.0)),
+                                ('mode', 'double', {'pass_by_obj': True})]))
+    comp = root.add('comp', CountComp())
+    comp.memo_cache = cache
+    if fd:
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['form'] = 'central'
+    root.connect('p.x', 'comp.x')
+    root.connect('p.mode', 'comp.mode')
+    prob.setup(check=False)
+    return prob, comp
+
+
+class TestMemoCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_hits(self):
+        cache = MemoCache()
+        prob, comp = _build(cache)
+
+        prob.run()
+        prob['p.x'] = np.ones(4)
+        prob.run()
+        prob['p.x'] = np.arange(4.0)
+        prob.run()
+
+        self.assertEqual(comp.count, 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        np.testing.assert_allclose(prob['comp.y'], [0.0, 2.0, 8.0, 18.0])
+        self.assertEqual(prob['comp.label'], 'double1')
+
+        # pass_by_obj params are part of the key
+        prob['p.mode'] = 'triple'
+        prob.run()
+        self.assertEqual(comp.count, 3)
+        np.testing.assert_allclose(prob['comp.y'], [0.0, 3.0, 12.0, 27.0])
+
+    def test_fd(self):
+        cache = MemoCache()
+        prob, comp = _build(cache, fd=True)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['comp.y'], return_format='array')
+        assert_rel_error(self, J, np.diag([0.0, 4.0, 8.0, 12.0]), 1e-5)
+
+        # Outputs are left at the base point.
+        np.testing.assert_allclose(prob['comp.y'], [0.0, 2.0, 8.0, 18.0])
+
+    def test_lru_entries(self):
+        cache = MemoCache(max_entries=2)
+        prob, comp = _build(cache)
+
+        for val in (1.0, 2.0, 1.0, 3.0, 2.0):
+            prob['p.x'] = val*np.ones(4)
+            prob.run()
+
+        # 2.0 was evicted by 3.0 because 1.0 was used more recently.
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_lru_bytes(self):
+        # Each entry is 4 doubles plus a small pickled label.
+        cache = MemoCache(max_entries=None, max_bytes=60)
+        prob, comp = _build(cache)
+
+        for val in range(5):
+            prob['p.x'] = val*np.ones(4)
+            prob.run()
+
+        self.assertEqual(len(cache), 1)
+        self.assertTrue(cache._nbytes <= 60)
+
+    def test_persist(self):
+        filename = os.path.join(self.tmpdir, 'comp.cache')
+
+        prob, comp = _build(MemoCache(filename=filename))
+        prob.run()
+        prob.cleanup()
+        self.assertEqual(comp.count, 1)
+
+        cache = MemoCache(filename=filename)
+        prob, comp = _build(cache)
+        prob.run()
+
+        self.assertEqual(comp.count, 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        np.testing.assert_allclose(prob['comp.y'], [0.0, 2.0, 8.0, 18.0])
+        self.assertEqual(prob['comp.label'], 'double1')
+
+
+if __name__ == "__main__":
+    unittest.main()
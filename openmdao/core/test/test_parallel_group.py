@@ -1,6 +1,57 @@
+import os
 import unittest
 
-from openmdao.api import ParallelGroup, Problem, IndepVarComp, ExecComp, NLGaussSeidel
+import numpy as np
+
+from openmdao.api import ParallelGroup, Problem, Group, IndepVarComp, ExecComp, \
+    NLGaussSeidel, Component, AnalysisError
+
+
+class PidComp(Component):
+    """ Outputs the process id it ran in, along with a pass_by_obj output."""
+
+    def __init__(self):
+        super(PidComp, self).__init__()
+        self.add_param('x', np.zeros(3))
+        self.add_param('tag', 'a', pass_by_obj=True)
+        self.add_output('y', np.zeros(3))
+        self.add_output('pid', 0.0)
+        self.add_output('tag_out', '', pass_by_obj=True)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']*3.0
+        unknowns['pid'] = os.getpid()
+        unknowns['tag_out'] = params['tag'] + '!'
+
+
+class FailComp(Component):
+
+    def __init__(self):
+        super(FailComp, self).__init__()
+        self.add_param('x', 0.0)
+        self.add_output('y', 0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if params['x'] < 0.0:
+            raise AnalysisError("negative x")
+        unknowns['y'] = params['x']
+
+
+class StateDerivComp(Component):
+    """ Computes y = x**2 and keeps 2*x from solve_nonlinear for linearize."""
+
+    def __init__(self):
+        super(StateDerivComp, self).__init__()
+        self.add_param('x', np.zeros(2))
+        self.add_output('y', np.zeros(2))
+        self._two_x = None
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']**2
+        self._two_x = 2.0*params['x']
+
+    def linearize(self, params, unknowns, resids):
+        return {('y', 'x'): np.diag(self._two_x)}
 
 
 class TestGroup(unittest.TestCase):
@@ -37,5 +88,147 @@ class TestGroup(unittest.TestCase):
         self.assertEqual(self.root.list_auto_order(),
                          (['C1', 'C2', 'C3', 'C4'],[]))
 
+
+class TestLocalExec(unittest.TestCase):
+
+    def _build(self, local_exec):
+        root = Group()
+        root.add('p', IndepVarComp([('x', np.arange(3.0)), ('tag', 'b',
+                                                             {'pass_by_obj': True})]))
+        par = root.add('par', ParallelGroup(local_exec=local_exec, num_workers=2))
+        for i in range(3):
+            par.add('C%d' % i, PidComp())
+            root.connect('p.x', 'par.C%d.x' % i)
+            root.connect('p.tag', 'par.C%d.tag' % i)
+
+        sub = par.add('sub', Group())
+        sub.add('E1', ExecComp('y=2.0*x'))
+        sub.add('E2', ExecComp('y=x+1.0'))
+        sub.connect('E1.y', 'E2.x')
+        root.connect('p.x', 'par.sub.E1.x', src_indices=[2])
+
+        prob = Problem(root)
+        prob.setup(check=False)
+        return prob
+
+    def test_thread(self):
+        prob = self._build('thread')
+        prob.run()
+
+        for i in range(3):
+            np.testing.assert_allclose(prob['par.C%d.y' % i], [0.0, 3.0, 6.0])
+            self.assertEqual(prob['par.C%d.tag_out' % i], 'b!')
+            self.assertEqual(prob['par.C%d.pid' % i], os.getpid())
+        self.assertEqual(prob['par.sub.E2.y'], 5.0)
+
+        prob.cleanup()
+
+    def test_process(self):
+        prob = self._build('process')
+        prob.run()
+
+        pids = set()
+        for i in range(3):
+            np.testing.assert_allclose(prob['par.C%d.y' % i], [0.0, 3.0, 6.0])
+            self.assertEqual(prob['par.C%d.tag_out' % i], 'b!')
+            pids.add(prob['par.C%d.pid' % i])
+        self.assertEqual(prob['par.sub.E2.y'], 5.0)
+
+        # Two workers, neither of them the parent.
+        self.assertEqual(len(pids), 2)
+        self.assertTrue(os.getpid() not in pids)
+
+        # New inputs are sent to the workers on the next run.
+        prob['p.x'] = np.ones(3)
+        prob['p.tag'] = 'c'
+        prob.run()
+
+        np.testing.assert_allclose(prob['par.C1.y'], [3.0, 3.0, 3.0])
+        self.assertEqual(prob['par.C1.tag_out'], 'c!')
+        self.assertEqual(prob['par.sub.E2.y'], 3.0)
+
+        prob.cleanup()
+
+    def test_process_error(self):
+        root = Group()
+        root.add('p', IndepVarComp('x', 1.0))
+        par = root.add('par', ParallelGroup(local_exec='process'))
+        par.add('F1', FailComp())
+        par.add('F2', FailComp())
+        root.connect('p.x', 'par.F1.x')
+        root.connect('p.x', 'par.F2.x')
+
+        prob = Problem(root)
+        prob.setup(check=False)
+        prob.run()
+        self.assertEqual(prob['par.F2.y'], 1.0)
+
+        prob['p.x'] = -1.0
+        with self.assertRaises(AnalysisError) as cm:
+            prob.run()
+        self.assertEqual(str(cm.exception), "negative x")
+
+        # Workers are still usable after an error.
+        prob['p.x'] = 2.0
+        prob.run()
+        self.assertEqual(prob['par.F1.y'], 2.0)
+
+        prob.cleanup()
+
+    def test_process_complex_step(self):
+        root = Group()
+        root.add('p', IndepVarComp('x', np.array([1.0, 3.0])))
+        par = root.add('par', ParallelGroup(local_exec='process'))
+        par.add('C1', ExecComp('y=2.0*x*x', x=np.zeros(2), y=np.zeros(2)))
+        par.add('C2', ExecComp('y=3.0*x', x=np.zeros(2), y=np.zeros(2)))
+        root.connect('p.x', 'par.C1.x')
+        root.connect('p.x', 'par.C2.x')
+        root.deriv_options['type'] = 'cs'
+
+        prob = Problem(root)
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['par.C1.y'], return_format='dict')
+        np.testing.assert_allclose(np.diag(J['par.C1.y']['p.x']), [4.0, 12.0])
+
+        prob.cleanup()
+
+    def test_process_derivs(self):
+        root = Group()
+        root.add('p', IndepVarComp('x', np.array([1.0, 3.0])))
+        par = root.add('par', ParallelGroup(local_exec='process'))
+        par.add('C1', StateDerivComp())
+        par.add('C2', StateDerivComp())
+        sub = par.add('sub', Group())
+        sub.add('C3', StateDerivComp())
+        root.connect('p.x', 'par.C1.x')
+        root.connect('p.x', 'par.C2.x')
+        root.connect('p.x', 'par.sub.C3.x')
+
+        prob = Problem(root)
+        prob.setup(check=False)
+
+        # the parent's copies of the components never ran solve_nonlinear
+        for x in ([1.0, 3.0], [2.0, -1.0]):
+            prob['p.x'] = np.array(x)
+            prob.run()
+            for mode in ('fwd', 'rev'):
+                J = prob.calc_gradient(['p.x'], ['par.C1.y', 'par.sub.C3.y'],
+                                       mode=mode, return_format='dict')
+                for out in ('par.C1.y', 'par.sub.C3.y'):
+                    np.testing.assert_allclose(J[out]['p.x'],
+                                               np.diag(2.0*np.array(x)))
+
+        prob.cleanup()
+
+    def test_bad_local_exec(self):
+        with self.assertRaises(ValueError) as cm:
+            ParallelGroup(local_exec='mpi')
+        self.assertEqual(str(cm.exception),
+                         "local_exec must be one of None, 'thread', or 'process', "
+                         "but 'mpi' was given.")
+
+
 if __name__ == "__main__":
     unittest.main()
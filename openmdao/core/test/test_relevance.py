@@ -81,3 +81,55 @@ class TestLinearGaussSeidel(unittest.TestCase):
                                  msg="%s should be irrelevant" % s.pathname)
                 self.assertFalse(root._probdata.relevance.is_relevant_system('C8.y', s),
                                  msg="%s should be irrelevant" % s.pathname)
+
+    def test_relevant_mask(self):
+        p = self.p
+
+        p.driver.add_desvar('P1.x')
+        p.driver.add_objective('C8.y')
+
+        p.setup(check=False)
+        rel = p.root._probdata.relevance
+
+        expected = set(['P1.x', 'C2.x', 'C2.y', 'C8.x1', 'C8.y'])
+        for voi in ('P1.x', 'C8.y'):
+            mask = rel.relevant_mask(voi)
+            self.assertEqual(len(mask), len(rel.var_ids))
+            self.assertEqual(set(rel.var_names[i] for i in mask.nonzero()[0]),
+                             expected)
+
+            relset = rel.relevant[voi]
+            self.assertEqual(relset, expected)
+            self.assertEqual(len(relset), len(expected))
+            self.assertTrue('C2.y' in relset)
+            self.assertFalse('C4.y' in relset)
+            self.assertFalse('no.such.var' in relset)
+            self.assertEqual(relset.intersection(['P1.x', 'P2.x']),
+                             set(['P1.x']))
+
+            # the same API as the sets it replaced
+            other = set(['P1.x', 'P2.x'])
+            self.assertEqual(relset & other, set(['P1.x']))
+            self.assertEqual(other & relset, set(['P1.x']))
+            self.assertEqual(relset | other, expected | other)
+            self.assertEqual(relset - other, expected - other)
+            self.assertEqual(other - relset, set(['P2.x']))
+            self.assertEqual(relset ^ other, expected ^ other)
+            self.assertEqual(type(relset & other), set)
+            self.assertEqual(relset.union(other, ['C4.y']),
+                             expected | other | set(['C4.y']))
+            self.assertEqual(relset.difference(other, ['C8.y']),
+                             expected - other - set(['C8.y']))
+            self.assertEqual(relset.symmetric_difference(other),
+                             expected ^ other)
+            self.assertTrue(relset.issubset(expected | other))
+            self.assertFalse(relset.issubset(other))
+            self.assertTrue(relset.issuperset(['P1.x', 'C8.y']))
+            self.assertFalse(relset.issuperset(other))
+            self.assertTrue(relset <= expected)
+            copy = relset.copy()
+            self.assertEqual(type(copy), set)
+            self.assertEqual(copy, expected)
+
+        self.assertTrue(rel.relevant_mask(None).all())
+        self.assertEqual(set(rel.relevant[None]), set(rel.var_names))
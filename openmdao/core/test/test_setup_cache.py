@@ -0,0 +1,125 @@
+""" Tests for the persisted setup cache."""
+
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+import numpy as np
+
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, SetupCache, \
+    LinearGaussSeidel, ScipyGMRES
+from openmdao.test.sellar import SellarDerivativesGrouped
+from openmdao.test.util import assert_rel_error
+
+
+def _build(filename):
+    prob = Problem(SellarDerivativesGrouped())
+    prob.root.ln_solver = LinearGaussSeidel()
+    prob.root.mda.ln_solver = ScipyGMRES()
+
+    prob.driver.add_desvar('x')
+    prob.driver.add_desvar('z')
+    prob.driver.add_objective('obj')
+    prob.driver.add_constraint('con1', upper=0.0)
+
+    prob.setup_cache = SetupCache(filename)
+    return prob
+
+
+def _build_chain(filename, size=3, src_indices=None):
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('p', IndepVarComp('x', np.arange(1.0, 4.0)))
+    root.add('C2', ExecComp('y = 3.0*x', x=np.zeros(size), y=np.zeros(size)))
+    root.add('C1', ExecComp('y = 2.0*x', x=np.zeros(3), y=np.zeros(3)))
+    root.connect('p.x', 'C1.x')
+    root.connect('C1.y', 'C2.x', src_indices=src_indices)
+
+    prob.setup_cache = SetupCache(filename)
+    return prob
+
+
+class TestSetupCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'setup.cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _run(self, prob):
+        prob.setup(check=False)
+        prob.run()
+        J = prob.calc_gradient(['x', 'z'], ['obj', 'con1'], mode='rev',
+                               return_format='array')
+        return prob['y1'], prob['y2'], J
+
+    def test_hit(self):
+        prob = _build(self.filename)
+        expected = self._run(prob)
+        order = prob.root.list_order()
+        self.assertFalse(prob.setup_cache.hit)
+        self.assertTrue(os.path.exists(self.filename))
+
+        products = prob.setup_cache._products
+        for key in ('connections', 'relevance', ('order', 'mda'),
+                    ('xfer', '', None), ('xfer', 'mda', None)):
+            self.assertTrue(key in products, key)
+
+        # index arrays for each variable of interest under LinearGaussSeidel
+        self.assertTrue(('xfer', '', 'obj') in products)
+
+        prob = _build(self.filename)
+        actual = self._run(prob)
+        self.assertTrue(prob.setup_cache.hit)
+
+        for a, e in zip(actual, expected):
+            assert_rel_error(self, a, e, 1e-10)
+        self.assertEqual(prob.root.list_order(), order)
+
+    def test_changed_model(self):
+        prob = _build_chain(self.filename)
+        prob.setup(check=False)
+        prob.run()
+        self.assertFalse(prob.setup_cache.hit)
+
+        # auto ordering puts C1 first
+        self.assertEqual(prob.root.list_order(), ['p', 'C1', 'C2'])
+
+        prob = _build_chain(self.filename, size=2, src_indices=[2, 0])
+        prob.setup(check=False)
+        prob.run()
+        self.assertFalse(prob.setup_cache.hit)
+        np.testing.assert_allclose(prob['C2.y'], [18.0, 6.0])
+
+        prob = _build_chain(self.filename, size=2, src_indices=[0, 1])
+        prob.setup(check=False)
+        prob.run()
+        self.assertFalse(prob.setup_cache.hit)
+        np.testing.assert_allclose(prob['C2.y'], [6.0, 12.0])
+
+        prob = _build_chain(self.filename, size=2, src_indices=[0, 1])
+        prob.setup(check=False)
+        prob.run()
+        self.assertTrue(prob.setup_cache.hit)
+        np.testing.assert_allclose(prob['C2.y'], [6.0, 12.0])
+
+    def test_bad_file(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a cache')
+
+        prob = _build_chain(self.filename)
+        prob.setup(check=False)
+        prob.run()
+        self.assertFalse(prob.setup_cache.hit)
+        np.testing.assert_allclose(prob['C2.y'], [6.0, 12.0, 18.0])
+
+        prob = _build_chain(self.filename)
+        prob.setup(check=False)
+        self.assertTrue(prob.setup_cache.hit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+""" Tests for the setup phase timing."""
+
+import unittest
+
+from six.moves import cStringIO
+
+from openmdao.api import Problem, Group
+from openmdao.core.setup_timer import SetupTimer
+from openmdao.test.build4test import make_subtree
+
+
+class TestSetupTimer(unittest.TestCase):
+
+    def _build(self):
+        prob = Problem(root=Group())
+        make_subtree(prob.root, nsubgroups=2, levels=2, ncomps=3,
+                     nparams=3, noutputs=3, nconns=2)
+        return prob
+
+    def test_phases(self):
+        prob = self._build()
+        prob.setup(check=False)
+
+        timer = prob.setup_timing
+        times = timer.get_times()
+        for phase in ('setup_variables', 'setup_connections',
+                      'check_connections', 'setup_units', 'relevance',
+                      'setup_vectors', 'setup_data_transfer', 'solver_setup',
+                      'recorder_setup'):
+            self.assertTrue(phase in times, phase)
+            self.assertTrue(times[phase] >= 0.0)
+
+        # Nested phases aren't counted twice.
+        self.assertTrue(timer.total < sum(times.values()))
+
+        groups = [s.pathname for s in prob.root.subgroups(recurse=True,
+                                                          include_self=True)]
+        self.assertEqual(sorted(timer.get_times('setup_data_transfer')),
+                         sorted(groups))
+
+        # Setting up again starts over.
+        prob.setup(check=False)
+        self.assertEqual(timer._records['setup_data_transfer'].count,
+                         len(groups))
+
+    def test_report(self):
+        prob = self._build()
+        prob.setup_timing = SetupTimer(trace_memory=True)
+        prob.setup(check=False)
+
+        stream = cStringIO()
+        prob.setup_timing.report(out_stream=stream)
+        lines = stream.getvalue().splitlines()
+
+        self.assertTrue(lines[0].startswith('Setup phase'))
+        self.assertTrue('Alloc (MB)' in lines[0])
+        self.assertTrue(any(line.startswith('  setup_data_transfer')
+                            for line in lines))
+        self.assertTrue(any(line.startswith('Total') for line in lines))
+        self.assertTrue('Slowest groups in setup_data_transfer:' in lines)
+
+        allocated = prob.setup_timing.get_allocated()
+        try:
+            import tracemalloc
+        except ImportError:
+            self.assertTrue(all(v is None for v in allocated.values()))
+        else:
+            self.assertTrue(allocated['setup_vectors'] > 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -140,6 +140,46 @@ class TestVecWrapper(unittest.TestCase):
         uview2 = u.get_view(s, None, {})
         self.assertEqual(list(uview2.keys()), [])
 
+    def test_view_shares_table(self):
+        unknowns_dict = OrderedDict()
+
+        unknowns_dict['C1.y1'] = { 'shape': (3,2), 'size': 6, 'val': np.ones((3, 2)) }
+        unknowns_dict['C1.y3'] = { 'size': 0, 'val': "foo", 'pass_by_obj': True }
+        unknowns_dict['C2.y4'] = { 'shape': (2, 1),  'val': np.zeros((2,1)), 'size': 2,  }
+        unknowns_dict['C2.s1'] = { 'shape': 1, 'size': 1, 'val': -1.0, 'state': True, }
+
+        sd = _SysData('')
+        for u, meta in unknowns_dict.items():
+            meta['pathname'] = u
+            meta['top_promoted_name'] = u
+            sd.to_prom_name[u] = u
+
+        u = SrcVecWrapper(sd, pbd)
+        u.setup(unknowns_dict, store_byobjs=True)
+
+        s = System()
+        s._sysdata = _SysData('')
+        s._probdata = pbd
+        uview = u.get_view(s, None, OrderedDict([('C2.y4', 'y4'),
+                                                 ('C2.s1', 's1')]))
+
+        # Accessors are slotted and the views don't add any rows.
+        self.assertFalse(hasattr(u._dat['C1.y1'], '__dict__'))
+        self.assertTrue(uview._tbl is u._tbl)
+        self.assertEqual(len(u._tbl), 4)
+
+        self.assertEqual(u._dat['C1.y1'].slice, (0, 6))
+        self.assertEqual(u._dat['C1.y3'].slice, None)
+        self.assertEqual(u._dat['C2.s1'].slice, (8, 9))
+        self.assertEqual(uview._dat['y4'].slice, (0, 2))
+        self.assertEqual(uview._dat['s1'].slice, (2, 3))
+        self.assertTrue(u._dat['C1.y3'].pbo)
+        self.assertFalse(uview._dat['y4'].pbo)
+
+        uview['y4'] = np.array([[3.], [4.]])
+        np.testing.assert_array_equal(u['C2.y4'], [[3.], [4.]])
+        self.assertEqual(uview['y4'].shape, (2, 1))
+
     def test_flat(self):
         unknowns_dict = OrderedDict()
 
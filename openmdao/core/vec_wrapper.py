@@ -7,6 +7,7 @@ from numpy.linalg import norm
 from six import iteritems, itervalues, iterkeys
 from six.moves import cStringIO
 
+from array import array
 from collections import OrderedDict
 from openmdao.core.fileref import FileRef
 from openmdao.util.string_util import get_common_ancestor
@@ -25,10 +26,88 @@ class _ByObjWrapper(object):
     def __str__(self):
         return str(self.val)
 
-# using a slotted object here to save memory
+# flags stored for each variable in a _VarTable
+_PBO = 1
+_REMOTE = 2
+_OWNED = 4
+
+
+class _VarTable(object):
+    """
+    Struct-of-arrays store of the per-variable data used by `Accessor`s:
+    location in the vector, size, shape, unit conversion, and flags. A
+    `VecWrapper` adds a row for each variable it sets up, and its views share
+    the same table, so none of this is duplicated per view.
+    """
+
+    __slots__ = ['starts', 'sizes', 'shapes', 'scales', 'offsets', 'flags']
+
+    def __init__(self):
+        self.starts = array('l')
+        self.sizes = array('l')
+        self.shapes = []
+        self.scales = array('d')
+        self.offsets = array('d')
+        self.flags = bytearray()
+
+    def __len__(self):
+        return len(self.flags)
+
+    def add(self, slc, meta, flags):
+        """
+        Adds a row for a variable.
+
+        Args
+        ----
+        slc : tuple or None
+            (start, end) of the variable in the vector, or None if it isn't
+            stored in the vector.
+
+        meta : dict
+            Metadata for the variable collected from components.
+
+        flags : int
+            Bitwise OR of the flags that apply to the variable.
+
+        Returns
+        -------
+        int
+            Index of the new row.
+        """
+        if slc is None:
+            self.starts.append(-1)
+            self.sizes.append(0)
+        else:
+            self.starts.append(slc[0])
+            self.sizes.append(slc[1] - slc[0])
+
+        self.shapes.append(meta.get('shape'))
+
+        scale, offset = meta.get('unit_conv', (1.0, 0.0))
+        self.scales.append(scale)
+        self.offsets.append(offset)
+
+        self.flags.append(flags)
+
+        return len(self.flags) - 1
+
+
 class Accessor(object):
+    """
+    Provides fast access to the value of a single variable in a `VecWrapper`.
+    There is one of these for every variable in every `VecWrapper`, so it is
+    slotted, and everything about the variable other than its value views
+    and metadata dict lives in a `_VarTable` shared with the views of the
+    `VecWrapper` that created it.
+    """
+
+    # get, set and flat are stored as plain functions rather than bound
+    # methods to avoid creating three extra objects per Accessor.
+    __slots__ = ['val', 'imag_val', 'meta', 'probdata', '_tbl', '_idx',
+                 '_base', '_get', '_set', '_flat']
+
     def __init__(self, vecwrapper, slice, val, meta, probdata, alloc_complex,
-                 owned=True, imag_val=None, dangling=False):
+                 owned=True, imag_val=None, dangling=False, row=None):
         """ Initialize this accessor.
 
         Args
@@ -62,17 +141,38 @@ class Accessor(object):
 
         dangling : bool, optional
             If True, this variable is an unconnected param.
-        """
-        self.owned = owned
-        self.vectype = None
 
-        self.pbo = bool(dangling or meta.get('pass_by_obj'))
-        self.remote = meta.get('remote')
+        row : `Accessor`, optional
+            If given, this `Accessor` is a view of the same variable, and it
+            shares its row in the `_VarTable`.
+        """
+        if row is None:
+            flags = 0
+            if dangling or meta.get('pass_by_obj'):
+                flags |= _PBO
+            if meta.get('remote'):
+                flags |= _REMOTE
+            if owned:
+                flags |= _OWNED
+            if flags & (_PBO | _REMOTE):
+                slice = None
+
+            self._tbl = vecwrapper._tbl
+            self._idx = self._tbl.add(slice, meta, flags)
+            self._base = 0
+        else:
+            self._tbl = row._tbl
+            self._idx = row._idx
+            if slice is None:
+                self._base = row._base
+            else:
+                self._base = self._tbl.starts[self._idx] - slice[0]
 
         if alloc_complex:
             self.probdata = probdata
 
-        if self.pbo and not isinstance(val, _ByObjWrapper):
+        pbo = self.pbo
+        if pbo and not isinstance(val, _ByObjWrapper):
             self.val = _ByObjWrapper(val)
         else:
             self.val = val
@@ -81,32 +181,70 @@ class Accessor(object):
                     imag_val = val*0.0
                 self.imag_val = imag_val
 
-        if self.remote or self.pbo:
-            self.slice = None
-        else:
-            self.slice = slice
         self.meta = meta
 
-        self.get, self.flat = self._setup_get_funct(vecwrapper, meta, alloc_complex)
-        self.set = self._setup_set_funct(vecwrapper, meta, alloc_complex)
+        get, flat = self._setup_get_funct(vecwrapper, meta, alloc_complex)
+        self._get = get.__func__
+        self._flat = None if flat is None else flat.__func__
+        self._set = self._setup_set_funct(vecwrapper, meta, alloc_complex).__func__
+
+    @property
+    def pbo(self):
+        """ True if this is a pass_by_obj variable."""
+        return bool(self._tbl.flags[self._idx] & _PBO)
+
+    @property
+    def remote(self):
+        """ True if this variable lives in another process."""
+        return bool(self._tbl.flags[self._idx] & _REMOTE)
+
+    @property
+    def owned(self):
+        """ True if this parameter is owned by the vecwrapper."""
+        return bool(self._tbl.flags[self._idx] & _OWNED)
+
+    @property
+    def slice(self):
+        """ (start, end) of this variable in the vector, or None if it isn't
+        stored there."""
+        tbl = self._tbl
+        start = tbl.starts[self._idx]
+        if start < 0:
+            return None
+        start -= self._base
+        return (start, start + tbl.sizes[self._idx])
+
+    def get(self):
+        """ Returns the value of the variable."""
+        return self._get(self)
+
+    def set(self, value):
+        """ Sets the value of the variable."""
+        self._set(self, value)
+
+    def flat(self):
+        """ Returns the flattened value of the variable."""
+        return self._flat(self)
 
     def __getstate__(self):
         """ Returns state as a dict. """
-        state = self.__dict__.copy()
-        for s in ('get', 'set'):
-            state[s] = getattr(self, s).__name__
-        if state['flat'] is not None:
-            state['flat'] = state['flat'].__name__
+        state = {}
+        for s in self.__slots__:
+            if hasattr(self, s):
+                state[s] = getattr(self, s)
+        for s in ('_get', '_set', '_flat'):
+            if state[s] is not None:
+                state[s] = state[s].__name__
         return state
 
     def __setstate__(self, state):
         """ Restore state from `state`. """
-        self.__dict__.update(state)
-        for s in ('get', 'set'):
-            setattr(self, s, getattr(self, getattr(self, s)))
-        flat = getattr(self, 'flat')
-        if flat is not None:
-            setattr(self, 'flat', getattr(self, flat))
+        for s in ('_get', '_set', '_flat'):
+            if state[s] is not None:
+                state[s] = getattr(Accessor, state[s])
+                state[s] = getattr(state[s], '__func__', state[s])
+        for name, val in iteritems(state):
+            setattr(self, name, val)
 
     def _setup_get_funct(self, vecwrapper, meta, alloc_complex):
         """
@@ -116,7 +254,6 @@ class Accessor(object):
 
         val = meta['val']
         flatfunc = None
-        self.vectype = vecwrapper.vectype
 
         if self.remote:
             return self._remote_access_error, self._remote_access_error
@@ -200,6 +337,11 @@ class Accessor(object):
             else:
                 return self._set_arr
 
+    def _units(self):
+        """Returns the unit conversion (scale, offset)."""
+        tbl = self._tbl
+        return tbl.scales[self._idx], tbl.offsets[self._idx]
+
     # accessor functions
     def _get_pbo(self):
         """pass by obj"""
@@ -207,7 +349,7 @@ class Accessor(object):
 
     def _get_pbo_units(self):
         """Special unit conversions for pass by obj"""
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         vec = self.val.val + offset
         vec *= scale
         return vec
@@ -225,7 +367,7 @@ class Accessor(object):
 
     def _get_arr_diff_shape(self):
         """Array with different shape."""
-        return self.val.reshape(self.meta['shape'])
+        return self.val.reshape(self._tbl.shapes[self._idx])
 
     def _get_arr_diff_shape_complex(self):
         """Array with different shape, complex support."""
@@ -233,7 +375,7 @@ class Accessor(object):
             val = self.val + self.imag_val*1j
         else:
             val = self.val
-        return val.reshape(self.meta['shape'])
+        return val.reshape(self._tbl.shapes[self._idx])
 
     def _get_scalar(self):
         """Fast scalar."""
@@ -248,7 +390,7 @@ class Accessor(object):
 
     def _get_arr_units(self):
         """Array with same shape and unit conversion."""
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         vec = self.val + offset
         vec *= scale
         return vec
@@ -259,17 +401,17 @@ class Accessor(object):
             val = self.val + self.imag_val*1j
         else:
             val = self.val
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         vec = val + offset
         vec *= scale
         return vec
 
     def _get_arr_units_diff_shape(self):
         """Array with diff shape and unit conversion."""
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         vec = self.val + offset
         vec *= scale
-        return vec.reshape(self.meta['shape'])
+        return vec.reshape(self._tbl.shapes[self._idx])
 
     def _get_arr_units_diff_shape_complex(self):
         """Array with diff shape and unit conversion, complex support."""
@@ -277,14 +419,14 @@ class Accessor(object):
             val = self.val + self.imag_val*1j
         else:
             val = self.val
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         vec = val + offset
         vec *= scale
-        return vec.reshape(self.meta['shape'])
+        return vec.reshape(self._tbl.shapes[self._idx])
 
     def _get_scalar_units(self):
         """Scalar with unit conversion."""
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         return scale*(self.val[0] + offset)
 
     def _get_scalar_units_complex(self):
@@ -293,7 +435,7 @@ class Accessor(object):
             val = self.val[0] + self.imag_val[0]*1j
         else:
             val = self.val[0]
-        scale, offset = self.meta['unit_conv']
+        scale, offset = self._units()
         return scale*(val + offset)
 
     def _set_arr(self, value):
@@ -375,11 +517,14 @@ class VecWrapper(object):
         self.scale_cache = None
         self.units_cache = None
 
+        self._tbl = _VarTable()
+
     def _flat(self, name):
         """
         Return a flat version of the named variable, including any necessary conversions.
         """
-        return self._dat[name].flat()
+        acc = self._dat[name]
+        return acc._flat(acc)
 
     def metadata(self, name):
         """
@@ -418,7 +563,8 @@ class VecWrapper(object):
         -------
             The unflattened value of the named variable.
         """
-        return self._dat[name].get()
+        acc = self._dat[name]
+        return acc._get(acc)
 
     def __setitem__(self, name, value):
         """
@@ -432,7 +578,8 @@ class VecWrapper(object):
         value :
             The unflattened value of the named variable.
         """
-        self._dat[name].set(value)
+        acc = self._dat[name]
+        acc._set(acc, value)
 
     def __len__(self):
         """
@@ -601,6 +748,7 @@ class VecWrapper(object):
         view = self.__class__(system._sysdata, system._probdata, comm)
         view.alloc_complex = self.alloc_complex
         view.vectype = self.vectype
+        view._tbl = self._tbl
         view_size = 0
 
         start = -1
@@ -614,7 +762,7 @@ class VecWrapper(object):
                 if acc.pbo or acc.remote:
                     view._dat[pname] = Accessor(view, None, acc.val, acc.meta,
                                                 self._probdata,
-                                                alloc_complex)
+                                                alloc_complex, row=acc)
                 else:
                     pstart, pend = acc.slice
                     if start == -1:
@@ -635,7 +783,8 @@ class VecWrapper(object):
                     view._dat[pname] = Accessor(view,
                                                 (view_size, view_size + meta['size']),
                                                 acc.val, meta, self._probdata,
-                                                alloc_complex, imag_val=imag_val)
+                                                alloc_complex, imag_val=imag_val,
+                                                row=acc)
                     view_size += meta['size']
 
         if start == -1: # no items found
@@ -1022,6 +1171,10 @@ class TgtVecWrapper(VecWrapper):
         # user-defined apply_linear functions.
         self._rel_inputs = None
 
+        # Names of params whose values are views of their source unknowns.
+        self._aliased = set()
+        self._allow_alias = True
+
     def __contains__(self, key):
         """
         Returns
@@ -1084,6 +1237,9 @@ class TgtVecWrapper(VecWrapper):
         vec_size = 0
         missing = []  # names of our params that we don't 'own'
         syspath = self._sysdata.pathname + '.'
+        alias = store_byobjs and self._allow_alias and \
+                self._probdata.alias_params
+        aliases = {}
 
         for meta in itervalues(params_dict):
             if relevance is None or relevance.is_relevant(var_of_interest,
@@ -1110,6 +1266,14 @@ class TgtVecWrapper(VecWrapper):
                                                                 self._probdata,
                                                                 alloc_complex)
 
+                    # Plain connections to a whole unknown can share its
+                    # storage. The param keeps its slot in the vector so that
+                    # the layout still matches dparams.
+                    if alias and slc is not None and not src_acc.remote and \
+                       'src_indices' not in meta and 'unit_conv' not in meta and \
+                       src_acc.val.size == meta['size']:
+                        aliases[scoped_name(pathname)] = src_acc
+
                 elif parent_params_vec is not None and pathname in connections:
                     src, _ = connections[pathname]
                     common = get_common_ancestor(src, pathname)
@@ -1126,13 +1290,24 @@ class TgtVecWrapper(VecWrapper):
                 self.imag_vec = numpy.zeros(vec_size)
 
         # map slices to the array
-        for acc in itervalues(self._dat):
-            if not (acc.pbo or acc.remote):
+        for name, acc in iteritems(self._dat):
+            if name in aliases:
+                # Read-only, so that a component can't change the unknown
+                # through its param. FD and complex step write through a
+                # writable view while they perturb the param.
+                acc.val = aliases[name].val.view()
+                acc.val.setflags(write=False)
+                if alloc_complex:
+                    acc.imag_val = aliases[name].imag_val.view()
+                    acc.imag_val.setflags(write=False)
+            elif not (acc.pbo or acc.remote):
                 start, end = acc.slice
                 acc.val = self.vec[start:end]
                 if alloc_complex:
                     acc.imag_val = self.imag_vec[start:end]
 
+        self._aliased = set(aliases)
+
         # fill entries for missing params with views from the parent
         if parent_params_vec is not None:
             parent_scoped_name = parent_params_vec._sysdata._scoped_abs_name
@@ -0,0 +1,461 @@
+"""
+OpenMDAO Driver that runs an optimizer from several start points.
+"""
+
+from __future__ import print_function
+
+import sys
+import traceback
+import multiprocessing
+from collections import OrderedDict
+from random import seed
+
+from six import iteritems, itervalues
+from six.moves import range
+
+import numpy as np
+
+from openmdao.core.driver import Driver
+from openmdao.core.mpi_wrap import MPI
+from openmdao.drivers.latinhypercube_driver import LatinHypercubeDriver, \
+                                                   OptimizedLatinHypercubeDriver
+from openmdao.util.concurrent import concurrent_eval_lb
+from openmdao.util.record_util import create_local_meta, update_local_meta
+
+# the MultiStartDriver that forked the current process pool
+_pool_driver = None
+
+
+def _pool_run_start(case):
+    """ Runs one start point in a process pool worker."""
+    try:
+        retval = _pool_driver._run_start(*case)
+    except:
+        return None, traceback.format_exc()
+    return retval, None
+
+
+class _StartRecorders(object):
+    """ Hands the iterations of one run of the optimizer to the
+    MultiStartDriver's recorders, with the start index pushed onto the front
+    of the iteration coordinate so that the runs don't overwrite each other's
+    cases."""
+
+    def __init__(self, recorders, start):
+        self._recorders = recorders
+        self._coord = ['MultiStartDriver', (start,)]
+
+    def __getattr__(self, name):
+        return getattr(self._recorders, name)
+
+    def __iter__(self):
+        return iter(self._recorders)
+
+    def _start_meta(self, metadata):
+        if metadata is None:
+            return None
+        meta = dict(metadata)
+        coord = metadata['coord']
+        meta['coord'] = coord[:1] + self._coord + coord[1:]
+        return meta
+
+    def record_iteration(self, root, metadata, dummy=False):
+        self._recorders.record_iteration(root, self._start_meta(metadata),
+                                         dummy)
+
+    def record_derivatives(self, derivs, metadata):
+        self._recorders.record_derivatives(derivs, self._start_meta(metadata))
+
+
+class MultiStartDriver(Driver):
+    """ Driver that runs an optimizer Driver from several start points, to
+    find the best of the local optima of the problem. The start points are
+    spread over the bounds of the design variables with a Latin hypercube.
+
+    Add the design variables, objective and constraints to this driver, not
+    to the optimizer. Design variables must have finite bounds. Each run
+    starts from the state of the model when this driver starts, with only
+    the design variables set to the start point. When the driver finishes,
+    the model is left at the best optimum found.
+
+    Add recorders to this driver, not to the optimizer. Each run of the
+    optimizer is recorded under 'MultiStartDriver|<start index>|' followed by
+    the optimizer's own iteration coordinate, and the final run at the best
+    optimum is recorded as 'MultiStartDriver|<num_starts>'.
+
+    Args
+    ----
+    optimizer : `Driver`
+        The optimizer to run, e.g., a `ScipyOptimizer` or `pyOptSparseDriver`.
+
+    seed : int or None, optional
+        Random seed for the start points. Defaults to None.
+
+    num_par_starts : int, optional
+        The number of start points to run concurrently. Under MPI, rank 0
+        hands out the start points and every other rank runs its own copy of
+        the model, so this needs num_par_starts + 1 processes and a model that
+        runs on a single process. Otherwise, a pool of this many processes is
+        forked, which needs a platform that supports fork. Defaults to 1.
+
+    Options
+    -------
+    options['num_starts'] :  int(10)
+        Number of start points.
+    options['optimized_lhs'] :  bool(False)
+        If True, pick the start points with an optimized Latin hypercube
+        (see `OptimizedLatinHypercubeDriver`).
+    options['max_optima'] :  int(0)
+        Stop starting new runs once this many distinct optima have converged.
+        Zero runs all of the start points.
+    options['optima_tol'] :  float(0.0001)
+        Two converged runs found the same optimum if none of their design
+        variables differ by more than this fraction of the range between the
+        bounds.
+
+    Attributes
+    ----------
+    results : list of dict
+        The result of each run in the order they finished, with keys 'start'
+        (index of the start point), 'x0' (start point), 'desvars', 'objective',
+        'success', 'iterations' and 'error'. Values are scaled the same way as
+        they are for the optimizer.
+    optima : list of dict
+        Distinct optima of the converged runs, best first, with keys
+        'desvars', 'objective', 'count' (number of runs that found it) and
+        'starts' (their start indices).
+    exit_flag : int
+        1 if any of the runs converged, otherwise 0.
+    """
+
+    def __init__(self, optimizer, seed=None, num_par_starts=1):
+        super(MultiStartDriver, self).__init__()
+
+        self.optimizer = optimizer
+
+        # The optimizer records its iterations in our recorders, since ours
+        # are the ones the Problem starts up.
+        optimizer.recorders = self.recorders
+        self.supports = optimizer.supports
+
+        self.options.add_option('num_starts', 10, lower=1,
+                                desc='Number of start points.')
+        self.options.add_option('optimized_lhs', False,
+                                desc='Set to True to pick the start points '
+                                'with an optimized Latin hypercube.')
+        self.options.add_option('max_optima', 0, lower=0,
+                                desc='Stop once this many distinct optima '
+                                'have converged. Zero runs all start points.')
+        self.options.add_option('optima_tol', 1.0e-4, lower=0.0,
+                                desc='Relative distance within which two '
+                                'optima are the same.')
+
+        self.seed = seed
+        self._num_par_starts = int(num_par_starts)
+        self._full_comm = None
+        self._problem = None
+        self._init_state = None
+
+        self.results = []
+        self.optima = []
+        self.exit_flag = 0
+
+    def _setup_communicators(self, comm, parent_dir):
+        """
+        Assign a communicator to the root `System`. When starts are run in
+        parallel under MPI, each rank gets its own copy of the model.
+
+        Args
+        ----
+        comm : an MPI communicator (real or fake)
+            The communicator being offered by the Problem.
+
+        parent_dir : str
+            Absolute directory of the Problem.
+        """
+        self._full_comm = comm
+        if MPI and self._num_par_starts > 1:
+            comm = comm.Split(comm.rank)
+        self.root._setup_communicators(comm, parent_dir)
+
+    def get_req_procs(self):
+        """
+        Returns
+        -------
+        tuple
+            A tuple of the form (min_procs, max_procs), indicating the
+            min and max processors usable by this `Driver`.
+        """
+        if MPI and self._num_par_starts > 1:
+            if self.root.get_req_procs()[0] > 1:
+                raise RuntimeError("MultiStartDriver can't run start points in "
+                                   "parallel for a model that needs more than "
+                                   "one process.")
+            nprocs = self._num_par_starts + 1
+            return (nprocs, nprocs)
+        return self.root.get_req_procs()
+
+    def set_root(self, pathname, root):
+        """ Sets the root Group of this driver and of the optimizer.
+
+        Args
+        ----
+        root : Group
+            Our root Group.
+        """
+        # The optimizer shares our recorders, so let it go first.
+        self.optimizer.set_root(pathname, root)
+        super(MultiStartDriver, self).set_root(pathname, root)
+
+    def _setup(self):
+        opt = self.optimizer
+        opt._desvars = OrderedDict(self._desvars)
+        opt._objs = OrderedDict(self._objs)
+        opt._cons = OrderedDict(self._cons)
+        opt._voi_sets = self._voi_sets
+        opt._setup()
+
+        super(MultiStartDriver, self)._setup()
+
+        if self._num_par_starts > 1 and len(self.recorders._recorders) > 0:
+            raise RuntimeError("MultiStartDriver can't record when start "
+                               "points are run in parallel.")
+
+        if self._num_par_starts > 1 and not MPI and sys.platform == 'win32':
+            raise RuntimeError("MultiStartDriver can only run start points in "
+                               "parallel without MPI on a platform that "
+                               "supports fork.")
+
+        for name, meta in iteritems(self._desvars):
+            for bound in (meta['lower'], meta['upper']):
+                if np.any(np.abs(bound) >= sys.float_info.max):
+                    raise ValueError("Design variable '%s' needs finite bounds "
+                                     "for MultiStartDriver." % name)
+
+    def cleanup(self):
+        """ Clean up resources prior to exit. """
+        super(MultiStartDriver, self).cleanup()
+        self.optimizer.cleanup()
+
+    def _start_points(self):
+        """ Returns a list of start points, each an OrderedDict of scaled
+        design variable values."""
+        desvars = self.get_desvar_metadata()
+        num_starts = self.options['num_starts']
+
+        if self.seed is not None:
+            seed(self.seed)
+            np.random.seed(self.seed)
+
+        if self.options['optimized_lhs']:
+            lhs = OptimizedLatinHypercubeDriver(num_samples=num_starts)
+        else:
+            lhs = LatinHypercubeDriver(num_samples=num_starts)
+        lhs.num_design_vars = sum(meta['size'] for meta in itervalues(desvars))
+        buckets = lhs._get_lhc()
+
+        # a random point in each bucket
+        frac = (buckets + np.random.random(buckets.shape)) / num_starts
+
+        points = [OrderedDict() for i in range(num_starts)]
+        j = 0
+        for name, meta in iteritems(desvars):
+            size = meta['size']
+            lower = meta['lower']
+            upper = meta['upper']
+            for i in range(num_starts):
+                points[i][name] = lower + frac[i, j:j+size]*(upper - lower)
+            j += size
+
+        return points
+
+    def _run_start(self, start, x0):
+        """ Runs the optimizer from the given start point.
+
+        Args
+        ----
+        start : int
+            Index of the start point.
+
+        x0 : OrderedDict
+            Scaled value of each design variable.
+
+        Returns
+        -------
+        dict
+            The result of the run.
+        """
+        self.root.unknowns.vec[:] = self._init_state
+        for name, val in iteritems(x0):
+            self.set_desvar(name, val)
+
+        opt = self.optimizer
+        opt.recorders = _StartRecorders(self.recorders, start)
+        try:
+            opt.run(self._problem)
+        finally:
+            opt.recorders = self.recorders
+
+        objective = None
+        for val in itervalues(self.get_objectives()):
+            objective = float(np.asarray(val).flat[0])
+            break
+
+        return {
+            'start': start,
+            'x0': x0,
+            'desvars': OrderedDict((n, np.array(v))
+                                   for n, v in iteritems(self.get_desvars())),
+            'objective': objective,
+            'success': bool(opt.exit_flag),
+            'iterations': opt.iter_count,
+            'error': None,
+        }
+
+    def _add_optimum(self, optima, result):
+        """ Adds a converged result to the list of distinct optima.
+
+        Returns
+        -------
+        int
+            The number of distinct optima.
+        """
+        tol = self.options['optima_tol']
+        desvars = self.get_desvar_metadata()
+
+        for opt in optima:
+            for name, meta in iteritems(desvars):
+                diff = np.abs(opt['desvars'][name] - result['desvars'][name])
+                if np.any(diff > tol*(meta['upper'] - meta['lower'])):
+                    break
+            else:
+                opt['count'] += 1
+                opt['starts'].append(result['start'])
+                if result['objective'] < opt['objective']:
+                    opt['desvars'] = result['desvars']
+                    opt['objective'] = result['objective']
+                return len(optima)
+
+        optima.append({
+            'desvars': result['desvars'],
+            'objective': result['objective'],
+            'count': 1,
+            'starts': [result['start']],
+        })
+        return len(optima)
+
+    def run(self, problem):
+        """Runs the optimizer from each start point, then sets the model to
+        the best optimum found.
+
+        Args
+        ----
+        problem : `Problem`
+            Our parent `Problem`.
+        """
+        global _pool_driver
+
+        self._problem = problem
+        self._init_state = self.root.unknowns.vec.copy()
+
+        cases = [((i, x0), None) for i, x0 in enumerate(self._start_points())]
+
+        max_optima = self.options['max_optima']
+        found = []
+
+        def stop(retval, err):
+            if retval is not None and retval['success']:
+                return self._add_optimum(found, retval) >= max_optima
+            return False
+
+        if not max_optima:
+            stop = None
+
+        with self.root._dircontext:
+            if self._num_par_starts > 1 and MPI:
+                results = concurrent_eval_lb(self._run_start, cases,
+                                             self._full_comm, broadcast=True,
+                                             stop=stop)
+            elif self._num_par_starts > 1:
+                # The workers find this driver in _pool_driver, which they
+                # only inherit if they are forked.
+                if hasattr(multiprocessing, 'get_context'):
+                    ctx = multiprocessing.get_context('fork')
+                else:
+                    ctx = multiprocessing
+
+                results = []
+                _pool_driver = self
+                pool = ctx.Pool(self._num_par_starts)
+                try:
+                    for retval, err in pool.imap_unordered(_pool_run_start,
+                                                           [c[0] for c in cases]):
+                        results.append((retval, err))
+                        if stop is not None and stop(retval, err):
+                            break
+                finally:
+                    pool.terminate()
+                    pool.join()
+                    _pool_driver = None
+            else:
+                results = concurrent_eval_lb(self._run_start, cases, None,
+                                             stop=stop)
+
+        self._problem = None
+
+        self.results = []
+        for retval, err in results:
+            if retval is None:
+                retval = {'success': False, 'error': err}
+            self.results.append(retval)
+
+        if all(r['error'] is not None for r in self.results):
+            raise RuntimeError("All MultiStartDriver runs failed. The first "
+                               "error was:\n%s" % self.results[0]['error'])
+
+        self.optima = []
+        for result in self.results:
+            if result['success']:
+                self._add_optimum(self.optima, result)
+        self.optima.sort(key=lambda opt: opt['objective'])
+
+        self.exit_flag = 1 if self.optima else 0
+        if self.optima:
+            best = self.optima[0]['desvars']
+        else:
+            best = min((r for r in self.results if r['error'] is None),
+                       key=lambda r: r['objective'])['desvars']
+
+        self.root.unknowns.vec[:] = self._init_state
+        for name, val in iteritems(best):
+            self.set_desvar(name, val)
+
+        system = problem.root
+        self.iter_count += 1
+        metadata = self.metadata = create_local_meta(None, 'MultiStartDriver')
+        system.ln_solver.local_meta = metadata
+        update_local_meta(metadata, (len(cases),))
+
+        with system._dircontext:
+            system.solve_nonlinear(metadata=metadata)
+
+        self.recorders.record_iteration(system, metadata)
+
+    def print_optima(self, out_stream=sys.stdout):
+        """ Writes a table of the distinct optima found by the last run.
+
+        Args
+        ----
+        out_stream : file-like, optional
+            Where to write the table. Default is sys.stdout.
+        """
+        print("%d of %d runs converged to %d distinct optima" %
+              (sum(opt['count'] for opt in self.optima), len(self.results),
+               len(self.optima)), file=out_stream)
+        print("%4s %16s %6s  %s" % ("Rank", "Objective", "Count",
+                                    "Design variables"), file=out_stream)
+        for i, opt in enumerate(self.optima):
+            dvs = ', '.join("%s=%s" % (name, np.array2string(val, precision=6))
+                            for name, val in iteritems(opt['desvars']))
+            print("%4d %16.8g %6d  %s" % (i + 1, opt['objective'], opt['count'],
+                                          dvs), file=out_stream)
@@ -0,0 +1,155 @@
+""" Testing the MultiStartDriver."""
+
+import os
+import sys
+import multiprocessing
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+from six.moves import cStringIO
+
+from openmdao.api import IndepVarComp, Group, Problem, ScipyOptimizer, \
+                         ExecComp, MultiStartDriver, SqliteRecorder, \
+                         CaseReader
+from openmdao.test.util import assert_rel_error
+
+
+def _two_wells(num_par_starts=1):
+    """ A function with a local minimum near x=1 and the global minimum near
+    x=-1."""
+    prob = Problem()
+    root = prob.root = Group()
+
+    root.add('p', IndepVarComp('x', 0.5), promotes=['*'])
+    root.add('comp', ExecComp('f = (x**2 - 1.0)**2 + 0.3*x'), promotes=['*'])
+
+    optimizer = ScipyOptimizer()
+    optimizer.options['optimizer'] = 'SLSQP'
+    optimizer.options['disp'] = False
+
+    prob.driver = MultiStartDriver(optimizer, seed=11,
+                                   num_par_starts=num_par_starts)
+    prob.driver.options['num_starts'] = 8
+    prob.driver.add_desvar('x', lower=-2.0, upper=2.0)
+    prob.driver.add_objective('f')
+    return prob
+
+
+class TestMultiStartDriver(unittest.TestCase):
+
+    def _check_optima(self, prob):
+        driver = prob.driver
+
+        self.assertEqual(driver.exit_flag, 1)
+        self.assertEqual(len(driver.results), 8)
+        self.assertEqual(len(driver.optima), 2)
+        self.assertEqual(sum(opt['count'] for opt in driver.optima), 8)
+        self.assertEqual(sorted(s for opt in driver.optima
+                                for s in opt['starts']), list(range(8)))
+
+        assert_rel_error(self, driver.optima[0]['desvars']['x'], -1.0356, 1e-3)
+        assert_rel_error(self, driver.optima[1]['desvars']['x'], 0.9601, 1e-3)
+
+        # the model is left at the best optimum
+        assert_rel_error(self, prob['x'], -1.0356, 1e-3)
+        assert_rel_error(self, prob['f'], driver.optima[0]['objective'], 1e-10)
+
+    def test_serial(self):
+        prob = _two_wells()
+        prob.setup(check=False)
+        prob.run()
+
+        self._check_optima(prob)
+
+        # start points are spread over the bounds
+        x0 = sorted(float(r['x0']['x']) for r in prob.driver.results)
+        for i, x in enumerate(x0):
+            self.assertTrue(-2.0 + 0.5*i <= x <= -1.5 + 0.5*i)
+
+        stream = cStringIO()
+        prob.driver.print_optima(out_stream=stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[0], "8 of 8 runs converged to 2 distinct optima")
+        self.assertEqual(len(lines), 4)
+
+    @unittest.skipIf(sys.platform == 'win32', "needs fork")
+    def test_process_pool(self):
+        prob = _two_wells(num_par_starts=3)
+        prob.setup(check=False)
+        prob.run()
+
+        self._check_optima(prob)
+
+    @unittest.skipIf(sys.platform == 'win32' or
+                     not hasattr(multiprocessing, 'get_context'), "needs fork")
+    def test_process_pool_spawn_default(self):
+        # The pool is forked even when that isn't the default start method.
+        method = multiprocessing.get_start_method()
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            prob = _two_wells(num_par_starts=3)
+            prob.setup(check=False)
+            prob.run()
+        finally:
+            multiprocessing.set_start_method(method, force=True)
+
+        self._check_optima(prob)
+
+    def test_max_optima(self):
+        prob = _two_wells()
+        prob.driver.options['max_optima'] = 1
+        prob.setup(check=False)
+        prob.run()
+
+        self.assertEqual(len(prob.driver.results), 1)
+        self.assertEqual(len(prob.driver.optima), 1)
+
+    def test_record(self):
+        tempdir = mkdtemp()
+        try:
+            filename = os.path.join(tempdir, 'multistart.db')
+            prob = _two_wells()
+            prob.driver.add_recorder(SqliteRecorder(filename))
+            prob.setup(check=False)
+            prob.run()
+            prob.cleanup()
+
+            self.assertEqual(prob.driver.recorders.pathname,
+                             '.MultiStartDriver.recorders')
+
+            cr = CaseReader(filename)
+            cases = cr.list_cases()
+
+            # every iteration of every start, plus the final run
+            niters = sum(r['iterations'] for r in prob.driver.results)
+            self.assertEqual(len(cases), niters + 1)
+            for result in prob.driver.results:
+                prefix = 'rank0:MultiStartDriver|%d|SLSQP|' % result['start']
+                self.assertEqual(len([c for c in cases if c.startswith(prefix)]),
+                                 result['iterations'])
+
+            final = cr.get_case('rank0:MultiStartDriver|8')
+            assert_rel_error(self, final['x'], -1.0356, 1e-3)
+        finally:
+            rmtree(tempdir)
+
+    def test_unbounded(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', 0.5), promotes=['*'])
+        root.add('comp', ExecComp('f = x**2'), promotes=['*'])
+
+        prob.driver = MultiStartDriver(ScipyOptimizer())
+        prob.driver.add_desvar('x', lower=-2.0)
+        prob.driver.add_objective('f')
+
+        with self.assertRaises(ValueError) as cm:
+            prob.setup(check=False)
+        self.assertEqual(str(cm.exception), "Design variable 'x' needs finite "
+                         "bounds for MultiStartDriver.")
+
+
+if __name__ == "__main__":
+    unittest.main()
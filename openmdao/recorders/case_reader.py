@@ -1,5 +1,8 @@
+import os
+
 from openmdao.recorders.sqlite_reader import SqliteCaseReader
 from openmdao.recorders.hdf5_reader import HDF5CaseReader
+from openmdao.recorders.columnar_reader import ColumnarCaseReader
 
 
 def CaseReader(filename):
@@ -9,13 +12,16 @@ def CaseReader(filename):
     ----------
     filename : str
         A path to the recorded file.  The file should have been recorded using
-        either the SqliteRecorder or the HDF5Recorder.
+        either the SqliteRecorder or the HDF5Recorder, or be a directory
+        recorded using the ColumnarRecorder.
 
     Returns
     -------
-    An instance of SqliteCaseReader or HDF5CaseReader, depending on the
-    contents of the given file.
+    An instance of SqliteCaseReader, HDF5CaseReader or ColumnarCaseReader,
+    depending on the contents of the given file.
     """
+    if os.path.isdir(filename):
+        return ColumnarCaseReader(filename)
 
     try:
         reader = SqliteCaseReader(filename)
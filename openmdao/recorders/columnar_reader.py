@@ -0,0 +1,208 @@
+from __future__ import print_function, absolute_import
+
+import os
+import json
+
+import numpy as np
+
+from openmdao.recorders.case_reader_base import CaseReaderBase
+from openmdao.recorders.case import Case
+from openmdao.recorders.columnar_recorder import SCHEMA_FILE, INDEX_FILE
+
+_KINDS = {'p': 'Parameters', 'u': 'Unknowns', 'r': 'Residuals'}
+
+
+class ColumnarCaseReader(CaseReaderBase):
+    """ A CaseReader specific to directories created with ColumnarRecorder.
+    Besides reading whole cases, it returns the recorded history of a
+    variable as a read-only view of the memory mapped file, without copying
+    or reading any other data.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the directory containing the recorded data.
+    """
+    def __init__(self, filename):
+        super(ColumnarCaseReader, self).__init__(filename)
+
+        schema_file = os.path.join(filename, SCHEMA_FILE)
+        if not os.path.isfile(schema_file):
+            raise IOError('Directory does not contain a columnar '
+                          'recording ({0})'.format(filename))
+
+        with open(schema_file) as f:
+            schema = json.load(f)
+
+        self.format_version = schema['format_version']
+        if self.format_version != 1:
+            raise ValueError('ColumnarCaseReader encountered an unhandled '
+                             'format version: {0}'.format(self.format_version))
+
+        self._meta_columns = schema['meta_columns']
+        self._tables = dict((t['system'], t) for t in schema['tables'])
+        self._files = dict((t['file'], t) for t in schema['tables'])
+        self._arrays = {}
+
+        # (file, row, msg) of each case. If a case id was recorded more than
+        # once (e.g., by running again after another setup), the last one is
+        # returned by get_case, but all of them are in the columns.
+        self._cases = {}
+        self._row_ids = dict((fname, []) for fname in self._files)
+        nrows = dict((fname, self._nrows(fname)) for fname in self._files)
+        keys = []
+        with open(os.path.join(filename, INDEX_FILE)) as f:
+            for line in f:
+                try:
+                    fname, row, case_id, msg = json.loads(line)
+                except ValueError:
+                    # the last line of a recording that is still being written
+                    break
+                if row >= nrows[fname]:
+                    # its row has not reached the disk yet
+                    continue
+                if case_id not in self._cases:
+                    keys.append(case_id)
+                self._cases[case_id] = (fname, row, msg)
+                self._row_ids[fname].append(case_id)
+
+        self._case_keys = tuple(keys)
+        self.num_cases = len(self._case_keys)
+
+    def _nrows(self, fname):
+        """ Returns the number of complete rows in the given file."""
+        path = os.path.join(self.filename, fname)
+        return os.path.getsize(path) // (self._files[fname]['width'] * 8)
+
+    def _array(self, fname):
+        """ Returns the memory mapped array of the rows in the given file."""
+        width = self._files[fname]['width']
+        path = os.path.join(self.filename, fname)
+        nrows = self._nrows(fname)
+
+        arr = self._arrays.get(fname)
+        if arr is None or arr.shape[0] != nrows:
+            if nrows == 0:
+                arr = np.zeros((0, width))
+            else:
+                arr = np.memmap(path, dtype=np.float64, mode='r',
+                                shape=(nrows, width))
+            self._arrays[fname] = arr
+        return arr
+
+    def _table(self, system):
+        try:
+            return self._tables[system]
+        except KeyError:
+            raise KeyError("No cases were recorded for system '%s'." % system)
+
+    def list_variables(self, system=''):
+        """
+        Args
+        ----
+        system : str, optional
+            Pathname of the recording `System`. Default is the root, which is
+            where the driver and the root solvers record.
+
+        Returns
+        -------
+        list of tuple
+            (kind, name) of the recorded variables, where kind is 'p', 'u' or
+            'r' for params, unknowns and resids.
+        """
+        return [(c['kind'], c['name']) for c in self._table(system)['columns']]
+
+    def get_column(self, name, kind='u', system=''):
+        """ Returns the history of a recorded variable.
+
+        Args
+        ----
+        name : str
+            Name of the variable, or 'timestamp' or 'success' for those
+            fields of each case.
+
+        kind : str, optional
+            'u', 'p' or 'r' to get the variable from the unknowns, params or
+            resids. Default is 'u'.
+
+        system : str, optional
+            Pathname of the recording `System`. Default is the root.
+
+        Returns
+        -------
+        ndarray
+            Read-only view of the memory mapped recording with the value of
+            the variable in each case recorded by the `System`, in the order
+            they were recorded. Its shape is (number of cases,) plus the
+            shape of the variable.
+        """
+        table = self._table(system)
+        arr = self._array(table['file'])
+
+        if name in self._meta_columns:
+            return arr[:, self._meta_columns.index(name)]
+
+        for col in table['columns']:
+            if col['name'] == name and col['kind'] == kind:
+                break
+        else:
+            raise KeyError("Variable '%s' of kind '%s' was not recorded for "
+                           "system '%s'." % (name, kind, system))
+
+        offset = col['offset']
+        if not col['shape']:
+            return arr[:, offset]
+        view = arr[:, offset:offset + col['size']]
+        return view.reshape((arr.shape[0],) + tuple(col['shape']))
+
+    def get_case_ids(self, system=''):
+        """
+        Args
+        ----
+        system : str, optional
+            Pathname of the recording `System`. Default is the root.
+
+        Returns
+        -------
+        list of str
+            Identifiers of the cases recorded by the `System`, in the order of
+            the rows returned by `get_column`.
+        """
+        return list(self._row_ids[self._table(system)['file']])
+
+    def get_case(self, case_id):
+        """
+        Parameters
+        ----------
+        case_id : int or str
+            The integer index or string-identifier of the case to be retrieved.
+
+        Returns
+        -------
+            An instance of Case populated with data from the
+            specified case/iteration.
+        """
+        if isinstance(case_id, int):
+            _case_id = self._case_keys[case_id]
+        else:
+            _case_id = case_id
+
+        fname, row, msg = self._cases[_case_id]
+        table = self._files[fname]
+        data = self._array(fname)[row]
+
+        case_dict = {
+            'timestamp': float(data[self._meta_columns.index('timestamp')]),
+            'success': int(data[self._meta_columns.index('success')]),
+            'msg': msg,
+        }
+        for col in table['columns']:
+            vals = case_dict.setdefault(_KINDS[col['kind']], {})
+            offset = col['offset']
+            if col['shape']:
+                vals[col['name']] = \
+                    data[offset:offset + col['size']].reshape(col['shape'])
+            else:
+                vals[col['name']] = float(data[offset])
+
+        return Case(self.filename, _case_id, case_dict)
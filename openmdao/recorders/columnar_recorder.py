@@ -0,0 +1,242 @@
+"""Class definition for ColumnarRecorder, a recorder that stores each case as
+a row of a fixed width binary array, so that the history of a variable can
+be read as one column."""
+
+import os
+import json
+
+import numpy as np
+
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import format_iteration_coordinate
+from openmdao.core.mpi_wrap import MPI
+
+format_version = 1
+
+SCHEMA_FILE = 'schema.json'
+INDEX_FILE = 'cases.jsonl'
+
+# columns at the start of every row
+_META_COLUMNS = ('timestamp', 'success')
+
+
+class _Table(object):
+    """ The rows recorded for one recording `System`."""
+
+    def __init__(self, system, filename, columns):
+        self.system = system
+        self.filename = filename
+        self.columns = columns
+        self.width = len(_META_COLUMNS) + sum(c['size'] for c in columns)
+        self.row = np.zeros(self.width)
+        self.nrows = 0
+        self.out = None
+
+        # (vector, name, slice of the row) of each variable
+        self.fillers = [(c['kind'], c['name'],
+                         slice(c['offset'], c['offset'] + c['size']))
+                        for c in columns]
+
+    def schema(self):
+        return {
+            'system': self.system,
+            'file': self.filename,
+            'width': self.width,
+            'columns': self.columns,
+        }
+
+
+class ColumnarRecorder(BaseRecorder):
+    """ Recorder that stores cases in a directory of append-only binary
+    arrays, one per recording `System`, with one row per case and a fixed
+    range of columns for each variable. The columns are fixed at startup
+    from the variables selected by the includes and excludes, so the history
+    of a variable can be read without loading any other data (see
+    `ColumnarCaseReader`). The iteration coordinate and message of each case
+    are kept in a separate index.
+
+    Only float and array variables are recorded; pass_by_obj variables,
+    metadata and derivatives are not.
+
+    Args
+    ----
+    out : str
+        Name of the directory to record into. Files from an earlier
+        recording there are overwritten.
+
+    Options
+    -------
+    options['record_unknowns'] :  bool(True)
+        Tells recorder whether to record the unknowns vector.
+    options['record_params'] :  bool(False)
+        Tells recorder whether to record the params vector.
+    options['record_resids'] :  bool(False)
+        Tells recorder whether to record the ressiduals vector.
+    options['includes'] :  list of strings
+        Patterns for variables to include in recording.
+    options['excludes'] :  list of strings
+        Patterns for variables to exclude in recording (processed after includes).
+    """
+
+    def __init__(self, out):
+        super(ColumnarRecorder, self).__init__()
+
+        self.options['record_metadata'] = False
+        self.options['record_derivs'] = False
+
+        self.dirname = out
+        self._tables = {}
+        self._index = None
+
+        self._active = not (MPI and MPI.COMM_WORLD.rank > 0)
+
+        if self._active:
+            if not os.path.isdir(out):
+                os.makedirs(out)
+            _remove_recording(out)
+
+    def startup(self, group):
+        super(ColumnarRecorder, self).startup(group)
+
+        if not self._active:
+            return
+
+        pathname = group.pathname
+        filtered = self._filtered[pathname]
+
+        columns = []
+        offset = len(_META_COLUMNS)
+        for kind, vec in (('p', group.params), ('u', group.unknowns),
+                          ('r', group.resids)):
+            for name in filtered[kind]:
+                meta = vec.metadata(name)
+                if meta.get('pass_by_obj'):
+                    continue
+                shape = meta['shape']
+                shape = [] if shape == 1 else list(shape)
+                columns.append({'kind': kind, 'name': name, 'shape': shape,
+                                'offset': offset, 'size': meta['size']})
+                offset += meta['size']
+
+        if self._index is None:
+            self._index = open(os.path.join(self.dirname, INDEX_FILE), 'a')
+
+        # setting up again appends to the same recording, as long as the
+        # same variables are recorded (maybe in a different order)
+        table = self._tables.get(pathname)
+        if table is not None:
+            def key(c):
+                return (c['kind'], c['name'], c['shape'], c['size'])
+            if sorted(map(key, table.columns)) != sorted(map(key, columns)):
+                raise RuntimeError("ColumnarRecorder: the variables recorded "
+                                   "for '%s' changed since it was set up." %
+                                   pathname)
+            if table.out is None:
+                table.out = open(os.path.join(self.dirname, table.filename),
+                                 'ab')
+            return
+
+        table = _Table(pathname, '%d.dat' % len(self._tables), columns)
+        table.out = open(os.path.join(self.dirname, table.filename), 'wb')
+        self._tables[pathname] = table
+
+        schema = {
+            'format_version': format_version,
+            'meta_columns': list(_META_COLUMNS),
+            'tables': [t.schema() for t in sorted(self._tables.values(),
+                                                  key=lambda t: t.filename)],
+        }
+        with open(os.path.join(self.dirname, SCHEMA_FILE), 'w') as f:
+            json.dump(schema, f)
+
+    def record_metadata(self, group):
+        """Currently not supported for columnar recordings. Do nothing.
+
+        Args
+        ----
+        group : `System`
+            `System` containing vectors
+        """
+        pass
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        """
+        Appends the provided data as a row to the array of the recording
+        `System`.
+
+        Args
+        ----
+        params : dict
+            Dictionary containing parameters. (p)
+
+        unknowns : dict
+            Dictionary containing outputs and states. (u)
+
+        resids : dict
+            Dictionary containing residuals. (r)
+
+        metadata : dict, optional
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        if not self._active:
+            raise RuntimeError("not rank 0")
+
+        iteration_coordinate = metadata['coord']
+        table = self._tables[self._get_pathname(iteration_coordinate)]
+        vecs = {'p': params, 'u': unknowns, 'r': resids}
+
+        row = table.row
+        row[0] = metadata['timestamp']
+        row[1] = metadata['success']
+        for kind, name, slc in table.fillers:
+            row[slc] = np.ravel(vecs[kind][name])
+
+        # The row must reach the disk before its line in the index does.
+        table.out.write(row.data)
+        table.out.flush()
+
+        self._index.write(json.dumps([table.filename, table.nrows,
+                                      format_iteration_coordinate(iteration_coordinate),
+                                      metadata['msg']]))
+        self._index.write('\n')
+        table.nrows += 1
+
+    def record_derivatives(self, derivs, metadata):
+        """Currently not supported for columnar recordings. Do nothing.
+
+        Args
+        ----
+        derivs : dict
+            Dictionary containing derivatives
+
+        metadata : dict, optional
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        pass
+
+    def close(self):
+        """Closes the files of the recording."""
+        for table in self._tables.values():
+            if table.out is not None:
+                table.out.close()
+                table.out = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+
+def _remove_recording(dirname):
+    """ Removes the files of a recording from dirname."""
+    schema_file = os.path.join(dirname, SCHEMA_FILE)
+    if not os.path.exists(schema_file):
+        return
+    with open(schema_file) as f:
+        schema = json.load(f)
+    for table in schema['tables']:
+        path = os.path.join(dirname, table['file'])
+        if os.path.exists(path):
+            os.remove(path)
+    for name in (INDEX_FILE, SCHEMA_FILE):
+        path = os.path.join(dirname, name)
+        if os.path.exists(path):
+            os.remove(path)
@@ -10,6 +10,8 @@ except ImportError:
 from openmdao.recorders.case_reader_base import CaseReaderBase
 from openmdao.recorders.case import Case
 
+_KINDS = {'p': 'Parameters', 'u': 'Unknowns', 'r': 'Residuals'}
+
 
 def _group_to_dict(grp):
     """ Given an HDF5 group, converted it to a nested dictionary.
@@ -44,10 +46,22 @@ def _group_to_dict(grp):
     return d
 
 
+def _to_str(val):
+    """ Returns a variable length string read from an HDF5 file as a str,
+    since h5py >= 3 reads them as bytes."""
+    if isinstance(val, bytes):
+        return val.decode('utf-8')
+    return val
+
+
 class HDF5CaseReader(CaseReaderBase):
     """ A case reader intended to read data from files recorded using the
     HDF5Recorder.
 
+    Files recorded with the 'variable' layout are read lazily: only the
+    coordinates of the cases are loaded up front, `get_case` reads one row of
+    each dataset, and `get_column` reads the history of a single variable.
+
     Args
     ----
     filename : str
@@ -77,12 +91,105 @@ class HDF5CaseReader(CaseReaderBase):
                 if isinstance(self._unknowns, h5py.Group):
                     self._unknowns = _group_to_dict(self._unknowns)
 
-                self._case_keys = tuple([key for key in f.keys()
-                                         if key != 'metadata'])
+                layout = f['metadata'].get('layout', None)
+                self.layout = 'iteration' if layout is None else \
+                              _to_str(layout[()])
+
+                if self.layout == 'variable':
+                    self._load_index(f)
+                else:
+                    self._case_keys = tuple([key for key in f.keys()
+                                             if key != 'metadata'])
         else:
             raise ValueError('HDF5CaseReader encountered an unhandled '
                              'format version: {0}'.format(self.format_version))
 
+    def _load_index(self, f):
+        """ Load the case keys of a file with the 'variable' layout, and the
+        (system group, row) where each case is stored. """
+        self._systems = {}
+        coords = {}
+        for name, grp in f['systems'].items():
+            self._systems[grp.attrs['pathname']] = name
+            coords[name] = [_to_str(c) for c in grp['coord'][:]] \
+                           if 'coord' in grp else []
+
+        names = dict((int(name), name) for name in coords)
+        self._rows = {}
+        keys = []
+        for num, row in zip(f['index']['system'][:], f['index']['row'][:]):
+            name = names[int(num)]
+            key = coords[name][row]
+            if key not in self._rows:
+                keys.append(key)
+            self._rows[key] = (name, int(row))
+        self._case_keys = tuple(keys)
+
+    def _system_group(self, f, system):
+        try:
+            return f['systems'][self._systems[system]]
+        except KeyError:
+            raise KeyError("No cases were recorded for system '%s'." % system)
+
+    def get_column(self, name, kind='u', system=''):
+        """ Returns the history of a variable recorded with the 'variable'
+        layout, without reading any other data.
+
+        Args
+        ----
+        name : str
+            Name of the variable, or 'timestamp' or 'success' for those
+            fields of each case.
+
+        kind : str, optional
+            'u', 'p' or 'r' to get the variable from the unknowns, params or
+            resids. Default is 'u'.
+
+        system : str, optional
+            Pathname of the recording `System`. Default is the root, which is
+            where the driver and the root solvers record.
+
+        Returns
+        -------
+        ndarray
+            The value of the variable in each case recorded by the `System`,
+            in the order they were recorded. Its shape is (number of cases,)
+            plus the shape of the variable.
+        """
+        if self.layout != 'variable':
+            raise RuntimeError("get_column needs a file recorded with the "
+                               "'variable' layout.")
+
+        with h5py.File(self.filename, 'r') as f:
+            grp = self._system_group(f, system)
+            if name in ('timestamp', 'success'):
+                return grp[name][:]
+            try:
+                return grp[_KINDS[kind]][name][...]
+            except KeyError:
+                raise KeyError("Variable '%s' of kind '%s' was not recorded "
+                               "for system '%s'." % (name, kind, system))
+
+    def get_case_ids(self, system=''):
+        """
+        Args
+        ----
+        system : str, optional
+            Pathname of the recording `System`. Default is the root.
+
+        Returns
+        -------
+        list of str
+            Identifiers of the cases recorded by the `System`, in the order of
+            the rows returned by `get_column`.
+        """
+        if self.layout != 'variable':
+            raise RuntimeError("get_case_ids needs a file recorded with the "
+                               "'variable' layout.")
+
+        with h5py.File(self.filename, 'r') as f:
+            return [_to_str(c) for c in self._system_group(f, system)['coord'][:]]
+
     def get_case(self, case_id):
         """
         Parameters
@@ -104,5 +211,18 @@ class HDF5CaseReader(CaseReaderBase):
             _case_id = case_id
 
         with h5py.File(self.filename, 'r') as f:
-            case_dict = _group_to_dict(f[_case_id])
+            if self.layout == 'variable':
+                name, row = self._rows[_case_id]
+                grp = f['systems'][name]
+                case_dict = {
+                    'timestamp': grp['timestamp'][row],
+                    'success': grp['success'][row],
+                    'msg': _to_str(grp['msg'][row]),
+                }
+                for label in ('Parameters', 'Unknowns', 'Residuals'):
+                    if label in grp:
+                        case_dict[label] = dict((key, dset[row]) for key, dset
+                                                in grp[label].items())
+            else:
+                case_dict = _group_to_dict(f[_case_id])
             return Case(self.filename, _case_id, case_dict)
@@ -8,7 +8,7 @@ from six import iteritems
 import numpy as np
 import pickle
 
-from h5py import File
+from h5py import File, special_dtype
 
 from openmdao.recorders.base_recorder import BaseRecorder
 from openmdao.util.record_util import format_iteration_coordinate
@@ -17,11 +17,28 @@ from openmdao.devtools.partition_tree_n2 import get_model_viewer_data
 
 format_version = 4
 
+# labels of the recorded vectors, by the option that turns them on
+_VECTORS = (('record_params', 'Parameters', 'p'),
+            ('record_unknowns', 'Unknowns', 'u'),
+            ('record_resids', 'Residuals', 'r'))
+
+# largest size of a chunk in the 'variable' layout, in bytes
+_MAX_CHUNK_BYTES = 1024*1024
+
+
 class HDF5Recorder(BaseRecorder):
     """
     A recorder that stores data using HDF5. This format naturally handles
     hierarchical data and is a standard for handling large datasets.
 
+    By default, each case is stored in its own HDF5 group, with a dataset for
+    each variable. With the 'variable' layout, each recording `System` gets a
+    group with one extensible dataset per variable, of shape
+    (number of cases,) + shape of the variable, and datasets holding the
+    coordinate, timestamp, success flag and message of each case. Cases are
+    appended to these datasets in place, which keeps the number of objects in
+    the file small and lets the history of a variable be read in one slice.
+
     Args
     ----
     out : str
@@ -44,17 +61,128 @@ class HDF5Recorder(BaseRecorder):
         Patterns for variables to include in recording.
     options['excludes'] :  list of strings
         Patterns for variables to exclude in recording (processed after includes).
+    options['layout'] :  str('iteration')
+        'iteration' to store each case in its own group, or 'variable' to
+        append each variable to its own dataset.
+    options['chunk_rows'] :  int(1024)
+        Number of cases in each chunk of a dataset in the 'variable' layout.
+        Fewer are used for large variables, to keep chunks under 1 MiB.
+    options['compression'] :  str('none')
+        Compression filter of the datasets in the 'variable' layout, one of
+        'none', 'gzip' or 'lzf'.
+    options['compression_opts'] :  int(4)
+        Compression level of the 'gzip' filter, from 0 to 9.
     """
 
     def __init__(self, out, **driver_kwargs):
 
         super(HDF5Recorder, self).__init__()
+
+        self.options.add_option('layout', 'iteration',
+                                values=['iteration', 'variable'],
+                                desc="Set to 'variable' to store each variable "
+                                "in one dataset, with a row per case.")
+        self.options.add_option('chunk_rows', 1024, lower=1,
+                                desc='Number of cases in each chunk of the '
+                                "'variable' layout.")
+        self.options.add_option('compression', 'none',
+                                values=['none', 'gzip', 'lzf'],
+                                desc="Compression filter of the 'variable' "
+                                "layout.")
+        self.options.add_option('compression_opts', 4, lower=0, upper=9,
+                                desc="Compression level of the 'gzip' filter.")
+
         self.out = File(out, 'w', **driver_kwargs)
 
         metadata_group = self.out.require_group('metadata')
 
         metadata_group.create_dataset('format_version', data = format_version)
 
+        # per recording System in the 'variable' layout: its group and a
+        # dict of the datasets appended to for each case
+        self._systems = {}
+        self._derivs = None
+        self._index = None
+
+    def startup(self, group):
+        """ Prepare for a new run.
+
+        Args
+        ----
+        group : `Group`
+            Group that owns this recorder.
+        """
+        super(HDF5Recorder, self).startup(group)
+
+        if self.options['layout'] == 'variable' and self._index is None:
+            self.out['metadata'].create_dataset('layout', data='variable')
+
+            # the global order of the cases, as (system, row) pairs
+            self._index = self.out.create_group('index')
+            self._create_dataset(self._index, 'system', (), np.int32)
+            self._create_dataset(self._index, 'row', (), np.int64)
+            self.out.create_group('systems')
+
+    def _create_dataset(self, group, name, shape, dtype):
+        """ Creates an empty, extensible dataset in group for values of the
+        given shape and dtype, chunked and compressed as set in the options.
+        """
+        row_bytes = max(1, int(np.prod(shape))*np.dtype(dtype).itemsize)
+        chunk_rows = max(1, min(self.options['chunk_rows'],
+                                _MAX_CHUNK_BYTES // row_bytes))
+
+        compression = self.options['compression']
+        kwargs = {}
+        if compression != 'none':
+            kwargs['compression'] = compression
+            if compression == 'gzip':
+                kwargs['compression_opts'] = self.options['compression_opts']
+
+        return group.create_dataset(name, shape=(0,) + shape,
+                                    maxshape=(None,) + shape,
+                                    chunks=(chunk_rows,) + shape,
+                                    dtype=dtype, **kwargs)
+
+    def _append(self, group, name, val, dtype=None):
+        """ Appends val to the extensible dataset of the given name in group,
+        creating the dataset if needed.
+
+        Returns
+        -------
+        int
+            The row of val in the dataset.
+        """
+        dset = group.get(name)
+        if dset is None:
+            if dtype is None:
+                val = np.asarray(val)
+                dset = self._create_dataset(group, name, val.shape, val.dtype)
+            else:
+                dset = self._create_dataset(group, name, (), dtype)
+
+        row = dset.shape[0]
+        dset.resize(row + 1, axis=0)
+        dset[row] = val
+        return row
+
+    def _append_case(self, group, metadata):
+        """ Appends the coordinate, timestamp, success flag and message of a
+        case to the datasets in group.
+
+        Returns
+        -------
+        int
+            The row of the case.
+        """
+        strtype = special_dtype(vlen=str)
+        row = self._append(group, 'coord',
+                           format_iteration_coordinate(metadata['coord']),
+                           dtype=strtype)
+        self._append(group, 'timestamp', float(metadata['timestamp']))
+        self._append(group, 'success', int(metadata['success']))
+        self._append(group, 'msg', metadata['msg'], dtype=strtype)
+        return row
+
     def record_metadata(self, group):
         """Stores the metadata of the given group in a HDF5 file using
         the variable name for the key.
@@ -120,6 +248,11 @@ class HDF5Recorder(BaseRecorder):
         """
 
         iteration_coordinate = metadata['coord']
+
+        if self.options['layout'] == 'variable':
+            self._record_variables(params, unknowns, resids, metadata)
+            return
+
         group_name = format_iteration_coordinate(iteration_coordinate)
 
         f = self.out
@@ -156,6 +289,60 @@ class HDF5Recorder(BaseRecorder):
                     msg = "HDF5 Recorder does not support data of type '{0}'".format(type(val))
                     raise NotImplementedError(msg)
 
+    def _record_variables(self, params, unknowns, resids, metadata):
+        """ Appends a case to the datasets of the recording `System` in the
+        'variable' layout."""
+        iteration_coordinate = metadata['coord']
+        pathname = self._get_pathname(iteration_coordinate)
+        vecs = {'p': params, 'u': unknowns, 'r': resids}
+
+        system = self._systems.get(pathname)
+        if system is None:
+            systems = self.out['systems']
+            group = systems.create_group(str(len(systems)))
+            group.attrs['pathname'] = pathname
+            for option, label, key in _VECTORS:
+                if self.options[option]:
+                    group.create_group(label)
+            system = self._systems[pathname] = (len(self._systems), group)
+
+        num, group = system
+        row = self._append_case(group, metadata)
+
+        for option, label, key in _VECTORS:
+            if not self.options[option]:
+                continue
+            grp = group[label]
+            data = self._filter_vector(vecs[key], key, iteration_coordinate)
+            for name, val in iteritems(data):
+                if not isinstance(val, (np.ndarray, Number)):
+                    msg = "HDF5 Recorder does not support data of type '{0}'".format(type(val))
+                    raise NotImplementedError(msg)
+                self._append(grp, name, val)
+
+        self._append(self._index, 'system', num)
+        self._append(self._index, 'row', row)
+
+    def _record_derivs_variables(self, derivs, metadata):
+        """ Appends derivatives to the datasets of the 'derivs' group in the
+        'variable' layout."""
+        if self._derivs is None:
+            self._derivs = self.out.create_group('derivs')
+        group = self._derivs
+
+        self._append_case(group, metadata)
+
+        if isinstance(derivs, np.ndarray):
+            self._append(group, 'Derivatives', derivs)
+        elif isinstance(derivs, OrderedDict):
+            deriv_data_group = group.require_group('Derivatives')
+            for k, v in derivs.items():
+                g = deriv_data_group.require_group(k)
+                for k2, v2 in v.items():
+                    self._append(g, k2, v2)
+        else:
+            raise ValueError("Currently can only record derivatives that are ndarrays or OrderedDicts")
+
     def record_derivatives(self, derivs, metadata):
         """Writes the derivatives that were calculated for the driver.
 
@@ -168,6 +355,10 @@ class HDF5Recorder(BaseRecorder):
             Dictionary containing execution metadata (e.g. iteration coordinate).
         """
 
+        if self.options['layout'] == 'variable':
+            self._record_derivs_variables(derivs, metadata)
+            return
+
         iteration_coordinate = metadata['coord']
         group_name = format_iteration_coordinate(iteration_coordinate)
 
@@ -1,21 +1,61 @@
 from __future__ import print_function, absolute_import
 
+from collections import OrderedDict
+
+import numpy as np
+from six import iteritems
 from sqlitedict import SqliteDict
 
 from openmdao.recorders.case_reader_base import CaseReaderBase
 from openmdao.recorders.case import Case
 from openmdao.util.record_util import is_valid_sqlite3_db
 
+_KINDS = {'p': 'Parameters', 'u': 'Unknowns', 'r': 'Residuals'}
+
+
+def _source(case_id):
+    """ Returns the iteration coordinate of a case without the iteration
+    counts, e.g. 'rank0:SLSQP|root' for 'rank0:SLSQP|3|root|2'."""
+    return '|'.join(case_id.split('|')[0::2])
+
+
+def _apply_delta(base, delta):
+    """ Returns the full iterations data of a case recorded as a delta of the
+    given full case from the delta_bases table."""
+    case_dict = OrderedDict((k, v) for k, v in iteritems(delta)
+                            if k != 'delta_of')
+    for label in _KINDS.values():
+        if label in delta:
+            vals = OrderedDict(base[label])
+            vals.update(delta[label])
+            case_dict[label] = vals
+    return case_dict
+
 
 class SqliteCaseReader(CaseReaderBase):
     """ A CaseReader specific to files created with SqliteRecorder.
 
+    By default, each call to `get_case` opens the file again. In persistent
+    mode, the reader keeps its connections open until `close` is called, and
+    keeps the most recently read cases in memory, which is much faster when
+    reading many cases.
+
+    Cases recorded with delta recording (see `SqliteRecorder`) are rebuilt
+    from the full case they are a delta of.
+
     Parameters
     ----------
     filename : str
         The path to the filename containing the recorded data.
+
+    persistent : bool, optional
+        If True, keep the connections to the file open and cache recently
+        read cases. Default is False.
+
+    cache_size : int, optional
+        Number of cases kept in memory in persistent mode. Default is 128.
     """
-    def __init__(self, filename):
+    def __init__(self, filename, persistent=False, cache_size=128):
         super(SqliteCaseReader, self).__init__(filename)
 
         if filename is not None:
@@ -26,6 +66,21 @@ class SqliteCaseReader(CaseReaderBase):
         with SqliteDict(self.filename, 'metadata', flag='r') as db:
             self.format_version = db.get('format_version', None)
 
+        self._iter_db = None
+        self._derivs_db = None
+        self._bases_db = None
+        self._has_derivs = None
+        self._cache = OrderedDict()
+        self._cache_size = cache_size if persistent else 0
+
+        # the full cases of delta recording that were read most recently
+        self._bases = OrderedDict()
+
+        if persistent:
+            self._iter_db = SqliteDict(self.filename, 'iterations', flag='r')
+            self._derivs_db = SqliteDict(self.filename, 'derivs', flag='r')
+            self._has_derivs = len(self._derivs_db) > 0
+
         self._load()
 
         self.num_cases = len(self._case_keys)
@@ -38,7 +93,8 @@ class SqliteCaseReader(CaseReaderBase):
         CaseReader.
 
         The `iterations` table is read to load the keys which identify
-        the individual cases/iterations from the recorded file.
+        the individual cases/iterations from the recorded file, and to index
+        them by their iteration coordinate without the iteration counts.
 
         Parameters
         ----------
@@ -52,12 +108,159 @@ class SqliteCaseReader(CaseReaderBase):
                 self._unknowns = db.get('Unknowns', None)
 
             # Store the identifier for each iteration in _case_keys
-            with SqliteDict(self.filename, 'iterations', flag='r') as db:
-                self._case_keys = tuple(db.keys())
+            if self._iter_db is not None:
+                self._case_keys = tuple(self._iter_db.keys())
+            else:
+                with SqliteDict(self.filename, 'iterations', flag='r') as db:
+                    self._case_keys = tuple(db.keys())
         else:
             raise ValueError('SQliteCaseReader encountered an unhandled '
                              'format version: {0}'.format(self.format_version))
 
+        self._case_index = dict((key, i) for i, key in enumerate(self._case_keys))
+
+        # indices of the cases recorded by each driver or solver
+        self._sources = OrderedDict()
+        for i, key in enumerate(self._case_keys):
+            self._sources.setdefault(_source(key), []).append(i)
+
+    def close(self):
+        """ Closes the connections of a persistent reader and empties its
+        cache."""
+        for db in (self._iter_db, self._derivs_db, self._bases_db):
+            if db is not None:
+                db.close()
+        self._iter_db = self._derivs_db = self._bases_db = None
+        self._cache.clear()
+        self._bases.clear()
+        self._cache_size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _case_id(self, case_id):
+        if isinstance(case_id, (int, np.integer)):
+            # If case_id is an integer, assume the user
+            # wants a case as an index
+            return self._case_keys[case_id]
+        # Otherwise assume we were given the case string identifier
+        return case_id
+
+    def list_cases(self, prefix=None, recurse=True):
+        """ Return a tuple of the case string identifiers available in this
+        instance of the CaseReader, in the order they were recorded.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Only return the cases of the driver or solver with this iteration
+            coordinate, without the iteration counts. For example, 'rank0:SLSQP'
+            selects the cases recorded by an SLSQP driver, and
+            'rank0:SLSQP|root' those recorded by the root solver under it.
+
+        recurse : bool, optional
+            If True (the default), also return the cases recorded by the
+            solvers below prefix.
+
+        Returns
+        -------
+        tuple of str
+            The selected case identifiers.
+        """
+        if prefix is None:
+            return self._case_keys
+
+        prefix = prefix.rstrip('|')
+        idxs = []
+        for source, src_idxs in iteritems(self._sources):
+            if source == prefix or \
+               (recurse and source.startswith(prefix + '|')):
+                idxs.extend(src_idxs)
+        idxs.sort()
+        return tuple(self._case_keys[i] for i in idxs)
+
+    def _select(self, cases, prefix, recurse):
+        """ Returns the ids of the cases selected by cases and prefix."""
+        if prefix is not None:
+            keys = self.list_cases(prefix, recurse)
+        else:
+            keys = self._case_keys
+
+        if cases is None:
+            return keys
+        if isinstance(cases, slice):
+            return keys[cases]
+        return [keys[c] if isinstance(c, (int, np.integer)) else c
+                for c in cases]
+
+    def _get_case_data(self, case_id):
+        """ Returns the decoded iterations data and derivatives of a case,
+        using the cache in persistent mode."""
+        try:
+            data = self._cache.pop(case_id)
+        except KeyError:
+            if self._iter_db is not None:
+                case_dict = self._full_case_dict(case_id, self._iter_db)
+                derivs = None
+                if self._has_derivs and case_id in self._derivs_db:
+                    derivs = self._derivs_db[case_id].get('Derivatives', None)
+                data = (case_dict, derivs)
+            else:
+                with SqliteDict(self.filename, 'iterations', flag='r') as iter_db:
+                    case_dict = self._full_case_dict(case_id, iter_db)
+
+                derivs = None
+                with SqliteDict(self.filename, 'derivs', flag='r') as derivs_db:
+                    # If derivs weren't recorded then don't bother sending them
+                    # to the Case.
+                    if len(derivs_db) > 0 and case_id in derivs_db:
+                        derivs = derivs_db[case_id].get('Derivatives', None)
+                data = (case_dict, derivs)
+
+        if self._cache_size > 0:
+            # (re)insert as the most recently used
+            self._cache[case_id] = data
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return data
+
+    def _full_case_dict(self, case_id, iter_db):
+        """ Reads the iterations data of a case, rebuilding it if it was
+        recorded as a delta."""
+        case_dict = iter_db[case_id]
+        if 'delta_of' in case_dict:
+            case_dict = _apply_delta(self._get_base(case_dict['delta_of']),
+                                     case_dict)
+        return case_dict
+
+    def _get_base(self, num, bases_db=None):
+        """ Returns the full case of delta recording with the given number,
+        using the cache in persistent mode."""
+        try:
+            base = self._bases.pop(num)
+        except KeyError:
+            if bases_db is None and self._iter_db is not None:
+                # only files with delta recording have the table
+                if self._bases_db is None:
+                    self._bases_db = SqliteDict(self.filename, 'delta_bases',
+                                                flag='r')
+                bases_db = self._bases_db
+            if bases_db is not None:
+                base = bases_db[str(num)]
+            else:
+                with SqliteDict(self.filename, 'delta_bases', flag='r') as db:
+                    base = db[str(num)]
+
+        if self._cache_size > 0:
+            self._bases[num] = base
+            while len(self._bases) > self._cache_size:
+                self._bases.popitem(last=False)
+        return base
+
     def get_case(self, case_id):
         """
         Parameters
@@ -70,26 +273,120 @@ class SqliteCaseReader(CaseReaderBase):
             An instance of Case populated with data from the
             specified case/iteration.
         """
-        if isinstance(case_id, int):
-            # If case_id is an integer, assume the user
-            # wants a case as an index
-            _case_id = self._case_keys[case_id]
-        else:
-            # Otherwise assume we were given the case string identifier
-            _case_id = case_id
+        _case_id = self._case_id(case_id)
 
         # Initialize the Case object from the iterations data
-        with SqliteDict(self.filename, 'iterations', flag='r') as iter_db:
-            case = Case(self.filename, _case_id, iter_db[_case_id])
+        case_dict, derivs = self._get_case_data(_case_id)
+        case = Case(self.filename, _case_id, case_dict)
 
         # Set the derivs data for the case if available
-        with SqliteDict(self.filename, 'derivs', flag='r') as derivs_db:
-            # If derivs weren't recorded then don't bother sending them
-            # to the Case.
-            if len(derivs_db) == 0:
-                pass
-            else:
-                if _case_id in derivs_db:
-                    case._derivs = derivs_db[_case_id].get('Derivatives', None)
+        if derivs is not None:
+            case._derivs = derivs
 
         return case
+
+    def get_history(self, name, cases=None, prefix=None, recurse=True,
+                    kind='u'):
+        """ Returns the value of a variable in several cases, stacked into
+        one array.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable, or 'timestamp' or 'success' for those
+            fields of each case.
+
+        cases : slice or list, optional
+            The cases to read, as a slice of the selected cases or a list of
+            indices or identifiers. Default is all of the selected cases.
+
+        prefix : str, optional
+            Select the cases recorded by a driver or solver and the solvers
+            below it, as in `list_cases`. Default is all cases.
+
+        recurse : bool, optional
+            If False, don't select the cases of the solvers below prefix.
+            Default is True.
+
+        kind : str, optional
+            'u', 'p' or 'r' to get the variable from the unknowns, params or
+            resids. Default is 'u'.
+
+        Returns
+        -------
+        ndarray
+            The value of the variable in each case, in the order of the
+            cases. Its shape is (number of cases,) plus the shape of the
+            variable.
+        """
+        keys = self._select(cases, prefix, recurse)
+        vals = [None]*len(keys)
+        rows = {}
+        for i, key in enumerate(keys):
+            rows.setdefault(key, []).append(i)
+
+        if len(rows) > self._cache_size:
+            # Read the whole table in one query rather than one per case,
+            # without replacing the cases in the cache.
+            if self._iter_db is not None:
+                items = self._iter_db.iteritems()
+                db = bases_db = None
+            else:
+                db = SqliteDict(self.filename, 'iterations', flag='r')
+                items = db.iteritems()
+                bases_db = None
+            try:
+                # the last full case that each driver or solver made a delta
+                # of, to apply the deltas that follow it to
+                latest = {}
+                found = 0
+                for key, case_dict in items:
+                    if 'delta_of' in case_dict:
+                        num = case_dict['delta_of']
+                        base = latest.get(_source(key))
+                        if base is None or base[0] != num:
+                            if bases_db is None and db is not None:
+                                bases_db = SqliteDict(self.filename,
+                                                      'delta_bases', flag='r')
+                            base = latest[_source(key)] = \
+                                (num, self._get_base(num, bases_db))
+                        case_dict = _apply_delta(base[1], case_dict)
+
+                    if key in rows:
+                        val = self._get_value(case_dict, key, name, kind)
+                        for i in rows[key]:
+                            vals[i] = val
+                        found += 1
+                        if found == len(rows):
+                            break
+            finally:
+                if db is not None:
+                    db.close()
+                if bases_db is not None:
+                    bases_db.close()
+
+            if found < len(rows):
+                missing = [key for key, idxs in iteritems(rows)
+                           if vals[idxs[0]] is None]
+                raise KeyError("Case '%s' was not found." % missing[0])
+        else:
+            for key, idxs in iteritems(rows):
+                case_dict = self._get_case_data(key)[0]
+                val = self._get_value(case_dict, key, name, kind)
+                for i in idxs:
+                    vals[i] = val
+
+        if not vals:
+            return np.zeros(0)
+        return np.array(vals)
+
+    @staticmethod
+    def _get_value(case_dict, case_id, name, kind):
+        """ Returns the value of a variable in the iterations data of a case."""
+        if name in ('timestamp', 'success'):
+            return case_dict[name]
+        try:
+            return case_dict[_KINDS[kind]][name]
+        except (KeyError, TypeError):
+            raise KeyError("Variable '%s' of kind '%s' was not recorded in "
+                           "case '%s'." % (name, kind, case_id))
@@ -1,6 +1,14 @@
 """Class definition for SqliteRecorder, which provides dictionary backed by SQLite"""
 
+import copy
+import sys
+import threading
+import time
 from collections import OrderedDict
+
+import numpy as np
+from six import iteritems, reraise
+from six.moves import queue
 from sqlitedict import SqliteDict
 from openmdao.recorders.base_recorder import BaseRecorder
 from openmdao.util.record_util import format_iteration_coordinate
@@ -12,6 +20,120 @@ from openmdao.core.mpi_wrap import MPI
 
 format_version = 4
 
+
+def _snapshot(val):
+    """ Returns a copy of val that later changes to the model can't modify."""
+    if isinstance(val, np.ndarray):
+        return val.copy()
+    if isinstance(val, dict):
+        return val.__class__((k, _snapshot(v)) for k, v in iteritems(val))
+    if isinstance(val, (float, int, str, bool, type(None))):
+        return val
+    return copy.deepcopy(val)
+
+
+def _changed(val, old, tol):
+    """ Returns True if val differs from the recorded value old by more than
+    tol."""
+    if isinstance(val, (np.ndarray, float, int, np.number)) and \
+       isinstance(old, (np.ndarray, float, int, np.number)):
+        if np.shape(val) != np.shape(old):
+            return True
+        return bool(np.any(np.abs(np.asarray(val) - old) > tol))
+    try:
+        return not (type(val) is type(old) and bool(val == old))
+    except Exception:
+        return True
+
+
+class _SqliteWriter(threading.Thread):
+    """ Thread that takes (table, key, data) items off a queue and writes
+    them in batched transactions.
+
+    Args
+    ----
+    case_queue : Queue
+        Queue of (table, key, data, time queued) tuples. None stops the
+        thread after everything before it has been written.
+
+    batch_size : int
+        Commit after this many cases.
+
+    batch_interval : float
+        Commit cases that have waited this many seconds, even if the
+        batch isn't full.
+    """
+
+    def __init__(self, case_queue, batch_size, batch_interval):
+        super(_SqliteWriter, self).__init__(name='SqliteRecorder writer')
+        self.daemon = True
+        self._queue = case_queue
+        self._batch_size = batch_size
+        self._batch_interval = batch_interval
+
+        self.error = None
+
+        self._lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_commit_time = 0.0
+
+    def run(self):
+        batch = []
+        done = False
+        while not done:
+            timeout = None
+            if batch:
+                timeout = max(0.0, batch[0][3] + self._batch_interval - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if item is None:
+                done = True
+            elif item is not False:
+                batch.append(item)
+                if len(batch) < self._batch_size and \
+                   time.time() - batch[0][3] < self._batch_interval:
+                    continue
+
+            if batch:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch):
+        """ Writes the batch in one transaction per table."""
+        if self.error is not None:
+            return
+
+        t0 = time.time()
+        try:
+            tables = []
+            for table, key, data, queued in batch:
+                table[key] = data
+                if table not in tables:
+                    tables.append(table)
+            for table in tables:
+                table.commit()
+        except Exception:
+            self.error = sys.exc_info()
+            return
+        now = time.time()
+
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+            self.total_commit_time += now - t0
+            for table, key, data, queued in batch:
+                latency = now - queued
+                self.total_latency += latency
+                if latency > self.max_latency:
+                    self.max_latency = latency
+
+
 class SqliteRecorder(BaseRecorder):
     """ Recorder that saves cases in an SQLite dictionary.
 
@@ -36,13 +158,68 @@ class SqliteRecorder(BaseRecorder):
         Patterns for variables to include in recording.
     options['excludes'] :  list of strings
         Patterns for variables to exclude in recording (processed after includes).
+    options['async_write'] :  bool(False)
+        Set to True to write iterations and derivatives in a background
+        thread, committing them in batches. Values are copied when they are
+        recorded, and `close` waits until everything has been written.
+    options['queue_size'] :  int(1000)
+        In async mode, the number of cases that can wait to be written before
+        recording blocks until the writer catches up.
+    options['batch_size'] :  int(100)
+        In async mode, the number of cases committed in one transaction.
+    options['batch_interval'] :  float(1.0)
+        In async mode, the maximum number of seconds a case waits before it
+        is committed, even if its batch isn't full.
+    options['delta_interval'] :  int(0)
+        If greater than zero, each driver or solver records a full case only
+        every delta_interval iterations. Each full case is also copied to the
+        'delta_bases' table under a number that is never reused, so it stays
+        there if a later run replaces the case. The cases in between only
+        hold the variables that differ from the last full case, and a
+        'delta_of' key with its number. `SqliteCaseReader` rebuilds the full
+        cases. Zero records every variable in every case.
+    options['delta_tol'] :  float(0.0)
+        In delta recording, a variable is recorded when any of its entries
+        differs from its value in the last full case by more than this.
     """
 
     def __init__(self, out, **sqlite_dict_args):
         super(SqliteRecorder, self).__init__()
 
+        self.options.add_option('async_write', False,
+                                desc='Set to True to write cases in a '
+                                'background thread')
+        self.options.add_option('queue_size', 1000, lower=1,
+                                desc='Maximum number of cases waiting to be '
+                                'written in async mode')
+        self.options.add_option('batch_size', 100, lower=1,
+                                desc='Number of cases per transaction in '
+                                'async mode')
+        self.options.add_option('batch_interval', 1.0, lower=0.0,
+                                desc='Maximum seconds a case waits to be '
+                                'committed in async mode')
+        self.options.add_option('delta_interval', 0, lower=0,
+                                desc='Number of iterations between full '
+                                'cases in delta recording, or 0 to record '
+                                'full cases only')
+        self.options.add_option('delta_tol', 0.0, lower=0.0,
+                                desc='Change in a variable that is recorded '
+                                'in delta recording')
+
+        # per recording driver or solver in delta recording: the number of
+        # its last full case in the delta_bases table, the number of cases
+        # since then and the values of that case for each vector
+        self._deltas = {}
+        self._num_bases = 0
+
         self.model_viewer_data = None
 
+        self._queue = None
+        self._writer = None
+        self._queued = 0
+        self._max_depth = 0
+        self._blocked_time = 0.0
+
         if MPI and MPI.COMM_WORLD.rank > 0 :
             self._open_close_sqlitedict = False
         else:
@@ -54,11 +231,13 @@ class SqliteRecorder(BaseRecorder):
             self.out_metadata['format_version'] = format_version
             self.out_iterations = SqliteDict(filename=out, flag='w', tablename='iterations', **sqlite_dict_args)
             self.out_derivs = SqliteDict(filename=out, flag='w', tablename='derivs', **sqlite_dict_args)
+            self.out_bases = SqliteDict(filename=out, flag='w', tablename='delta_bases', **sqlite_dict_args)
 
         else:
             self.out_metadata = None
             self.out_iterations = None
             self.out_derivs = None
+            self.out_bases = None
 
     def startup(self, group):
         super(SqliteRecorder, self).startup(group)
@@ -70,6 +249,79 @@ class SqliteRecorder(BaseRecorder):
         #   need to participate in that collective call
         self.model_viewer_data = get_model_viewer_data(group)
 
+        # the variables recorded may have changed, so start over with full
+        # cases
+        self._deltas = {}
+
+        if self.options['async_write'] and self._open_close_sqlitedict and \
+           self._writer is None:
+            self.out_iterations.autocommit = False
+            self.out_derivs.autocommit = False
+            self.out_bases.autocommit = False
+            self._queue = queue.Queue(self.options['queue_size'])
+            self._writer = _SqliteWriter(self._queue, self.options['batch_size'],
+                                         self.options['batch_interval'])
+            self._writer.start()
+
+    def _write(self, table, key, data):
+        """ Writes data to the table, or queues it for the writer thread."""
+        if self._writer is None:
+            table[key] = data
+            return
+
+        writer = self._writer
+        if writer.error is not None:
+            reraise(*writer.error)
+
+        item = (table, key, _snapshot(data), time.time())
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            t0 = time.time()
+            self._queue.put(item)
+            self._blocked_time += time.time() - t0
+
+        self._queued += 1
+        depth = self._queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+    def get_stats(self):
+        """
+        Returns
+        -------
+        dict
+            Statistics of the background writer in async mode: 'queued' and
+            'written' (number of cases), 'batches' (number of commits),
+            'queue_depth' (cases waiting now), 'max_queue_depth',
+            'blocked_time' (seconds recording waited for a full queue),
+            'mean_latency' and 'max_latency' (seconds from recording a case
+            to committing it) and 'mean_commit_time' (seconds per batch).
+        """
+        writer = self._writer
+        stats = {
+            'queued': self._queued,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'max_queue_depth': self._max_depth,
+            'blocked_time': self._blocked_time,
+            'written': 0,
+            'batches': 0,
+            'mean_latency': 0.0,
+            'max_latency': 0.0,
+            'mean_commit_time': 0.0,
+        }
+        if writer is not None:
+            with writer._lock:
+                stats['written'] = writer.written
+                stats['batches'] = writer.batches
+                stats['max_latency'] = writer.max_latency
+                if writer.written:
+                    stats['mean_latency'] = writer.total_latency / writer.written
+                if writer.batches:
+                    stats['mean_commit_time'] = \
+                        writer.total_commit_time / writer.batches
+        return stats
+
     def record_metadata(self, group):
         """Stores the metadata of the given group in a sqlite file using
         the variable name for the key.
@@ -133,7 +385,42 @@ class SqliteRecorder(BaseRecorder):
         if self.options['record_resids']:
             data['Residuals'] = self._filter_vector(resids, 'r', iteration_coordinate)
 
-        self.out_iterations[group_name] = data
+        if self.options['delta_interval'] > 0:
+            self._make_delta(iteration_coordinate, group_name, data)
+
+        self._write(self.out_iterations, group_name, data)
+
+    def _make_delta(self, iteration_coordinate, group_name, data):
+        """ Removes the variables that haven't changed since the last full
+        case recorded by the same driver or solver from data, unless a full
+        case is due, in which case it is copied to the delta_bases table."""
+        source = tuple(iteration_coordinate[1::2])
+        tol = self.options['delta_tol']
+        labels = [label for label in ('Parameters', 'Unknowns', 'Residuals')
+                  if label in data]
+
+        delta = self._deltas.get(source)
+        if delta is None or delta['count'] >= self.options['delta_interval']:
+            base = dict((label, data[label]) for label in labels)
+            self._write(self.out_bases, str(self._num_bases), base)
+            delta = self._deltas[source] = {
+                'base': self._num_bases,
+                'count': 0,
+                'vals': dict((label, dict((n, _snapshot(v)) for n, v in
+                                          iteritems(data[label])))
+                             for label in labels),
+            }
+            self._num_bases += 1
+        else:
+            for label in labels:
+                base = delta['vals'][label]
+                data[label] = OrderedDict((name, val) for name, val in
+                                          iteritems(data[label])
+                                          if name not in base or
+                                          _changed(val, base[name], tol))
+            data['delta_of'] = delta['base']
+
+        delta['count'] += 1
 
     def record_derivatives(self, derivs, metadata):
         """Writes the derivatives that were calculated for the driver.
@@ -158,11 +445,25 @@ class SqliteRecorder(BaseRecorder):
         data['msg'] = metadata['msg']
         data['Derivatives'] = derivs
 
-        self.out_derivs[group_name] = data
+        self._write(self.out_derivs, group_name, data)
 
     def close(self):
-        """Closes `out`"""
-
+        """Closes `out`, after writing any cases still queued in async
+        mode."""
+
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join()
+
+        try:
+            if writer is not None and writer.error is not None:
+                reraise(*writer.error)
+        finally:
+            self._close_tables()
+
+    def _close_tables(self):
+        """Closes the tables."""
         if self._open_close_sqlitedict:
             if self.out_metadata is not None:
                 self.out_metadata.close()
@@ -173,3 +474,6 @@ class SqliteRecorder(BaseRecorder):
             if self.out_derivs is not None:
                 self.out_derivs.close()
                 self.out_derivs = None
+            if self.out_bases is not None:
+                self.out_bases.close()
+                self.out_bases = None
@@ -0,0 +1,167 @@
+""" Unit tests for the ColumnarRecorder and ColumnarCaseReader. """
+
+import errno
+import json
+import os
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from openmdao.api import Problem, ScipyOptimizer, SqliteRecorder, \
+                         ColumnarRecorder, CaseReader
+from openmdao.recorders.columnar_reader import ColumnarCaseReader
+from openmdao.recorders.columnar_recorder import INDEX_FILE
+from openmdao.test.sellar import SellarDerivativesGrouped
+
+
+class TestColumnarRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.dirname = os.path.join(self.dir, "columnar_test")
+        self.filename = os.path.join(self.dir, "sqlite_test")
+
+    def tearDown(self):
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def _problem(self, recorders):
+        prob = Problem()
+        prob.root = SellarDerivativesGrouped()
+
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['tol'] = 1.0e-8
+        prob.driver.options['disp'] = False
+
+        prob.driver.add_desvar('z', lower=np.array([-10.0, 0.0]),
+                               upper=np.array([10.0, 10.0]))
+        prob.driver.add_desvar('x', lower=0.0, upper=10.0)
+
+        prob.driver.add_objective('obj')
+        prob.driver.add_constraint('con1', upper=0.0)
+        prob.driver.add_constraint('con2', upper=0.0)
+
+        for recorder in recorders:
+            recorder.options['record_params'] = True
+            recorder.options['record_resids'] = True
+            recorder.options['excludes'] = ['mda.*']
+            prob.driver.add_recorder(recorder)
+            prob.root.nl_solver.add_recorder(recorder)
+            prob.root.mda.nl_solver.add_recorder(recorder)
+
+        prob.setup(check=False)
+        return prob
+
+    def test_same_as_sqlite(self):
+        sqlite = SqliteRecorder(self.filename)
+        columnar = ColumnarRecorder(self.dirname)
+        prob = self._problem([sqlite, columnar])
+        prob.run()
+        prob.cleanup()
+
+        expected = CaseReader(self.filename)
+        reader = CaseReader(self.dirname)
+        self.assertTrue(isinstance(reader, ColumnarCaseReader))
+
+        self.assertEqual(reader.list_cases(), expected.list_cases())
+        self.assertTrue(reader.num_cases > 10)
+
+        for case_id in expected.list_cases():
+            case = reader.get_case(case_id)
+            ref = expected.get_case(case_id)
+            self.assertEqual(case.timestamp, ref.timestamp)
+            self.assertEqual(case.success, ref.success)
+            self.assertEqual(case.msg, ref.msg)
+            for attr in ('parameters', 'unknowns', 'resids'):
+                vals = getattr(case, attr)
+                ref_vals = getattr(ref, attr)
+                self.assertEqual(sorted(vals), sorted(ref_vals))
+                for name, val in ref_vals.items():
+                    assert_allclose(vals[name], val)
+
+        # history of a variable, across the driver and root solver cases
+        case_ids = reader.get_case_ids()
+        self.assertTrue(all('mda' not in c for c in case_ids))
+        z = reader.get_column('z')
+        self.assertTrue(isinstance(z.base, np.memmap) or
+                        isinstance(z, np.memmap))
+        self.assertEqual(z.shape, (len(case_ids), 2))
+        assert_allclose(z, [expected.get_case(c)['z'] for c in case_ids])
+
+        obj = reader.get_column('obj')
+        self.assertEqual(obj.shape, (len(case_ids),))
+        assert_allclose(obj, [expected.get_case(c)['obj'] for c in case_ids])
+
+        resid = reader.get_column('y1', kind='r', system='mda')
+        mda_ids = reader.get_case_ids('mda')
+        self.assertEqual(len(mda_ids) + len(case_ids), reader.num_cases)
+        assert_allclose(resid, [expected.get_case(c).resids['y1']
+                                for c in mda_ids])
+
+        self.assertEqual(reader.get_column('success').tolist(),
+                         [1.0]*len(case_ids))
+
+        with self.assertRaises(KeyError) as cm:
+            reader.get_column('z', kind='p')
+        self.assertEqual(str(cm.exception), "\"Variable 'z' of kind 'p' was "
+                         "not recorded for system ''.\"")
+
+    def test_setup_again_appends(self):
+        recorder = ColumnarRecorder(self.dirname)
+        prob = self._problem([recorder])
+        prob.run()
+        prob.cleanup()
+        num_cases = CaseReader(self.dirname).num_cases
+
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+
+        reader = CaseReader(self.dirname)
+        self.assertEqual(len(reader.get_column('success')) +
+                         len(reader.get_column('success', system='mda')),
+                         2*num_cases)
+        self.assertEqual(len(reader.get_case_ids()) +
+                         len(reader.get_case_ids('mda')), 2*num_cases)
+
+
+        # a new recorder in the same directory starts over
+        recorder = ColumnarRecorder(self.dirname)
+        self.assertEqual(sorted(os.listdir(self.dirname)), [])
+
+    def test_read_while_recording(self):
+        recorder = ColumnarRecorder(self.dirname)
+        prob = self._problem([recorder])
+        prob.run()
+
+        # every case in the index so far can be read back
+        reader = CaseReader(self.dirname)
+        for case_id in reader.list_cases():
+            reader.get_case(case_id)
+        prob.cleanup()
+
+        # an index line whose row hasn't reached the disk is ignored
+        index_file = os.path.join(self.dirname, INDEX_FILE)
+        with open(index_file) as f:
+            fname, row, case_id, msg = json.loads(f.readlines()[-1])
+        with open(index_file, 'a') as f:
+            f.write(json.dumps([fname, row + 1, 'rank0:SLSQP|999', msg]))
+            f.write('\n')
+
+        reader = CaseReader(self.dirname)
+        self.assertTrue('rank0:SLSQP|999' not in reader.list_cases())
+        self.assertEqual(len(reader.get_column('success', system='')) +
+                         len(reader.get_column('success', system='mda')),
+                         reader.num_cases)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -466,6 +466,56 @@ class TestHDF5Recorder(unittest.TestCase):
 
         self.assertIterationDataRecorded(expected, self.eps)
 
+    def test_variable_layout(self):
+        prob = Problem()
+        prob.root = ExampleGroup()
+        prob.root.G2.G1.nl_solver.add_recorder(self.recorder)
+        prob.driver.add_recorder(self.recorder)
+        self.recorder.options['record_params'] = True
+        self.recorder.options['record_resids'] = True
+        self.recorder.options['layout'] = 'variable'
+        self.recorder.options['chunk_rows'] = 16
+        self.recorder.options['compression'] = 'gzip'
+        prob.setup(check=False)
+        t0, t1 = run_problem(prob)
+        prob.run()
+        prob.cleanup() # closes recorders
+
+        hdf = h5py.File(self.filename, 'r')
+        self.assertEqual(hdf['metadata']['layout'][()], 'variable')
+
+        systems = dict((grp.attrs['pathname'], grp)
+                       for grp in hdf['systems'].values())
+        self.assertEqual(sorted(systems), ['', 'G2.G1'])
+
+        driver = systems['']
+        self.assertEqual(list(driver['coord'][:]),
+                         ['rank0:Driver|1', 'rank0:Driver|2'])
+        np.testing.assert_equal(driver['success'][:], [1, 1])
+        self.assertTrue(t0 <= driver['timestamp'][0] <= t1)
+        self.assertEqual(list(driver['msg'][:]), ['', ''])
+
+        dset = driver['Unknowns']['G3.C4.y']
+        self.assertEqual(dset.shape, (2,))
+        self.assertEqual(dset.maxshape, (None,))
+        self.assertEqual(dset.chunks, (16,))
+        self.assertEqual(dset.compression, 'gzip')
+        np.testing.assert_equal(dset[:], [40.0, 40.0])
+        np.testing.assert_equal(driver['Parameters']['G3.C3.x'][:], [10.0, 10.0])
+        np.testing.assert_equal(driver['Residuals']['G2.C1.x'][:], [0.0, 0.0])
+
+        solver = systems['G2.G1']
+        self.assertEqual(solver['coord'][0],
+                         'rank0:Driver|1|root|1|G2|1|G1|1')
+        self.assertEqual(sorted(solver['Unknowns']), ['C2.y'])
+        np.testing.assert_equal(solver['Unknowns']['C2.y'][:], [10.0, 10.0])
+
+        # the global order of the cases
+        names = [hdf['systems'][str(i)].attrs['pathname']
+                 for i in hdf['index']['system'][:]]
+        self.assertEqual(names, ['G2.G1', '', 'G2.G1', ''])
+        np.testing.assert_equal(hdf['index']['row'][:], [0, 0, 1, 1])
+
     def test_driver_records_metadata(self):
         prob = Problem()
         prob.root = ConvergeDiverge()
@@ -43,7 +43,8 @@ optimizers = {'scipy': ScipyOptimizer,
 
 def _setup_test_case(case, record_params=True, record_resids=True,
                      record_unknowns=True, record_derivs=True,
-                     record_metadata=True, optimizer='scipy'):
+                     record_metadata=True, optimizer='scipy',
+                     layout='iteration'):
     case.dir = mkdtemp()
     case.filename = os.path.join(case.dir, "hdf5_test")
     case.recorder = HDF5Recorder(case.filename)
@@ -70,6 +71,7 @@ def _setup_test_case(case, record_params=True, record_resids=True,
     case.recorder.options['record_unknowns'] = record_unknowns
     case.recorder.options['record_metadata'] = record_metadata
     case.recorder.options['record_derivs'] = record_derivs
+    case.recorder.options['layout'] = layout
     prob.setup(check=False)
 
     prob['p1.xy'][0] = 10.0
@@ -251,6 +253,61 @@ class TestHDF5CaseReaderNoDerivs(TestHDF5CaseReader):
                           "Case erroneously contains derivs.")
 
 
+@unittest.skipIf(NO_HDF5, 'HDF5Reader tests skipped.  HDF5 not available.')
+class TestHDF5CaseReaderVariableLayout(unittest.TestCase):
+
+    def setUp(self):
+        _setup_test_case(self, record_params=True, record_metadata=True,
+                         record_derivs=True, record_resids=False,
+                         record_unknowns=True, optimizer='scipy',
+                         layout='variable')
+
+    def tearDown(self):
+        os.chdir(self.original_path)
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def test_cases(self):
+        """ Tests that cases are read from the datasets of each variable. """
+        cr = CaseReader(self.filename)
+        self.assertEqual(cr.layout, 'variable')
+        self.assertEqual(cr.format_version, format_version)
+        self.assertTrue(cr.num_cases > 1)
+        self.assertEqual(cr.list_cases(), tuple(cr.get_case_ids()))
+        self.assertEqual(cr.list_cases()[0], 'rank0:SLSQP|1')
+        self.assertTrue(all(isinstance(c, str) for c in cr.get_case_ids()))
+
+        xy = cr.get_column('p1.xy')
+        f_xy = cr.get_column('p.f_xy')
+        x = cr.get_column('p.x', kind='p')
+        self.assertEqual(xy.shape, (cr.num_cases, 2))
+        self.assertEqual(f_xy.shape, (cr.num_cases,))
+        np.testing.assert_equal(cr.get_column('success'),
+                                np.ones(cr.num_cases))
+
+        for i in (0, -1):
+            case = cr.get_case(i)
+            self.assertEqual(case.case_id, cr.list_cases()[i])
+            self.assertEqual(case.success, 1)
+            self.assertEqual(case.msg, '')
+            np.testing.assert_equal(case['p1.xy'], xy[i])
+            np.testing.assert_equal(case['p.f_xy'], f_xy[i])
+            np.testing.assert_equal(case.parameters['p.x'], x[i])
+            self.assertIsNone(case.resids)
+
+        np.testing.assert_almost_equal(xy[-1], [3.5, -1.0],
+                                       decimal=5)
+
+        with self.assertRaises(KeyError) as cm:
+            cr.get_column('p.f_xy', kind='r')
+        self.assertEqual(str(cm.exception), '"Variable \'p.f_xy\' of kind '
+                         '\'r\' was not recorded for system \'\'."')
+
+
 @unittest.skipIf(pyOptSparseDriver is None, 'pyOptSparse not available.')
 @unittest.skipIf(slsqp is None, 'pyOptSparse SLSQP not available.')
 @unittest.skipIf(NO_HDF5, 'HDF5Reader tests skipped.  HDF5 not available.')
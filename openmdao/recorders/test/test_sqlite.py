@@ -16,7 +16,7 @@ from sqlitedict import SqliteDict
 import numpy as np
 from numpy.testing import assert_allclose
 
-from openmdao.api import Problem, SqliteRecorder, ScipyOptimizer
+from openmdao.api import Problem, SqliteRecorder, ScipyOptimizer, IndepVarComp
 from openmdao.core.vec_wrapper import _ByObjWrapper
 from openmdao.test.converge_diverge import ConvergeDiverge
 from openmdao.test.example_groups import ExampleGroup
@@ -25,6 +25,7 @@ from openmdao.test.util import assert_rel_error, set_pyoptsparse_opt
 from openmdao.util.record_util import format_iteration_coordinate
 
 from openmdao.recorders.sqlite_recorder import format_version
+from openmdao.recorders.sqlite_reader import SqliteCaseReader
 
 # check that pyoptsparse is installed
 # if it is, try to use SNOPT but fall back to SLSQP
@@ -675,5 +676,161 @@ class TestSqliteRecorder(unittest.TestCase):
         assert_rel_error(self, J1[2][1], 1.0775421, .00001)
         assert_rel_error(self, J1[2][2], 0.09692762, .00001)
 
+    def _sellar_opt(self, recorder):
+        prob = Problem()
+        prob.root = SellarDerivativesGrouped()
+
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['tol'] = 1.0e-8
+        prob.driver.options['disp'] = False
+
+        prob.driver.add_desvar('z', lower=np.array([-10.0, 0.0]),
+                             upper=np.array([10.0, 10.0]))
+        prob.driver.add_desvar('x', lower=0.0, upper=10.0)
+
+        prob.driver.add_objective('obj')
+        prob.driver.add_constraint('con1', upper=0.0)
+        prob.driver.add_constraint('con2', upper=0.0)
+
+        prob.driver.add_recorder(recorder)
+        prob.root.nl_solver.add_recorder(recorder)
+        recorder.options['record_params'] = True
+        recorder.options['record_resids'] = True
+        return prob
+
+    def _run_sellar_opt(self, recorder):
+        prob = self._sellar_opt(recorder)
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+
+    def test_async_write(self):
+        self._run_sellar_opt(self.recorder)
+
+        async_filename = os.path.join(self.dir, "sqlite_async_test")
+        recorder = SqliteRecorder(async_filename)
+        recorder.options['record_metadata'] = False
+        recorder.options['async_write'] = True
+        recorder.options['queue_size'] = 2
+        recorder.options['batch_size'] = 5
+        self._run_sellar_opt(recorder)
+
+        stats = recorder.get_stats()
+        self.assertEqual(stats['written'], stats['queued'])
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertTrue(stats['max_queue_depth'] <= 2)
+        self.assertTrue(stats['batches'] >= stats['written'] // 5)
+        self.assertTrue(stats['max_latency'] >= stats['mean_latency'] > 0.0)
+
+        for table in (self.tablename_iterations, self.tablename_derivs):
+            with SqliteDict(self.filename, table, flag='r') as expected:
+                with SqliteDict(async_filename, table, flag='r') as actual:
+                    self.assertEqual(sorted(actual.keys()),
+                                     sorted(expected.keys()))
+                    for key, case in iteritems(expected):
+                        for label, val in iteritems(case):
+                            if label == 'timestamp':
+                                continue
+                            if label == 'Derivatives':
+                                assert_allclose(actual[key][label], val)
+                            elif isinstance(val, dict):
+                                for name, v in iteritems(val):
+                                    assert_allclose(actual[key][label][name], v)
+                            else:
+                                self.assertEqual(actual[key][label], val)
+
+        self.assertTrue(stats['queued'] > 20)
+
+    def test_delta_record(self):
+        self._run_sellar_opt(self.recorder)
+
+        delta_filename = os.path.join(self.dir, "sqlite_delta_test")
+        recorder = SqliteRecorder(delta_filename)
+        recorder.options['record_metadata'] = False
+        recorder.options['delta_interval'] = 3
+        self._run_sellar_opt(recorder)
+
+        # a full case every 3 cases of each driver or solver, and the
+        # changed variables in between
+        sources = {}
+        nfull = ndelta = nsame = 0
+        with SqliteDict(delta_filename, self.tablename_iterations,
+                        flag='r') as db:
+            for key, case in iteritems(db):
+                source = '|'.join(key.split('|')[0::2])
+                count = sources.get(source, 0)
+                sources[source] = count + 1
+                if count % 3 == 0:
+                    self.assertTrue('delta_of' not in case)
+                    nfull += 1
+                else:
+                    self.assertTrue('delta_of' in case)
+                    self.assertTrue(0 <= case['delta_of'] < nfull)
+                    if 'x' not in case['Unknowns']:
+                        nsame += 1
+                    ndelta += 1
+                self.assertTrue(case['Unknowns'])
+        self.assertTrue(ndelta > nfull > 2)
+
+        # x only changes between iterations of the driver
+        self.assertTrue(nsame > 0)
+
+        expected = SqliteCaseReader(self.filename)
+        for persistent in (False, True):
+            actual = SqliteCaseReader(delta_filename, persistent=persistent,
+                                      cache_size=2)
+            self.assertEqual(actual.list_cases(), expected.list_cases())
+            for i in range(expected.num_cases):
+                exp_case = expected.get_case(i)
+                case = actual.get_case(i)
+                for label in ('parameters', 'unknowns', 'resids'):
+                    exp_vals = getattr(exp_case, label)
+                    vals = getattr(case, label)
+                    self.assertEqual(sorted(vals), sorted(exp_vals))
+                    for name, val in iteritems(exp_vals):
+                        assert_allclose(vals[name], val)
+
+            for name in ('y1', 'z'):
+                assert_allclose(actual.get_history(name),
+                                expected.get_history(name))
+            actual.close()
+
+    def test_delta_record_run_again(self):
+        # The second run is shorter, with a different value of c, and
+        # replaces only some of the cases of the first.
+        filenames = [self.filename,
+                     os.path.join(self.dir, "sqlite_delta_test")]
+        for filename in filenames:
+            recorder = SqliteRecorder(filename)
+            if filename != self.filename:
+                recorder.options['delta_interval'] = 100
+            prob = self._sellar_opt(recorder)
+            prob.root.add('c', IndepVarComp('c', 1.0))
+            prob.setup(check=False)
+            prob.run()
+            prob['c.c'] = 5.0
+            prob.run()
+            prob.cleanup()
+
+        expected = SqliteCaseReader(self.filename)
+        self.assertEqual(expected.get_case('rank0:SLSQP|1')['c.c'], 5.0)
+        self.assertEqual(expected.get_case('rank0:SLSQP|5')['c.c'], 1.0)
+
+        for persistent in (False, True):
+            actual = SqliteCaseReader(filenames[1], persistent=persistent)
+            self.assertEqual(actual.list_cases(), expected.list_cases())
+            for case_id in expected.list_cases():
+                exp_vals = expected.get_case(case_id).unknowns
+                vals = actual.get_case(case_id).unknowns
+                self.assertEqual(sorted(vals), sorted(exp_vals))
+                for name, val in iteritems(exp_vals):
+                    assert_allclose(vals[name], val)
+
+            for name in ('c.c', 'y1', 'z'):
+                assert_allclose(actual.get_history(name),
+                                expected.get_history(name))
+            actual.close()
+
 if __name__ == "__main__":
     unittest.main()
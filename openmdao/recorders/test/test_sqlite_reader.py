@@ -40,7 +40,8 @@ optimizers = {'scipy': ScipyOptimizer,
 
 def _setup_test_case(case, record_params=True, record_resids=True,
                      record_unknowns=True, record_derivs=True,
-                     record_metadata=True, optimizer='scipy'):
+                     record_metadata=True, optimizer='scipy',
+                     record_solver=False):
     case.dir = mkdtemp()
     case.filename = os.path.join(case.dir, "sqlite_test")
     case.recorder = SqliteRecorder(case.filename)
@@ -62,6 +63,8 @@ def _setup_test_case(case, record_params=True, record_resids=True,
     prob.driver.add_objective('p.f_xy', scaler=1.0, adder=0.0)
 
     prob.driver.add_recorder(case.recorder)
+    if record_solver:
+        root.nl_solver.add_recorder(case.recorder)
     case.recorder.options['record_params'] = record_params
     case.recorder.options['record_resids'] = record_resids
     case.recorder.options['record_unknowns'] = record_unknowns
@@ -227,6 +230,92 @@ class TestSqliteCaseReaderNoDerivs(TestSqliteCaseReader):
                           "Case erroneously contains derivs.")
 
 
+class TestSqliteCaseReaderPersistent(unittest.TestCase):
+
+    def setUp(self):
+        _setup_test_case(self, record_params=True, record_metadata=True,
+                         record_derivs=True, record_resids=True,
+                         record_unknowns=True, optimizer='scipy',
+                         record_solver=True)
+
+    def tearDown(self):
+        os.chdir(self.original_path)
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def test_get_case(self):
+        """ Tests that a persistent reader returns the same cases. """
+        ref = SqliteCaseReader(self.filename)
+        with SqliteCaseReader(self.filename, persistent=True,
+                              cache_size=2) as cr:
+            self.assertEqual(cr.list_cases(), ref.list_cases())
+            for i in list(range(cr.num_cases)) + [0, -1, -1]:
+                case = cr.get_case(i)
+                ref_case = ref.get_case(i)
+                self.assertEqual(case.case_id, ref_case.case_id)
+                self.assertEqual(case.timestamp, ref_case.timestamp)
+                for key, val in ref_case.unknowns.items():
+                    np.testing.assert_equal(case[key], val)
+                for key, val in ref_case.parameters.items():
+                    np.testing.assert_equal(case.parameters[key], val)
+
+            # the most recently used cases are cached
+            self.assertEqual(list(cr._cache), [cr.list_cases()[0],
+                                               cr.list_cases()[-1]])
+
+        self.assertIsNone(cr._iter_db)
+
+    def test_list_cases(self):
+        """ Tests selecting driver and solver cases by coordinate prefix. """
+        cr = SqliteCaseReader(self.filename)
+        driver = cr.list_cases('rank0:SLSQP', recurse=False)
+        solver = cr.list_cases('rank0:SLSQP|root')
+
+        self.assertTrue(len(driver) > 1)
+        self.assertEqual(len(solver), len(driver) + 1)
+        self.assertEqual(driver[:2], ('rank0:SLSQP|1', 'rank0:SLSQP|2'))
+        self.assertEqual(solver[:2], ('rank0:SLSQP|0|root|1',
+                                      'rank0:SLSQP|1|root|2'))
+        self.assertEqual(sorted(cr.list_cases('rank0:SLSQP')),
+                         sorted(driver + solver))
+        self.assertEqual(cr.list_cases('rank0:SLSQP|root|sub'), ())
+
+    def test_get_history(self):
+        """ Tests reading the values of a variable from many cases. """
+        for persistent in (False, True):
+            cr = SqliteCaseReader(self.filename, persistent=persistent,
+                                  cache_size=3)
+            driver = cr.list_cases('rank0:SLSQP', recurse=False)
+
+            xy = cr.get_history('p1.xy', prefix='rank0:SLSQP')
+            self.assertEqual(xy.shape, (cr.num_cases, 2))
+            for i, case_id in enumerate(cr.list_cases()):
+                np.testing.assert_equal(xy[i], cr.get_case(case_id)['p1.xy'])
+
+            f_xy = cr.get_history('p.f_xy', prefix='rank0:SLSQP',
+                                  recurse=False, cases=slice(1, None))
+            expected = [cr.get_case(case_id)['p.f_xy'] for case_id in driver[1:]]
+            np.testing.assert_equal(f_xy, expected)
+
+            x = cr.get_history('p.x', kind='p', cases=[driver[-1], 0])
+            np.testing.assert_equal(x, [cr.get_case(-1).parameters['p.x'],
+                                        cr.get_case(0).parameters['p.x']])
+
+            np.testing.assert_equal(cr.get_history('success'),
+                                    np.ones(cr.num_cases))
+
+            with self.assertRaises(KeyError) as cm:
+                cr.get_history('p.x')
+            self.assertEqual(str(cm.exception), '"Variable \'p.x\' of kind '
+                             '\'u\' was not recorded in case \'%s\'."' %
+                             cr.list_cases()[0])
+            cr.close()
+
+
 @unittest.skipIf(pyOptSparseDriver is None, 'pyOptSparse not available.')
 @unittest.skipIf(slsqp is None, 'pyOptSparse SLSQP not available.')
 class TestSqliteCaseReaderPyOptSparse(TestSqliteCaseReader):
@@ -6,6 +6,7 @@ from collections import OrderedDict
 
 import numpy as np
 from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu, spsolve
 
 from openmdao.solvers.solver_base import MultLinearSolver
 
@@ -29,9 +30,24 @@ class DirectSolver(MultLinearSolver):
         Jacobian by calling apply_linear with columns of identity. Select
         'assemble' to build the Jacobian by taking the calculated Jacobians in
         each component and placing them directly into a clean identity matrix.
+    options['jacobian_format'] : str('dense')
+        Storage used for the assembled Jacobian. Select 'sparse' to store
+        only the nonzero entries in a scipy.sparse CSC matrix and factor it
+        with scipy.sparse.linalg.splu. Only used when jacobian_method is
+        'assemble'.
+    options['reuse_symbolic'] :  bool(False)
+        Only used when jacobian_format is 'sparse'. Set to True to keep the
+        fill-reducing column ordering from the first factorization and reuse
+        it for every later linearization, skipping the symbolic analysis.
+    options['simul_coloring'] :  bool(False)
+        Only used on the root solver. Set to True to detect the sparsity of
+        the total Jacobian the first time calc_gradient is called and
+        afterwards solve for all structurally orthogonal columns (fwd) or
+        rows (rev) with a single right-hand side.
     options['solve_method'] : str('LU')
         Solution method, either 'solve' for linalg.solve, or 'LU' for
-        linalg.lu_factor and linalg.lu_solve.
+        linalg.lu_factor and linalg.lu_solve. With a sparse Jacobian these are
+        scipy.sparse.linalg.spsolve and scipy.sparse.linalg.splu.
     """
 
     def __init__(self):
@@ -50,14 +66,32 @@ class DirectSolver(MultLinearSolver):
                                 "'assemble' to build the Jacobian by taking the " +
                                 "calculated Jacobians in each component and placing " +
                                 "them directly into a clean identity matrix.")
+        self.options.add_option('jacobian_format', 'dense', values=['dense', 'sparse'],
+                                desc="Storage used for the assembled Jacobian. " +
+                                "Select 'sparse' to store only the nonzero entries " +
+                                "in a scipy.sparse CSC matrix and factor it with " +
+                                "scipy.sparse.linalg.splu. Only used when " +
+                                "jacobian_method is 'assemble'.")
+        self.options.add_option('reuse_symbolic', False,
+                                desc="Only used when jacobian_format is 'sparse'. " +
+                                "Set to True to keep the fill-reducing column " +
+                                "ordering from the first factorization and reuse it " +
+                                "for every later linearization, skipping the " +
+                                "symbolic analysis.")
         self.options.add_option('solve_method', 'LU', values=['LU', 'solve'],
                                 desc="Solution method, either 'solve' for linalg.solve, " +
                                 "or 'LU' for linalg.lu_factor and linalg.lu_solve.")
 
+        self.supports['solve_multi'] = True
+
         self.jacobian = None
         self.lup = None
         self.mode = None
 
+        # Column permutation kept from the first sparse factorization.
+        self.perm_c = None
+        self._lup_permuted = False
+
     def setup(self, system):
         """ Initialization. Allocate Jacobian and set up some helpers.
 
@@ -67,18 +101,29 @@ class DirectSolver(MultLinearSolver):
             System that owns this solver.
         """
 
+        self.perm_c = None
+
         # Only need to setup if we are assembling the whole jacobian
         if self.options['jacobian_method'] == 'MVP':
+            if self.options['jacobian_format'] == 'sparse':
+                msg = "The 'sparse' jacobian_format requires the 'assemble' " + \
+                      "jacobian_method (%s)." % system.pathname
+                raise RuntimeError(msg)
             return
 
         # Note, we solve a slightly modified version of the unified
         # derivatives equations in OpenMDAO.
         # (dR/du) * (du/dr) = -I
-        u_vec = system.unknowns
-        self.jacobian = -np.eye(u_vec.vec.size)
+        # The sparse Jacobian is built from scratch in assemble_jacobian.
+        if self.options['jacobian_format'] == 'dense':
+            u_vec = system.unknowns
+            self.jacobian = -np.eye(u_vec.vec.size)
+        else:
+            self.jacobian = None
 
         # Clear the index cache
         system._icache = {}
+        system._icache_src_idxs = {}
 
     def solve(self, rhs_mat, system, mode):
         """ Solves the linear system for the problem in self.system. The
@@ -89,7 +134,7 @@ class DirectSolver(MultLinearSolver):
         rhs_mat : dict of ndarray
             Dictionary containing one ndarry per top level quantity of
             interest. Each array contains the right-hand side for the linear
-            solve.
+            solve, or a 2D array with one right-hand side per column.
 
         system : `System`
             Parent `System` object.
@@ -108,6 +153,7 @@ class DirectSolver(MultLinearSolver):
             self.mode = mode
 
         sol_buf = OrderedDict()
+        sparse = self.options['jacobian_format'] == 'sparse'
 
         for voi, rhs in rhs_mat.items():
             self.voi = None
@@ -121,14 +167,24 @@ class DirectSolver(MultLinearSolver):
                 self.mode = mode
 
                 self.jacobian, _ = system.assemble_jacobian(mode=mode, method=method,
-                                                            mult=self.mult)
+                                                            mult=self.mult,
+                                                            sparse=sparse)
                 system._jacobian_changed = False
 
                 if self.options['solve_method'] == 'LU':
-                    self.lup = lu_factor(self.jacobian)
+                    if sparse:
+                        self.lup = self._sparse_factor(self.jacobian)
+                    else:
+                        self.lup = lu_factor(self.jacobian)
 
             if self.options['solve_method'] == 'LU':
-                deriv = lu_solve(self.lup, rhs)
+                if sparse:
+                    deriv = self._sparse_solve(self.lup, rhs)
+                else:
+                    deriv = lu_solve(self.lup, rhs)
+            elif sparse:
+                # spsolve drops the trailing dimension of a single column.
+                deriv = spsolve(self.jacobian, rhs).reshape(rhs.shape)
             else:
                 deriv = np.linalg.solve(self.jacobian, rhs)
 
@@ -137,3 +193,75 @@ class DirectSolver(MultLinearSolver):
 
         return sol_buf
 
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for several right-hand sides at once,
+        passing all of the columns to a single call of the factored
+        Jacobian.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one 2D ndarray per top level quantity of
+            interest. Each column is a right-hand side for the linear solve.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors, one per column.
+        """
+        return self.solve(rhs_mat, system, mode)
+
+    def _sparse_factor(self, jac):
+        """ Factor a sparse Jacobian with splu, reusing the column ordering
+        from the first factorization if requested.
+
+        Args
+        ----
+        jac : csc_matrix
+            Assembled Jacobian.
+
+        Returns
+        -------
+        SuperLU : LU factorization of the (possibly column permuted) Jacobian.
+        """
+        if not self.options['reuse_symbolic'] or self.perm_c is None:
+            lup = splu(jac)
+            if self.options['reuse_symbolic']:
+                # SuperLU factors A*Pc where Pc[i, perm_c[i]] = 1
+                self.perm_c = np.argsort(lup.perm_c)
+            self._lup_permuted = False
+            return lup
+
+        # Factor J*P with the saved ordering; the solution of that system
+        # is then scattered back through P.
+        self._lup_permuted = True
+        return splu(jac[:, self.perm_c], permc_spec='NATURAL')
+
+    def _sparse_solve(self, lup, rhs):
+        """ Solve using a sparse LU factorization from _sparse_factor.
+
+        Args
+        ----
+        lup : SuperLU
+            LU factorization of the Jacobian.
+
+        rhs : ndarray
+            Right-hand side.
+
+        Returns
+        -------
+        ndarray : Solution vector.
+        """
+        sol = lup.solve(rhs)
+
+        if self._lup_permuted:
+            deriv = np.empty(sol.shape)
+            deriv[self.perm_c] = sol
+            return deriv
+
+        return sol
@@ -28,6 +28,11 @@ class LinearGaussSeidel(LinearSolver):
         Derivative calculation mode, set to 'fwd' for forward mode, 'rev' for reverse mode, or 'auto' to let OpenMDAO determine the best mode.
     options['rtol'] :  float(1e-10)
         Absolute convergence tolerance.
+    options['simul_coloring'] :  bool(False)
+        Only used on the root solver. Set to True to detect the sparsity of
+        the total Jacobian the first time calc_gradient is called and
+        afterwards solve for all structurally orthogonal columns (fwd) or
+        rows (rev) with a single right-hand side.
 
     """
 
@@ -56,20 +61,6 @@ class LinearGaussSeidel(LinearSolver):
 
         self.print_name = 'LN_GS'
 
-    def setup(self, group):
-        """ Solvers override to define post-setup initiailzation.
-
-        Args
-        ----
-        group: `Group`
-            Group that owns this solver.
-        """
-        super(LinearGaussSeidel, self).setup(group)
-
-        self._vois = [None]
-        for vois in group._probdata.relevance.vars_of_interest():
-            self._vois.extend(vois)
-
     def solve(self, rhs_mat, system, mode):
         """ Solves the linear system for the problem in self.system. The
         full solution vector is returned.
@@ -95,7 +86,6 @@ class LinearGaussSeidel(LinearSolver):
         dumat = system.dumat
         drmat = system.drmat
         dpmat = system.dpmat
-        gs_outputs = system._get_gs_outputs(mode, self._vois)
         relevance = system._probdata.relevance
         iprint = self.options['iprint']
         fwd = mode == 'fwd'
@@ -105,6 +95,7 @@ class LinearGaussSeidel(LinearSolver):
             dumat[voi].vec[:] = 0.0
 
         vois = rhs_mat.keys()
+        gs_outputs = system._get_gs_outputs(mode, vois)
         # John starts with the following. It is not necessary, but
         # uncommenting it helps to debug when comparing print outputs to his.
         # for voi in vois:
@@ -29,6 +29,14 @@ class Newton(NonLinearSolver):
         Set to 0 to print only failures, set to 1 to print iteration totals to
         stdout, set to 2 to print the residual each iteration to stdout,
         or -1 to suppress all printing.
+    options['jac_update_ratio'] :  float(0.5)
+        Only used when max_jac_age is greater than 1. A reused linearization is
+        discarded as soon as an iteration fails to reduce the residual norm to
+        this fraction of its previous value.
+    options['max_jac_age'] :  int(1)
+        Maximum number of iterations that use the same linearization (and any
+        factorization the linear solver made of it). Set to 1 to relinearize
+        every iteration.
     options['maxiter'] :  int(20)
         Maximum number of iterations.
     options['rtol'] :  float(1e-10)
@@ -58,6 +66,14 @@ class Newton(NonLinearSolver):
                        desc='Initial over-relaxation factor.')
         opt.add_option('solve_subsystems', True,
                        desc='Set to True to solve subsystems. You may need this for solvers nested under Newton.')
+        opt.add_option('max_jac_age', 1, lower=1,
+                       desc='Maximum number of iterations that use the same linearization '
+                       '(and any factorization the linear solver made of it). Set to 1 '
+                       'to relinearize every iteration.')
+        opt.add_option('jac_update_ratio', 0.5, lower=0.0,
+                       desc='Only used when max_jac_age is greater than 1. A reused '
+                       'linearization is discarded as soon as an iteration fails to '
+                       'reduce the residual norm to this fraction of its previous value.')
 
         self.print_name = 'NEWTON'
 
@@ -71,6 +87,10 @@ class Newton(NonLinearSolver):
         # We need local relevancy for Newton sub-solves
         self.rel_inputs = None
 
+        # Number of linearizations performed and skipped in the last solve.
+        self.lin_count = 0
+        self.lin_skip_count = 0
+
     def setup(self, sub):
         """ Initialize sub solvers.
 
@@ -140,6 +160,8 @@ class Newton(NonLinearSolver):
         rtol = self.options['rtol']
         utol = self.options['utol']
         maxiter = self.options['maxiter']
+        max_jac_age = self.options['max_jac_age']
+        jac_update_ratio = self.options['jac_update_ratio']
         alpha_scalar = self.options['alpha']
         iprint = self.options['iprint']
         ls = self.line_search
@@ -147,6 +169,8 @@ class Newton(NonLinearSolver):
 
         # Metadata setup
         self.iter_count = 0
+        self.lin_count = 0
+        self.lin_skip_count = 0
         local_meta = create_local_meta(metadata, system.pathname)
         if self.ln_solver:
             self.ln_solver.local_meta = local_meta
@@ -172,6 +196,10 @@ class Newton(NonLinearSolver):
         result = system.dumat[None]
         u_norm = 1.0e99
 
+        # Number of iterations since the last linearization.
+        jac_age = None
+        f_norm_last = f_norm
+
         # Can't have the system trying to FD itself when it also contains Newton.
         save_type = system.deriv_options['type']
         system.deriv_options.locked = False
@@ -180,8 +208,18 @@ class Newton(NonLinearSolver):
         while self.iter_count < maxiter and f_norm > atol and \
                 f_norm/f_norm0 > rtol and u_norm > utol:
 
-            # Linearize Model with partial derivatives
-            system._sys_linearize(params, unknowns, resids, total_derivs=False)
+            # Linearize Model with partial derivatives, unless we can keep
+            # using the previous linearization.
+            if jac_age is None or jac_age >= max_jac_age or \
+               f_norm > jac_update_ratio*f_norm_last:
+                system._sys_linearize(params, unknowns, resids, total_derivs=False)
+                self.lin_count += 1
+                jac_age = 0
+            else:
+                self.lin_skip_count += 1
+
+            jac_age += 1
+            f_norm_last = f_norm
 
             # Calculate direction to take step
             arg.vec[:] = -resids.vec
@@ -258,6 +296,10 @@ class Newton(NonLinearSolver):
             msg = 'Converged in %d iterations' % self.iter_count
             fail = False
 
+        if max_jac_age > 1:
+            msg += ' (%d linearizations, %d skipped)' % (self.lin_count,
+                                                        self.lin_skip_count)
+
         if iprint > 0 or (fail and iprint > -1 ):
 
             self.print_norm(self.print_name, system, self.iter_count,
@@ -4,6 +4,7 @@ from math import isnan
 
 import numpy as np
 
+from openmdao.core.mpi_wrap import MPI
 from openmdao.core.system import AnalysisError
 from openmdao.solvers.solver_base import error_wrap_nl, NonLinearSolver
 from openmdao.util.record_util import update_local_meta, create_local_meta
@@ -17,6 +18,15 @@ class NLGaussSeidel(NonLinearSolver):
 
     Options
     -------
+    options['accel'] :  str('none')
+        Acceleration of the fixed point iteration. Set to 'aitken' for Aitken
+        dynamic relaxation or 'anderson' for Anderson mixing. Set to 'none' for
+        plain Gauss Seidel sweeps.
+    options['aitken_initial_factor'] :  float(1.0)
+        Relaxation factor used for the first accelerated iteration with
+        Aitken acceleration.
+    options['anderson_depth'] :  int(5)
+        Number of previous iterations used for Anderson mixing.
     options['atol'] :  float(1e-06)
         Absolute convergence tolerance.
     options['err_on_maxiter'] : bool(False)
@@ -46,6 +56,15 @@ class NLGaussSeidel(NonLinearSolver):
                        desc='Convergence tolerance on the change in the unknowns.')
         opt.add_option('maxiter', 100, lower=0,
                        desc='Maximum number of iterations.')
+        opt.add_option('accel', 'none', values=['none', 'aitken', 'anderson'],
+                       desc="Acceleration of the fixed point iteration. Set to "
+                       "'aitken' for Aitken dynamic relaxation or 'anderson' for "
+                       "Anderson mixing. Set to 'none' for plain Gauss Seidel sweeps.")
+        opt.add_option('aitken_initial_factor', 1.0, lower=0.0,
+                       desc='Relaxation factor used for the first accelerated '
+                       'iteration with Aitken acceleration.')
+        opt.add_option('anderson_depth', 5, lower=1,
+                       desc='Number of previous iterations used for Anderson mixing.')
 
         self.print_name = 'NLN_GS'
 
@@ -109,6 +128,10 @@ class NLGaussSeidel(NonLinearSolver):
         resids = system.resids
         unknowns_cache = np.zeros(unknowns.vec.shape)
 
+        accel = self.options['accel']
+        if accel != 'none':
+            self._accel_reset()
+
         # Evaluate Norm
         system.apply_nonlinear(params, unknowns, resids)
         normval = resids.norm()
@@ -130,6 +153,13 @@ class NLGaussSeidel(NonLinearSolver):
 
             # Runs an iteration
             system.children_solve_nonlinear(local_meta)
+
+            # Replace the result of the sweep with an accelerated update.
+            if accel == 'aitken':
+                self._aitken(system, unknowns_cache, unknowns.vec)
+            elif accel == 'anderson':
+                self._anderson(system, unknowns_cache, unknowns.vec)
+
             self.recorders.record_iteration(system, local_meta)
 
             # Evaluate Norm
@@ -162,3 +192,99 @@ class NLGaussSeidel(NonLinearSolver):
         if fail and self.options['err_on_maxiter']:
             raise AnalysisError("Solve in '%s': NLGaussSeidel %s" %
                                 (system.pathname, msg))
+
+    def _accel_reset(self):
+        """ Clear the iteration history used for acceleration."""
+        self._aitken_factor = None
+        self._last_delta = None
+        self._delta_hist = []
+        self._sweep_hist = []
+        self._last_sweep = None
+
+    def _aitken(self, system, u_old, u):
+        """ Aitken dynamic relaxation of a Gauss Seidel sweep. The relaxation
+        factor is updated from the change in the sweep increment between
+        successive iterations.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        u_old : ndarray
+            Unknowns before the sweep.
+
+        u : ndarray
+            Unknowns after the sweep. Overwritten with the relaxed update.
+        """
+        delta = u - u_old
+
+        if self._aitken_factor is None:
+            factor = self.options['aitken_initial_factor']
+        else:
+            ddelta = delta - self._last_delta
+            denom = _dot(system, ddelta, ddelta)
+            if denom > 0.0:
+                factor = -self._aitken_factor * \
+                    _dot(system, self._last_delta, ddelta) / denom
+            else:
+                factor = self._aitken_factor
+
+        self._aitken_factor = factor
+        self._last_delta = delta
+
+        u[:] = u_old + factor*delta
+
+    def _anderson(self, system, u_old, u):
+        """ Anderson mixing of a Gauss Seidel sweep with the previous
+        'anderson_depth' iterations.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        u_old : ndarray
+            Unknowns before the sweep.
+
+        u : ndarray
+            Unknowns after the sweep. Overwritten with the mixed update.
+        """
+        delta = u - u_old
+        sweep = u.copy()
+
+        if self._last_delta is not None:
+            self._delta_hist.append(delta - self._last_delta)
+            self._sweep_hist.append(sweep - self._last_sweep)
+            if len(self._delta_hist) > self.options['anderson_depth']:
+                self._delta_hist.pop(0)
+                self._sweep_hist.pop(0)
+
+        self._last_delta = delta
+        self._last_sweep = sweep
+
+        if not self._delta_hist:
+            return
+
+        # Least squares fit of the current increment by the increment
+        # differences, solved through the normal equations so that the
+        # products can be summed across processes.
+        dF = np.array(self._delta_hist).T
+        dG = np.array(self._sweep_hist).T
+        A = _dot(system, dF.T, dF)
+
+        # explicit cutoff (numpy's newer default) so that old and new numpy
+        # versions agree and no FutureWarning is raised
+        gamma = np.linalg.lstsq(A, _dot(system, dF.T, delta),
+                                rcond=np.finfo(float).eps*max(A.shape))[0]
+
+        u[:] = sweep - dG.dot(gamma)
+
+
+def _dot(system, a, b):
+    """ Dot product of two local arrays, summed over all processes that share
+    the system's vectors."""
+    val = np.dot(a, b)
+    if MPI:
+        val = system.comm.allreduce(val)
+    return val
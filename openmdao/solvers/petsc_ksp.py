@@ -134,6 +134,11 @@ class PetscKSP(LinearSolver):
         Derivative calculation mode, set to 'fwd' for forward mode, 'rev' for reverse mode, or 'auto' to let OpenMDAO determine the best mode.
     options['rtol'] :  float(1e-12)
         Relative convergence tolerance.
+    options['simul_coloring'] :  bool(False)
+        Only used on the root solver. Set to True to detect the sparsity of
+        the total Jacobian the first time calc_gradient is called and
+        afterwards solve for all structurally orthogonal columns (fwd) or
+        rows (rev) with a single right-hand side.
 
     """
 
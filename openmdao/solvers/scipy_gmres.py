@@ -35,6 +35,11 @@ class ScipyGMRES(MultLinearSolver):
     options['restart'] :  int(20)
         Number of iterations between restarts. Larger values increase iteration cost,
         but may be necessary for convergence
+    options['simul_coloring'] :  bool(False)
+        Only used on the root solver. Set to True to detect the sparsity of
+        the total Jacobian the first time calc_gradient is called and
+        afterwards solve for all structurally orthogonal columns (fwd) or
+        rows (rev) with a single right-hand side.
     """
 
     def __init__(self):
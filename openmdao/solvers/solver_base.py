@@ -2,6 +2,7 @@
 
 from __future__ import print_function
 
+from collections import OrderedDict
 from functools import wraps
 import sys
 from six import reraise
@@ -214,12 +215,28 @@ class LinearSolver(SolverBase):
     options['iprint'] :  int(0)
         Set to 0 to disable printing, set to 1 to print iteration totals to
         stdout, set to 2 to print the residual each iteration to stdout.
+    options['simul_coloring'] :  bool(False)
+        Only used on the root solver. Set to True to detect the sparsity of
+        the total Jacobian the first time calc_gradient is called and
+        afterwards solve for all structurally orthogonal columns (fwd) or
+        rows (rev) with a single right-hand side.
     """
 
     def __init__(self):
         """ Initialize the default supports for ln solvers."""
         super(LinearSolver, self).__init__()
 
+        self.options.add_option('simul_coloring', False,
+                                desc="Only used on the root solver. Set to True "
+                                "to detect the sparsity of the total Jacobian the "
+                                "first time calc_gradient is called and afterwards "
+                                "solve for all structurally orthogonal columns (fwd) "
+                                "or rows (rev) with a single right-hand side.")
+
+        # What this solver supports
+        self.supports = OptionsDictionary(read_only=True)
+        self.supports.add_option('solve_multi', False)
+
         # Solver needs to communicate local relevancy into calls to sys_apply_linear.
         self.rel_inputs = None
 
@@ -256,6 +273,43 @@ class LinearSolver(SolverBase):
         """
         pass
 
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for several right-hand sides at once.
+        Each right-hand side is a column of a 2D array. Solvers that can
+        handle all of the columns in a single call should override this and
+        set supports['solve_multi'] to True. The default implementation
+        just calls solve once per column.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one 2D ndarray per top level quantity of
+            interest. Each column is a right-hand side for the linear solve.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors, one per column.
+        """
+        sol_buf = OrderedDict()
+        for voi, rhs in rhs_mat.items():
+            sol_buf[voi] = np.empty(rhs.shape)
+
+        for i in range(next(iter(rhs_mat.values())).shape[1]):
+            rhs = OrderedDict()
+            for voi, rhs_voi in rhs_mat.items():
+                rhs[voi] = rhs_voi[:, i].copy()
+
+            for voi, sol in self.solve(rhs, system, mode).items():
+                sol_buf[voi][:, i] = sol
+
+        return sol_buf
+
 
 class MultLinearSolver(LinearSolver):
     """Base class for ScipyGMRES and DirectSolver.  Adds a mult method.
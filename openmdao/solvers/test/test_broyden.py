@@ -0,0 +1,171 @@
+""" Unit test for the Broyden nonlinear solver. """
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import Group, Problem, IndepVarComp, Component, \
+    Broyden, ScipyGMRES, DirectSolver, AnalysisError
+from openmdao.solvers.backtracking import BackTracking
+from openmdao.test.sellar import SellarNoDerivatives, SellarDerivatives, \
+                                 SellarStateConnection
+from openmdao.test.util import assert_rel_error
+
+
+class SimpleImplicitComp(Component):
+    """ A Simple Implicit Component with an additional output equation.
+
+    f(x,z) = xz + z - 4
+    y = x + 2z
+
+    Sol: when x = 2.0, z = 1.333
+    """
+
+    def __init__(self):
+        super(SimpleImplicitComp, self).__init__()
+
+        # Params
+        self.add_param('x', 0.5)
+
+        # Unknowns
+        self.add_output('y', 0.0)
+
+        # States
+        self.add_state('z', 2.0, lower=1.5, upper=2.5)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        """ Don't solve; just calculate the residual."""
+
+        x = params['x']
+        z = unknowns['z']
+        resids['z'] = x*z + z - 4.0
+
+        # Output equations need to evaluate a residual just like an explicit comp.
+        resids['y'] = x + 2.0*z - unknowns['y']
+
+    def linearize(self, params, unknowns, resids):
+        """Analytical derivatives."""
+
+        J = {}
+
+        # Output equation
+        J[('y', 'x')] = np.array([1.0])
+        J[('y', 'z')] = np.array([2.0])
+
+        # State equation
+        J[('z', 'z')] = np.array([params['x'] + 1.0])
+        J[('z', 'x')] = np.array([unknowns['z']])
+
+        return J
+
+
+class TestBroyden(unittest.TestCase):
+
+    def test_sellar_derivs(self):
+
+        prob = Problem()
+        prob.root = SellarDerivatives()
+        prob.root.nl_solver = Broyden()
+        prob.root.ln_solver = DirectSolver()
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        # Only one linearization, everything else is rank-one updates.
+        solver = prob.root.nl_solver
+        self.assertEqual(solver.lin_count, 1)
+        self.assertEqual(solver.update_count, solver.iter_count)
+        self.assertLess(solver.iter_count, 12)
+
+    def test_sellar_fd(self):
+
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        prob.root.nl_solver = Broyden()
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        self.assertEqual(prob.root.nl_solver.lin_count, 1)
+
+    def test_sellar_identity(self):
+
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        prob.root.nl_solver = Broyden()
+        prob.root.nl_solver.options['init_jac'] = 'identity'
+        prob.root.nl_solver.options['maxiter'] = 30
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        # No derivatives at all.
+        self.assertEqual(prob.root.nl_solver.lin_count, 0)
+
+    def test_sellar_state_connection_backtracking(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver = Broyden()
+        prob.root.nl_solver.line_search = BackTracking()
+        prob.root.nl_solver.line_search.options['iprint'] = -1
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['state_eq.y2_command'], 12.05848819, .00001)
+
+        self.assertEqual(prob.root.nl_solver.lin_count, 1)
+
+    def test_bounds(self):
+
+        top = Problem()
+        top.root = Group()
+        top.root.add('comp', SimpleImplicitComp())
+        top.root.ln_solver = ScipyGMRES()
+        top.root.nl_solver = Broyden()
+        top.root.nl_solver.options['maxiter'] = 5
+        top.root.nl_solver.options['iprint'] = -1
+        top.root.add('px', IndepVarComp('x', 1.0))
+
+        top.root.connect('px.x', 'comp.x')
+        top.setup(check=False)
+
+        top['px.x'] = 2.0
+        top.run()
+
+        self.assertEqual(top['comp.z'], 1.5)
+
+    def test_sellar_analysis_error(self):
+
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        prob.root.nl_solver = Broyden()
+        prob.root.nl_solver.options['err_on_maxiter'] = True
+        prob.root.nl_solver.options['maxiter'] = 2
+
+        prob.setup(check=False)
+
+        try:
+            prob.run()
+        except AnalysisError as err:
+            self.assertEqual(str(err), "Solve in '': Broyden FAILED to converge after 2 iterations")
+        else:
+            self.fail("expected AnalysisError")
+
+
+if __name__ == "__main__":
+    unittest.main()
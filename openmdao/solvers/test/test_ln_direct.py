@@ -1,10 +1,12 @@
 """ Unit test for the DirectSolver linear solver. """
 
 import unittest
+from collections import OrderedDict
+
 import numpy as np
 
 from openmdao.api import Group, Problem, IndepVarComp, ExecComp, DirectSolver, \
-                         LinearGaussSeidel, Newton
+                         LinearGaussSeidel, Newton, ScipyGMRES
 from openmdao.core.test.test_residual_sign import SimpleImplicitSL
 from openmdao.test.converge_diverge import ConvergeDiverge, SingleDiamond, \
                                            ConvergeDivergeGroups, SingleDiamondGrouped
@@ -772,5 +774,200 @@ class TestDirectSolverAssemble(unittest.TestCase):
         J = p.calc_gradient(['p.x'], ['comp.y1'], mode='fwd')
         assert_rel_error(self, J[0][0], 1.5, 1e-6)
 
+class TestDirectSolverSparse(unittest.TestCase):
+    """ Tests the DirectSolver with a sparse assembled Jacobian."""
+
+    def test_array2D(self):
+        group = Group()
+        group.add('x_param', IndepVarComp('x', np.ones((2, 2))), promotes=['*'])
+        group.add('mycomp', ArrayComp2D(), promotes=['x', 'y'])
+
+        prob = Problem()
+        prob.root = group
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_method'] = 'assemble'
+        prob.root.ln_solver.options['jacobian_format'] = 'sparse'
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['x'], ['y'], mode='fwd', return_format='dict')
+        Jbase = prob.root.mycomp._jacobian_cache
+        diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
+        assert_rel_error(self, diff, 0.0, 1e-8)
+
+        J = prob.calc_gradient(['x'], ['y'], mode='rev', return_format='dict')
+        diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
+        assert_rel_error(self, diff, 0.0, 1e-8)
+
+    def test_assembled_matches_dense(self):
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_method'] = 'assemble'
+        prob.setup(check=False)
+        prob.run()
+
+        root = prob.root
+        root._sys_linearize(root.params, root.unknowns, root.resids)
+
+        for mode in ('fwd', 'rev'):
+            dense, _ = root.assemble_jacobian(mode=mode)
+            sparse, _ = root.assemble_jacobian(mode=mode, sparse=True)
+            self.assertEqual(sparse.format, 'csc')
+            assert_rel_error(self, np.linalg.norm(sparse.toarray() - dense), 0.0, 1e-12)
+
+    def test_sellar_derivs(self):
+
+        for reuse in (False, True):
+            for solve_method in ('LU', 'solve'):
+                prob = Problem()
+                prob.root = SellarStateConnection()
+                prob.root.ln_solver = DirectSolver()
+                prob.root.ln_solver.options['jacobian_method'] = 'assemble'
+                prob.root.ln_solver.options['jacobian_format'] = 'sparse'
+                prob.root.ln_solver.options['reuse_symbolic'] = reuse
+                prob.root.ln_solver.options['solve_method'] = solve_method
+
+                prob.root.nl_solver.options['atol'] = 1e-12
+                prob.setup(check=False)
+                prob.run()
+
+                indep_list = ['x', 'z']
+                unknown_list = ['obj', 'con1', 'con2']
+
+                Jbase = {}
+                Jbase['con1'] = {}
+                Jbase['con1']['x'] = -0.98061433
+                Jbase['con1']['z'] = np.array([-9.61002285, -0.78449158])
+                Jbase['con2'] = {}
+                Jbase['con2']['x'] = 0.09692762
+                Jbase['con2']['z'] = np.array([1.94989079, 1.0775421 ])
+                Jbase['obj'] = {}
+                Jbase['obj']['x'] = 2.98061392
+                Jbase['obj']['z'] = np.array([9.61001155, 1.78448534])
+
+                # Repeat so later linearizations go through the reused ordering.
+                for mode in ('fwd', 'rev', 'fwd'):
+                    J = prob.calc_gradient(indep_list, unknown_list, mode=mode,
+                                           return_format='dict')
+                    for key1, val1 in Jbase.items():
+                        for key2, val2 in val1.items():
+                            assert_rel_error(self, J[key1][key2], val2, .00001)
+
+    def test_implicit_solve_linear_reuse_symbolic(self):
+
+        p = Problem()
+        p.root = Group()
+
+        dvars = ( ('a', 3.), ('b', 10.))
+        p.root.add('desvars', IndepVarComp(dvars), promotes=['a', 'b'])
+
+        sg = p.root.add('sg', Group(), promotes=["*"])
+        sg.add('si', SimpleImplicitSL(), promotes=['a', 'b', 'x'])
+
+        p.root.add('func', ExecComp('f = 2*x0+a'), promotes=['f', 'x0', 'a'])
+        p.root.connect('x', 'x0', src_indices=[1])
+
+        p.driver.add_objective('f')
+        p.driver.add_desvar('a')
+
+        p.root.nl_solver = Newton()
+        p.root.nl_solver.options['rtol'] = 1e-10
+        p.root.nl_solver.options['atol'] = 1e-10
+        p.root.ln_solver = DirectSolver()
+        p.root.ln_solver.options['jacobian_method'] = 'assemble'
+        p.root.ln_solver.options['jacobian_format'] = 'sparse'
+        p.root.ln_solver.options['reuse_symbolic'] = True
+
+        p.setup(check=False)
+        p['x'] = np.array([1.5, 2.])
+
+        p.run()
+        self.assertTrue(p.root.ln_solver.perm_c is not None)
+
+        J = p.calc_gradient(['a'], ['f'], mode='rev')
+        assert_rel_error(self, J[0][0], 1.57735, 1e-6)
+
+    def test_sparse_needs_assemble(self):
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_format'] = 'sparse'
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.setup(check=False)
+
+        expected_msg = "The 'sparse' jacobian_format requires the 'assemble' " + \
+                       "jacobian_method ()."
+        self.assertEqual(str(cm.exception), expected_msg)
+
+class TestDirectSolverMulti(unittest.TestCase):
+    """ Tests solving for several right-hand sides at once."""
+
+    def setup_sellar(self, ln_solver):
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.ln_solver = ln_solver
+        prob.root.nl_solver.options['atol'] = 1e-12
+        prob.setup(check=False)
+        prob.run()
+
+        root = prob.root
+        root._sys_linearize(root.params, root.unknowns, root.resids)
+        return prob
+
+    def test_solve_multi_matches_solve(self):
+        for ln_solver in (DirectSolver, ScipyGMRES):
+            solver = ln_solver()
+            if ln_solver is ScipyGMRES:
+                solver.options['atol'] = 1e-12
+            prob = self.setup_sellar(solver)
+            root = prob.root
+            n = len(root.dumat[None].vec)
+
+            rhs = OrderedDict()
+            rhs[None] = -np.eye(n)[:, :3]
+
+            for mode in ('fwd', 'rev'):
+                dx_multi = solver.solve_multi(rhs, root, mode)[None]
+                self.assertEqual(dx_multi.shape, (n, 3))
+
+                for i in range(3):
+                    rhs_i = OrderedDict()
+                    rhs_i[None] = rhs[None][:, i].copy()
+                    dx = solver.solve(rhs_i, root, mode)[None]
+                    assert_rel_error(self, np.linalg.norm(dx_multi[:, i] - dx),
+                                     0.0, 1e-8)
+
+    def test_calc_gradient_batched(self):
+        prob = self.setup_sellar(DirectSolver())
+        root = prob.root
+
+        self.assertTrue(root.ln_solver.supports['solve_multi'])
+        self.assertFalse(ScipyGMRES().supports['solve_multi'])
+
+        solves = []
+        solve = root.ln_solver.solve
+        def counting_solve(rhs, system, mode):
+            solves.append(rhs[None].shape)
+            return solve(rhs, system, mode)
+        root.ln_solver.solve = counting_solve
+
+        J = prob.calc_gradient(['x', 'z'], ['obj', 'con1', 'con2'], mode='fwd',
+                               return_format='dict')
+
+        # one solve per VOI, with one column per index
+        self.assertEqual(len(solves), 2)
+        self.assertEqual(solves[1][1], 2)
+
+        assert_rel_error(self, J['con1']['x'], -0.98061433, .00001)
+        assert_rel_error(self, J['con1']['z'], np.array([-9.61002285, -0.78449158]), .00001)
+        assert_rel_error(self, J['obj']['z'], np.array([9.61001155, 1.78448534]), .00001)
+
+        J = prob.calc_gradient(['x', 'z'], ['obj', 'con1', 'con2'], mode='rev')
+        assert_rel_error(self, J[1, 1:], np.array([-9.61002285, -0.78449158]), .00001)
+        assert_rel_error(self, J[2, 0], 0.09692762, .00001)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -659,5 +659,74 @@ class TestLinearGaussSeidelAsPrecon(unittest.TestCase):
         # Make sure we don't get a KeyError
         p.check_total_derivatives(out_stream=None)
 
+class TestDerivVecCache(unittest.TestCase):
+
+    def _build(self, mode, cache):
+        prob = Problem(root=Group())
+        root = prob.root
+        root.ln_solver = LinearGaussSeidel()
+        root.ln_solver.options['mode'] = mode
+        root.ln_solver.options['single_voi_relevance_reduction'] = True
+
+        for i in range(4):
+            root.add('p%d' % i, IndepVarComp('x', float(i + 1)))
+            sub = root.add('G%d' % i, Group())
+            sub.ln_solver = LinearGaussSeidel()
+            sub.add('C1', ExecComp('y = 2.0*x*x'))
+            sub.add('C2', ExecComp('y = 3.0*x'))
+            sub.connect('C1.y', 'C2.x')
+            root.connect('p%d.x' % i, 'G%d.C1.x' % i)
+            prob.driver.add_desvar('p%d.x' % i)
+            prob.driver.add_constraint('G%d.C2.y' % i, upper=0.0)
+
+        root.add('sum', ExecComp('y = x0 + x1 + x2 + x3'))
+        for i in range(4):
+            root.connect('G%d.C2.y' % i, 'sum.x%d' % i)
+        prob.driver.add_objective('sum.y')
+
+        prob.setup(check=False, deriv_vec_cache=cache)
+        prob.run()
+        return prob
+
+    def test_lazy_vecs(self):
+        indeps = ['p%d.x' % i for i in range(4)]
+        outs = ['G%d.C2.y' % i for i in range(4)] + ['sum.y']
+
+        for mode in ('fwd', 'rev'):
+            prob = self._build(mode, None)
+            expected = prob.calc_gradient(indeps, outs, return_format='array')
+
+            prob = self._build(mode, 1)
+            root = prob.root
+
+            # only the vectors that aren't specific to a VOI are created
+            # in setup
+            self.assertEqual(list(root.dumat), [None])
+            self.assertEqual(list(root.G0.C1.dpmat), [None])
+
+            for i in range(2):
+                J = prob.calc_gradient(indeps, outs, return_format='array')
+                assert_rel_error(self, J, expected, 1e-10)
+
+            # only the last VOI solved for is kept
+            vois = [None, 'p3.x' if mode == 'fwd' else 'G3.C2.y']
+            self.assertEqual(list(prob._probdata.voi_lru), vois[1:])
+            self.assertEqual(set(root.dumat), set(vois))
+            self.assertEqual(set(root.G3.C1.dumat), set(vois))
+            self.assertEqual(set(k[2] for k in root._data_xfer), set(vois))
+
+            # a solve with a VOI that has been freed creates it again
+            J = prob.calc_gradient(['p0.x'], ['sum.y'], return_format='array')
+            assert_rel_error(self, J, expected[-1:, :1], 1e-10)
+
+    def test_bad_size(self):
+        prob = Problem(root=Group())
+        prob.root.add('p', IndepVarComp('x', 1.0))
+        with self.assertRaises(ValueError) as cm:
+            prob.setup(check=False, deriv_vec_cache=0)
+        self.assertEqual(str(cm.exception),
+                         "deriv_vec_cache must be at least 1, but is 0.")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,7 +6,7 @@ from six import iteritems
 import numpy as np
 
 from openmdao.api import Group, Problem, IndepVarComp, LinearGaussSeidel, \
-    Newton, ExecComp, ScipyGMRES, AnalysisError, Component
+    Newton, ExecComp, ScipyGMRES, AnalysisError, Component, DirectSolver
 from openmdao.test.sellar import SellarDerivativesGrouped, \
                                  SellarNoDerivatives, SellarDerivatives, \
                                  SellarStateConnection
@@ -217,6 +217,57 @@ class TestNewton(unittest.TestCase):
         self.assertLessEqual(prob.root.nl_solver.iter_count, 10,
                              msg='Should get there pretty quick because of utol.')
 
+    def test_sellar_lagged_jacobian(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['max_jac_age'] = 10
+        prob.root.nl_solver.options['jac_update_ratio'] = 0.9
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_method'] = 'assemble'
+
+        prob.setup(check=False)
+
+        factors = []
+        solve = prob.root.ln_solver.solve
+        def counting_solve(rhs, system, mode):
+            if system._jacobian_changed:
+                factors.append(mode)
+            return solve(rhs, system, mode)
+        prob.root.ln_solver.solve = counting_solve
+
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['state_eq.y2_command'], 12.05848819, .00001)
+
+        solver = prob.root.nl_solver
+        self.assertGreater(solver.lin_skip_count, 0)
+        self.assertEqual(solver.lin_count + solver.lin_skip_count,
+                         solver.iter_count)
+
+        # LU factors are only recomputed after a new linearization.
+        self.assertEqual(len(factors), solver.lin_count)
+
+    def test_lagged_jacobian_ratio(self):
+
+        # With a ratio of 0, any iteration that doesn't converge the
+        # residual forces a new linearization, so nothing can be skipped.
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['max_jac_age'] = 10
+        prob.root.nl_solver.options['jac_update_ratio'] = 0.0
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        solver = prob.root.nl_solver
+        self.assertEqual(solver.lin_skip_count, 0)
+        self.assertEqual(solver.lin_count, solver.iter_count)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,8 @@ import unittest
 
 from six.moves import cStringIO
 
-from openmdao.api import Problem, NLGaussSeidel, AnalysisError, Group, ScipyGMRES
+from openmdao.api import Problem, NLGaussSeidel, AnalysisError, Group, ScipyGMRES, \
+                         ExecComp
 from openmdao.test.paraboloid import Paraboloid
 from openmdao.test.sellar import SellarNoDerivatives, SellarDerivativesGrouped
 from openmdao.test.util import assert_rel_error
@@ -131,6 +132,49 @@ class TestNLGaussSeidel(unittest.TestCase):
         self.assertLess(prob.root.nl_solver.iter_count, 8)
 
 
+    def _slow_cycle(self, accel):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('c1', ExecComp('y1 = 0.9*y2 + 1.0 + 0.01*sin(y2)'), promotes=['*'])
+        root.add('c2', ExecComp('y2 = 0.95*y1 - 2.0'), promotes=['*'])
+
+        root.ln_solver = ScipyGMRES()
+        root.nl_solver = NLGaussSeidel()
+        root.nl_solver.options['accel'] = accel
+        root.nl_solver.options['maxiter'] = 500
+        root.nl_solver.options['atol'] = 1e-10
+        root.nl_solver.options['rtol'] = 1e-10
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], -5.57578284, 1e-8)
+        assert_rel_error(self, prob['y2'], -7.29699370, 1e-8)
+
+        return root.nl_solver.iter_count
+
+    def test_accel(self):
+        plain = self._slow_cycle('none')
+        self.assertGreater(plain, 100)
+
+        for accel in ('aitken', 'anderson'):
+            self.assertLess(self._slow_cycle(accel), 15)
+
+    def test_sellar_accel(self):
+
+        for accel in ('aitken', 'anderson'):
+            prob = Problem()
+            prob.root = SellarDerivativesGrouped()
+            prob.root.mda.nl_solver.options['accel'] = accel
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+            self.assertLess(prob.root.mda.nl_solver.iter_count, 7)
+
 
 if __name__ == "__main__":
     unittest.main()
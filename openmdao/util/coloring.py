@@ -0,0 +1,59 @@
+""" Utilities for computing colorings of sparse Jacobians, used to combine
+structurally orthogonal linear solves or finite difference steps."""
+
+import numpy as np
+from six.moves import range
+
+
+def get_col_coloring(sparsity):
+    """
+    Compute a greedy (largest-first) coloring of the columns of a sparsity
+    pattern. Two columns may share a color only if they have no nonzero
+    entries in a common row, so all of the columns of a color can be
+    computed at the same time.
+
+    Args
+    ----
+    sparsity : ndarray
+        2D boolean (or numeric) array where nonzero entries mark structurally
+        nonzero entries of the Jacobian.
+
+    Returns
+    -------
+    list of ndarray
+        Column indices for each color.
+
+    list of ndarray
+        Nonzero row indices for each column.
+    """
+    sparsity = np.asarray(sparsity) != 0
+    nrows, ncols = sparsity.shape
+
+    col_rows = [np.nonzero(sparsity[:, c])[0] for c in range(ncols)]
+
+    # color the densest columns first
+    order = sorted(range(ncols), key=lambda c: -len(col_rows[c]))
+
+    row_colors = [set() for r in range(nrows)]
+    col_colors = np.zeros(ncols, dtype=int)
+    ncolors = 0
+
+    for c in order:
+        forbidden = set()
+        for r in col_rows[c]:
+            forbidden.update(row_colors[r])
+
+        color = 0
+        while color in forbidden:
+            color += 1
+
+        col_colors[c] = color
+        for r in col_rows[c]:
+            row_colors[r].add(color)
+
+        if color >= ncolors:
+            ncolors = color + 1
+
+    colors = [np.nonzero(col_colors == i)[0] for i in range(ncolors)]
+
+    return colors, col_rows
@@ -1,7 +1,7 @@
 
 import traceback
 
-def concurrent_eval_lb(func, cases, comm, broadcast=False):
+def concurrent_eval_lb(func, cases, comm, broadcast=False, stop=None):
     """
     Runs a load balanced version of the given function, with the master
     rank (0) sending a new case to each worker rank as soon as it
@@ -25,10 +25,15 @@ def concurrent_eval_lb(func, cases, comm, broadcast=False):
         If True, the results will be broadcast out to the worker procs so
         that the return value of concurrent_eval_lb will be the full result
         list in every process.
+
+    stop : function, optional
+        Called in the master rank with the (retval, err) of each case as it
+        finishes. Once it returns True, no more cases are started, and the
+        results of the cases that are still running are collected.
     """
     if comm is not None:
         if comm.rank == 0:  # master rank
-            results = _concurrent_eval_lb_master(cases, comm)
+            results = _concurrent_eval_lb_master(cases, comm, stop)
         else:
             results = _concurrent_eval_lb_worker(func, comm)
 
@@ -50,15 +55,19 @@ def concurrent_eval_lb(func, cases, comm, broadcast=False):
                 err = None
             results.append((retval, err))
 
+            if stop is not None and stop(retval, err):
+                break
+
     return results
 
-def _concurrent_eval_lb_master(cases, comm):
+def _concurrent_eval_lb_master(cases, comm, stop=None):
     """
     This runs only on rank 0.  It sends cases to all of the workers and
     collects their results.
     """
     received = 0
     sent = 0
+    stopped = False
 
     results = []
 
@@ -85,11 +94,17 @@ def _concurrent_eval_lb_master(cases, comm):
             # store results
             results.append((retval, err))
 
+            if not stopped and stop is not None:
+                stopped = stop(retval, err)
+
             # don't stop until we hear back from every worker process
             # we sent a case to
             if received == sent:
                 break
 
+            if stopped:
+                continue
+
             try:
                 case = next(case_iter)
             except StopIteration: